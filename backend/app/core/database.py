@@ -1,27 +1,351 @@
-from tortoise import Tortoise
+import os
+import time
+from itertools import count
+from typing import List, Optional, Union
+from urllib.parse import parse_qs, quote, urlparse
+
+from tortoise import Tortoise, connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.backends.base.config_generator import expand_db_url
+from tortoise.exceptions import OperationalError
 
 from app.core.config import settings
+from app.core.profiling import instrument_db_clients
+from app.core.sqlite import WRITING_PRAGMAS
+
+MODEL_MODULES = ["app.models.user", "app.models.refresh_token", "app.models.pokemon"]
+
+READ_CONNECTION_PREFIX = "read_"
+
+POSTGRES_SCHEMES = ("postgres", "asyncpg")
+
+# aerich migrations of the "models" app (see [tool.aerich] in pyproject.toml)
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "migrations",
+    "models",
+)
+
+# Dialects the shipped migrations have SQL for
+MIGRATION_DIALECTS = ("sqlite", "postgres")
+
+
+class SchemaVersionError(RuntimeError):
+    """Raised at startup when the database lacks migrations this code needs."""
+
+
+def sqlite_pragmas(read_only: bool = False) -> dict:
+    """PRAGMAs applied to every SQLite connection, from settings."""
+    pragmas = {
+        "journal_mode": "WAL",
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        # Negative cache_size is in KiB rather than pages
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KIB,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "foreign_keys": "ON",
+    }
+    if read_only:
+        pragmas["query_only"] = "ON"
+    return pragmas
+
+
+def is_read_only() -> bool:
+    """Whether this process serves a read-only SQLite database."""
+    return settings.SQLITE_READ_ONLY or settings.SQLITE_IMMUTABLE
+
+
+def postgres_config(db_url: str, reader: bool = False) -> dict:
+    """
+    Tortoise config for a PostgreSQL URL with the settings' pool sizing.
+
+    Pool options given as URL query parameters take precedence. ``reader``
+    connections open read-only transactions.
+    """
+    config = expand_db_url(db_url)
+    credentials = config["credentials"]
+    explicit = parse_qs(urlparse(db_url).query)
+    pool = {
+        "minsize": settings.DATABASE_POOL_MIN_SIZE,
+        "maxsize": settings.DATABASE_POOL_MAX_SIZE,
+        "max_inactive_connection_lifetime": settings.DATABASE_POOL_MAX_INACTIVE_SECONDS,
+    }
+    for option, value in pool.items():
+        if option not in explicit:
+            credentials[option] = value
+
+    server_settings = {"application_name": settings.APP_NAME}
+    if reader:
+        server_settings["default_transaction_read_only"] = "on"
+    credentials["server_settings"] = server_settings
+    return config
 
-TORTOISE_ORM = {
-    "connections": {"default": settings.DATABASE_URL},
-    "apps": {
-        "models": {
-            "models": ["app.models.user", "app.models.pokemon", "aerich.models"],
-            "default_connection": "default",
+
+def connection_config(db_url: str, reader: bool = False) -> Union[str, dict]:
+    """
+    Tortoise connection config for a database URL.
+
+    SQLite URLs get the settings' connection profile; PRAGMAs given as URL
+    query parameters take precedence. PostgreSQL URLs get the pool settings.
+    Other databases are passed through. ``reader`` connections refuse
+    writes (``query_only``). Read-only files get no PRAGMAs that write to
+    the file, such as ``journal_mode``.
+    """
+    url = urlparse(db_url)
+    if url.scheme in POSTGRES_SCHEMES:
+        return postgres_config(db_url, reader)
+    if url.scheme != "sqlite":
+        return db_url
+
+    config = expand_db_url(db_url)
+    credentials = config["credentials"]
+    explicit = parse_qs(url.query)
+    read_only = is_read_only()
+    for pragma, value in sqlite_pragmas(read_only or reader).items():
+        if pragma not in explicit:
+            credentials[pragma] = value
+
+    if read_only and credentials["file_path"] != ":memory:":
+        # The URI client opens the file read-only; immutable additionally
+        # skips locking and change detection, so the file must not change
+        uri = f"file:{quote(credentials['file_path'])}?mode=ro"
+        if settings.SQLITE_IMMUTABLE:
+            uri += "&immutable=1"
+        credentials["file_path"] = uri
+        config["engine"] = "app.core.sqlite"
+        for pragma in WRITING_PRAGMAS:
+            credentials.pop(pragma, None)
+
+    return config
+
+
+def read_urls() -> List[str]:
+    """Configured read replica URLs."""
+    return [url.strip() for url in settings.DATABASE_READ_URLS.split(",") if url.strip()]
+
+
+def read_pool_size() -> int:
+    """
+    Number of SQLite reader connections to open next to the writer.
+
+    Each SQLite client runs every query on one connection and its thread,
+    so concurrent reads queue behind each other; in WAL mode separate
+    connections can read in parallel. In-memory and non-SQLite databases
+    get no pool, as other connections would not see the same data.
+    """
+    url = urlparse(settings.DATABASE_URL)
+    if url.scheme != "sqlite" or ":memory:" in settings.DATABASE_URL:
+        return 0
+    return max(0, settings.SQLITE_READ_POOL_SIZE)
+
+
+def tortoise_config(models: List[str] = MODEL_MODULES) -> dict:
+    """Tortoise ORM config for the configured database."""
+    db_connections = {"default": connection_config(settings.DATABASE_URL)}
+    # Replicas if configured, otherwise local readers of the primary file
+    readers = read_urls() or [settings.DATABASE_URL] * read_pool_size()
+    for index, url in enumerate(readers):
+        db_connections[f"{READ_CONNECTION_PREFIX}{index}"] = connection_config(url, reader=True)
+
+    return {
+        "connections": db_connections,
+        "apps": {
+            "models": {
+                "models": models,
+                "default_connection": "default",
+            },
         },
-    },
-}
+    }
+
+
+TORTOISE_ORM = tortoise_config(MODEL_MODULES + ["aerich.models"])
+
+
+class ReadPool:
+    """
+    Round-robin picker over the reader connections, idle ones first.
+
+    Readers may be replicas that lag behind the primary. After a write that
+    must be visible right away, ``mark_write`` sends every read to the
+    primary for a short window. Local readers of the primary file see
+    committed writes at once and are never pinned. The window is kept by
+    each worker process: reads served by other workers still go to the
+    replicas.
+    """
+
+    def __init__(self, read_your_writes_seconds: float):
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.aliases: List[str] = []
+        self.replicas = False
+        self._turn = count()
+        self._primary_until = 0.0
+        self.reads = 0
+        self.pinned_reads = 0
+
+    def configure(self, aliases: List[str], replicas: bool = False) -> None:
+        self.aliases = list(aliases)
+        self.replicas = replicas
+        self._primary_until = 0.0
+
+    def mark_write(self) -> None:
+        """Route reads to the primary for the read-your-writes window, if replicas may lag."""
+        if self.replicas:
+            self._primary_until = time.monotonic() + self.read_your_writes_seconds
+
+    def connection(self) -> Optional[BaseDBAsyncClient]:
+        """
+        A reader connection for a SELECT outside a transaction.
+
+        Returns None without a pool or inside the read-your-writes window,
+        which ``using_db`` treats as the default connection.
+        """
+        if not self.aliases:
+            return None
+
+        self.reads += 1
+        if time.monotonic() < self._primary_until:
+            self.pinned_reads += 1
+            return None
+
+        start = next(self._turn)
+        size = len(self.aliases)
+        for offset in range(size):
+            client = connections.get(self.aliases[(start + offset) % size])
+            # SQLite clients run one query at a time behind a lock; pooled
+            # clients (Postgres) have no such lock and are always available
+            lock = getattr(client, "_lock", None)
+            if lock is None or not lock.locked():
+                return client
+        return connections.get(self.aliases[start % size])
+
+    def stats(self) -> dict:
+        """Reader count and how many reads were pinned to the primary."""
+        return {
+            "readers": len(self.aliases),
+            "reads": self.reads,
+            "pinned_to_primary": self.pinned_reads,
+        }
+
+
+read_pool = ReadPool(read_your_writes_seconds=settings.DATABASE_READ_YOUR_WRITES_SECONDS)
+
+
+def read_connection() -> Optional[BaseDBAsyncClient]:
+    """Connection for read-only queries: a pooled reader or the default."""
+    return read_pool.connection()
+
+
+async def optimize_db() -> None:
+    """
+    Refresh SQLite query planner statistics.
+
+    A database that was never analyzed gets a full ``ANALYZE``; otherwise
+    ``PRAGMA optimize`` re-analyzes only the tables whose statistics went
+    stale. No-op for other databases and read-only connections.
+    """
+    connection = connections.get("default")
+    if connection.capabilities.dialect != "sqlite" or is_read_only():
+        return
+
+    analyzed = await connection.execute_query_dict(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    )
+    if analyzed:
+        await connection.execute_script("PRAGMA optimize=0x10002")
+    else:
+        await connection.execute_script("ANALYZE")
+
+
+async def create_search_indexes() -> None:
+    """
+    Create the PostgreSQL indexes behind the name searches.
+
+    ``name__icontains`` compiles to ``UPPER(CAST(name AS VARCHAR)) LIKE
+    UPPER('%...%')``; a GIN index on that exact expression with
+    ``gin_trgm_ops`` serves it without a sequential scan. Requires the
+    ``pg_trgm`` extension (created if the role may). The admin directory's
+    prefix search (``LIKE 'x%'``) needs ``text_pattern_ops`` indexes, as
+    the unique indexes follow the collation. No-op elsewhere.
+    """
+    connection = connections.get("default")
+    if connection.capabilities.dialect != "postgres":
+        return
+
+    await connection.execute_script("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    await connection.execute_script(
+        "CREATE INDEX IF NOT EXISTS pokemon_name_trgm_idx "
+        "ON pokemon USING gin (UPPER(CAST(name AS VARCHAR)) gin_trgm_ops)"
+    )
+    for column in ("username", "email"):
+        await connection.execute_script(
+            f"CREATE INDEX IF NOT EXISTS users_{column}_pattern_idx "
+            f"ON users ({column} text_pattern_ops)"
+        )
+
+
+def migration_versions(directory: str = MIGRATIONS_DIR) -> List[str]:
+    """aerich version names (migration file names) in the order they apply."""
+    if not os.path.isdir(directory):
+        return []
+    files = [name for name in os.listdir(directory) if name.endswith(".py") and name[0].isdigit()]
+    return sorted(files, key=lambda name: int(name.split("_", 1)[0]))
+
+
+async def check_schema_version(directory: str = MIGRATIONS_DIR) -> None:
+    """
+    Fail fast if a migration shipped with this code was not applied.
+
+    One indexed read of aerich's version table instead of introspecting
+    every table, so startup stays fast. Migrations the database has but
+    the code does not (a newer release during a rolling restart) are
+    accepted, as migrations are expected to stay backward compatible.
+    """
+    connection = connections.get("default")
+    dialect = connection.capabilities.dialect
+    if dialect not in MIGRATION_DIALECTS:
+        raise SchemaVersionError(
+            f"No migrations are shipped for {dialect}; set DATABASE_GENERATE_SCHEMAS=true"
+        )
+
+    try:
+        rows = await connection.execute_query_dict(
+            "SELECT version FROM aerich WHERE app = 'models'"
+        )
+    except OperationalError:
+        raise SchemaVersionError(
+            "Database has no migration history; run `aerich upgrade` first"
+        ) from None
+
+    applied = {row["version"] for row in rows}
+    pending = [version for version in migration_versions(directory) if version not in applied]
+    if pending:
+        raise SchemaVersionError(
+            f"Database schema is missing migrations {', '.join(pending)}; run `aerich upgrade`"
+        )
 
 
 async def init_db():
     """Initialize database connection."""
-    await Tortoise.init(
-        db_url=settings.DATABASE_URL,
-        modules={"models": ["app.models.user", "app.models.pokemon"]},
+    config = tortoise_config()
+    await Tortoise.init(config=config)
+    instrument_db_clients()
+    read_pool.configure(
+        [alias for alias in config["connections"] if alias.startswith(READ_CONNECTION_PREFIX)],
+        replicas=bool(read_urls()),
     )
-    await Tortoise.generate_schemas()
+    if not is_read_only():
+        if settings.DATABASE_GENERATE_SCHEMAS:
+            await Tortoise.generate_schemas()
+        else:
+            await check_schema_version()
+        await create_search_indexes()
+    if settings.SQLITE_OPTIMIZE_ON_STARTUP:
+        await optimize_db()
 
 
 async def close_db():
     """Close database connection."""
+    await optimize_db()
+    read_pool.configure([])
     await Tortoise.close_connections()
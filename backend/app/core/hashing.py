@@ -0,0 +1,194 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from app.core.config import settings
+
+
+class HashingPoolSaturatedError(Exception):
+    """Raised when the password hashing pool has no room for more work."""
+
+
+class HashingPool:
+    """
+    Bounded worker pool for CPU-heavy password hashing.
+
+    argon2 and bcrypt release the GIL while hashing, so a thread pool gives
+    real parallelism without blocking the event loop. Work beyond
+    ``max_workers`` running plus ``max_queue`` waiting is rejected up front
+    instead of piling up behind the pool.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Only touched from the event loop
+        self._in_flight = 0
+        self.peak_in_flight = 0
+        self.submitted = 0
+        self.rejected = 0
+
+        # Touched from worker threads, guarded by _lock
+        self.completed = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    def _timed(self, func: Callable[..., Any], submitted_at: float) -> Callable[..., Any]:
+        def runner(*args: Any) -> Any:
+            started_at = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self.completed += 1
+                    self.total_wait_seconds += started_at - submitted_at
+                    self.total_run_seconds += finished_at - started_at
+
+        return runner
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a hashing function in the pool and await its result.
+
+        Raises:
+            HashingPoolSaturatedError: If the pool and its queue are full
+        """
+        if self._in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise HashingPoolSaturatedError("Password hashing pool is saturated")
+
+        loop = asyncio.get_running_loop()
+        runner = self._timed(func, time.perf_counter())
+        future = self._get_executor().submit(runner, *args)
+        self._in_flight += 1
+        self.submitted += 1
+        self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        # The slot is held until the hash is done, not until the caller stops
+        # waiting: a cancelled request leaves its hash running in the thread
+        future.add_done_callback(lambda _: self._release(loop))
+        return await asyncio.wrap_future(future)
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Called from the worker thread; the counter belongs to the loop
+        try:
+            loop.call_soon_threadsafe(self._release_slot)
+        except RuntimeError:  # The loop has already closed
+            pass
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+
+    @property
+    def in_flight(self) -> int:
+        """Jobs currently running or waiting in the pool."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a free worker."""
+        return max(0, self._in_flight - self.max_workers)
+
+    def stats(self) -> dict:
+        """Snapshot of pool size, saturation and timing counters."""
+        with self._lock:
+            completed = self.completed
+            total_wait = self.total_wait_seconds
+            total_run = self.total_run_seconds
+
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": min(self._in_flight, self.max_workers),
+            "queued": self.queue_depth,
+            "peak_in_flight": self.peak_in_flight,
+            "saturation": self._in_flight / max(1, self.max_workers + self.max_queue),
+            "submitted": self.submitted,
+            "completed": completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": (total_wait / completed * 1000) if completed else 0.0,
+            "avg_run_ms": (total_run / completed * 1000) if completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        """Wait for running jobs and release the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def _hash_passwords(passwords: List[str]) -> List[str]:
+    # Runs in a worker process, so the policy is imported there
+    from app.core.security import get_password_hash
+
+    return [get_password_hash(password) for password in passwords]
+
+
+class BulkHasher:
+    """
+    Hashes large batches of passwords for imports.
+
+    Uses its own process pool so bulk work neither competes with logins for
+    the request hashing pool nor holds the GIL of the serving process.
+    With ``processes=0`` a single background thread is used instead.
+    """
+
+    def __init__(self, processes: int, chunk_size: int = 64):
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.processes > 0:
+                # Forking a process that already runs threads (the event
+                # loop's executors, aiosqlite) can deadlock; start clean
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="bulk-password-hash"
+                )
+        return self._executor
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hash passwords in parallel chunks, preserving their order."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        chunks = [
+            passwords[start:start + self.chunk_size]
+            for start in range(0, len(passwords), self.chunk_size)
+        ]
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, _hash_passwords, chunk) for chunk in chunks)
+        )
+        return [hashed for chunk in results for hashed in chunk]
+
+    def shutdown(self) -> None:
+        """Release the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+bulk_hasher = BulkHasher(processes=settings.PASSWORD_HASH_BULK_PROCESSES)
@@ -0,0 +1,315 @@
+import asyncio
+import glob
+import json
+import os
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152)
+
+# A metric family as collected, written to snapshot files and rendered:
+# {"name", "type", "help", "labelnames", "samples"} plus "buckets" for
+# histograms. Counter and gauge samples are [labelvalues, value];
+# histogram samples are [labelvalues, per-bucket counts (+Inf last), sum].
+Family = dict
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def family(self) -> Family:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": [[list(labels), value] for labels, value in self._values.items()],
+        }
+
+
+class Histogram:
+    """Fixed-bucket histogram with optional labels."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        state = self._values.get(labelvalues)
+        if state is None:
+            state = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+        # Buckets are inclusive upper bounds; the last slot is +Inf
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def family(self) -> Family:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "buckets": list(self.buckets),
+            "samples": [
+                [list(labels), list(counts), total]
+                for labels, (counts, total) in self._values.items()
+            ],
+        }
+
+
+def value_family(
+    name: str,
+    metric_type: str,
+    documentation: str,
+    samples: Dict[Tuple[str, ...], float],
+    labelnames: Sequence[str] = (),
+) -> Family:
+    """Family for values read from elsewhere at collection time."""
+    return {
+        "name": name,
+        "type": metric_type,
+        "help": documentation,
+        "labelnames": list(labelnames),
+        "samples": [[list(labels), value] for labels, value in samples.items()],
+    }
+
+
+class MetricsRegistry:
+    """
+    In-process metrics with Prometheus text exposition.
+
+    Updating a metric is a dict lookup and an addition, cheap enough for
+    every request and query. With several worker processes each one writes
+    its snapshot to a shared directory and the worker answering the scrape
+    sums them; gauges from snapshots older than ``stale_seconds`` (dead
+    workers) are left out, counters and histograms are kept so totals
+    never go backwards.
+    """
+
+    def __init__(self):
+        self._metrics: List = []
+        self._callbacks: List[Callable[[], List[Family]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_callback(self, callback: Callable[[], List[Family]]) -> None:
+        """Add a function returning families read from other components."""
+        self._callbacks.append(callback)
+
+    def collect(self) -> List[Family]:
+        families = [metric.family() for metric in self._metrics]
+        for callback in self._callbacks:
+            families.extend(callback())
+        return families
+
+    def write_snapshot(self, directory: str) -> None:
+        """Atomically write this process's metrics to the shared directory."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"metrics-{os.getpid()}.json")
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"written_at": time.time(), "families": self.collect()}, f)
+        os.replace(temp_path, path)
+
+    def aggregate(self, directory: str, stale_seconds: float) -> List[Family]:
+        """Sum the snapshots of every worker in the shared directory."""
+        merged: Dict[str, Family] = {}
+        now = time.time()
+        for path in sorted(glob.glob(os.path.join(directory, "metrics-*.json"))):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            stale = now - snapshot["written_at"] > stale_seconds
+            for family in snapshot["families"]:
+                if stale and family["type"] == "gauge":
+                    continue
+                _merge_family(merged, family)
+        return list(merged.values())
+
+    def render(self) -> str:
+        """Prometheus exposition of this process, or of all workers."""
+        directory = settings.METRICS_MULTIPROC_DIR
+        if not directory:
+            return render_families(self.collect())
+
+        self.write_snapshot(directory)
+        return render_families(
+            self.aggregate(directory, stale_seconds=settings.METRICS_FLUSH_SECONDS * 3)
+        )
+
+
+def _merge_family(merged: Dict[str, Family], family: Family) -> None:
+    target = merged.get(family["name"])
+    if target is None:
+        merged[family["name"]] = {
+            **family,
+            "samples": [[list(s[0]), *_copy_values(s[1:])] for s in family["samples"]],
+        }
+        return
+
+    by_labels = {tuple(sample[0]): sample for sample in target["samples"]}
+    for sample in family["samples"]:
+        existing = by_labels.get(tuple(sample[0]))
+        if existing is None:
+            target["samples"].append([list(sample[0]), *_copy_values(sample[1:])])
+        elif family["type"] == "histogram":
+            existing[1] = [a + b for a, b in zip(existing[1], sample[1])]
+            existing[2] += sample[2]
+        else:
+            existing[1] += sample[1]
+
+
+def _copy_values(values: list) -> list:
+    return [list(value) if isinstance(value, list) else value for value in values]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_families(families: List[Family]) -> str:
+    """Render families in the Prometheus text format (version 0.0.4)."""
+    lines = []
+    for family in families:
+        name = family["name"]
+        labelnames = family["labelnames"]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+
+        if family["type"] != "histogram":
+            for labelvalues, value in family["samples"]:
+                lines.append(f"{name}{_labels(labelnames, labelvalues)} {_number(value)}")
+            continue
+
+        bounds = [_number(float(bound)) for bound in family["buckets"]] + ["+Inf"]
+        for labelvalues, counts, total in family["samples"]:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{name}_bucket{_labels(labelnames, labelvalues, le)} {cumulative}")
+            labels = _labels(labelnames, labelvalues)
+            lines.append(f"{name}_sum{labels} {_number(total)}")
+            lines.append(f"{name}_count{labels} {cumulative}")
+
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+http_response_size = registry.histogram(
+    "http_response_size_bytes",
+    "HTTP response body size by route template",
+    ("method", "route"),
+    buckets=SIZE_BUCKETS,
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds", "SQL statement latency", buckets=DB_LATENCY_BUCKETS
+)
+
+
+class MetricsMiddleware:
+    """
+    Record latency, status and response size of every HTTP request.
+
+    Requests are labelled with their route template (``/pokemon/{name_or_id}``),
+    never the raw path, to keep the number of series bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        body_size = 0
+
+        async def send_and_measure(message: Message) -> None:
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests.inc(method, route_path, str(status_code))
+            http_request_duration.observe(time.perf_counter() - started, method, route_path)
+            http_response_size.observe(body_size, method, route_path)
+
+
+async def flush_metrics_periodically(directory: str, interval: float) -> None:
+    """Keep this worker's snapshot in the shared directory up to date."""
+    while True:
+        registry.write_snapshot(directory)
+        await asyncio.sleep(interval)
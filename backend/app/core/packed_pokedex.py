@@ -0,0 +1,283 @@
+"""
+Packed, memory-mapped Pokedex file.
+
+Layout (little-endian, sections 8-byte aligned, in this order):
+
+    header       magic, version, record count, offset of every section
+    records      fixed-width records in id order: id, height, weight and
+                 (offset, length) references into the string table
+    ids          uint32 id of each record, for binary search
+    name order   uint32 record indices sorted by name
+    name rank    uint32 position of each record in name order
+    name starts  uint32 offset of each record's name in the name blob
+    name blob    lowercase names in id order, each followed by a newline
+    strings      deduplicated UTF-8 strings
+
+Lists are stored as strings joined by ``LIST_SEPARATOR``; stats as
+``name PAIR_SEPARATOR base_stat`` items. A length of ``NULL_LENGTH`` is a
+missing value. Opening a file maps it without reading it, so loading takes
+the same time for any size and every worker process shares the pages.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+MAGIC = b"PKDX"
+VERSION = 1
+LIST_SEPARATOR = "\x1f"
+PAIR_SEPARATOR = "\x1e"
+NULL_LENGTH = 0xFFFFFFFF
+
+STRING_FIELDS = (
+    "name",
+    "description",
+    "sprite_front_default",
+    "sprite_official_artwork",
+    "types",
+    "abilities",
+    "stats",
+)
+
+# magic, version, reserved, count, then offsets of records, ids, name
+# order, name rank, name starts, name blob and strings, and the blob length
+HEADER = struct.Struct("<4sHHI7QQ")
+RECORD = struct.Struct("<III" + "II" * len(STRING_FIELDS))
+INDEX = struct.Struct("<I")
+
+
+class PackedPokemon(NamedTuple):
+    """A Pokemon read from the packed file, with the model's attributes."""
+
+    id: int
+    name: str
+    height: int
+    weight: int
+    description: Optional[str]
+    sprite_front_default: Optional[str]
+    sprite_official_artwork: Optional[str]
+    types: List[str]
+    abilities: List[str]
+    stats: List[dict]
+
+
+def _align(buffer: bytearray) -> int:
+    buffer.extend(b"\0" * (-len(buffer) % 8))
+    return len(buffer)
+
+
+def _encode_field(field: str, value) -> Optional[str]:
+    if value is None:
+        return None
+    if field in ("types", "abilities"):
+        return LIST_SEPARATOR.join(value)
+    if field == "stats":
+        return LIST_SEPARATOR.join(
+            f"{stat['name']}{PAIR_SEPARATOR}{stat['base_stat']}" for stat in value
+        )
+    return value
+
+
+def write_packed_pokedex(path: str, records: Iterable[dict]) -> int:
+    """
+    Write Pokemon records (dicts with the model's fields) to a packed file.
+
+    The file is written next to ``path`` and renamed over it, so processes
+    that have the old file mapped keep reading a consistent copy.
+
+    Returns:
+        Number of Pokemon written
+    """
+    rows = sorted(records, key=lambda row: row["id"])
+    count = len(rows)
+
+    strings = bytearray()
+    string_refs: Dict[str, Tuple[int, int]] = {}
+
+    def add_string(value: Optional[str]) -> Tuple[int, int]:
+        if value is None:
+            return 0, NULL_LENGTH
+        ref = string_refs.get(value)
+        if ref is None:
+            encoded = value.encode("utf-8")
+            ref = string_refs[value] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return ref
+
+    records_section = bytearray()
+    for row in rows:
+        refs = []
+        for field in STRING_FIELDS:
+            refs.extend(add_string(_encode_field(field, row.get(field))))
+        records_section.extend(RECORD.pack(row["id"], row["height"], row["weight"], *refs))
+
+    # In the order of the lowercased names in the blob, which find_name bisects
+    name_order = sorted(range(count), key=lambda index: rows[index]["name"].lower())
+    name_rank = [0] * count
+    for rank, index in enumerate(name_order):
+        name_rank[index] = rank
+
+    blob = bytearray()
+    name_starts = []
+    for row in rows:
+        name_starts.append(len(blob))
+        blob.extend(row["name"].lower().encode("utf-8") + b"\n")
+
+    def pack_indices(values: List[int]) -> bytes:
+        return struct.pack(f"<{len(values)}I", *values)
+
+    body = bytearray(b"\0" * HEADER.size)
+    offsets = []
+    for section in (
+        records_section,
+        pack_indices([row["id"] for row in rows]),
+        pack_indices(name_order),
+        pack_indices(name_rank),
+        pack_indices(name_starts),
+        blob,
+        strings,
+    ):
+        offsets.append(_align(body))
+        body.extend(section)
+    HEADER.pack_into(body, 0, MAGIC, VERSION, 0, count, *offsets, len(blob))
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as packed:
+        packed.write(body)
+    os.replace(temp_path, path)
+    return count
+
+
+class PackedPokedex:
+    """Read-only view of a packed Pokedex file through ``mmap``."""
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise ValueError("Packed Pokedex files can only be read on little-endian hosts")
+
+        with open(path, "rb") as packed:
+            self._mm = mmap.mmap(packed.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            _,
+            self.count,
+            self._records_offset,
+            ids_offset,
+            name_order_offset,
+            name_rank_offset,
+            name_starts_offset,
+            self._blob_offset,
+            self._strings_offset,
+            self._blob_length,
+        ) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} packed Pokedex")
+
+        view = memoryview(self._mm)
+        self._views = [
+            view[offset : offset + INDEX.size * self.count].cast("I")
+            for offset in (ids_offset, name_order_offset, name_rank_offset, name_starts_offset)
+        ]
+        self._ids, self._name_order, self._name_rank, self._name_starts = self._views
+        self._views.append(view)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        for view in self._views:
+            view.release()
+        self._mm.close()
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if length == NULL_LENGTH:
+            return None
+        start = self._strings_offset + offset
+        return self._mm[start : start + length].decode("utf-8")
+
+    def record(self, index: int) -> PackedPokemon:
+        """The Pokemon at a record index (id order)."""
+        fields = RECORD.unpack_from(self._mm, self._records_offset + index * RECORD.size)
+        name, description, sprite, artwork, types, abilities, stats = (
+            self._string(fields[position], fields[position + 1])
+            for position in range(3, len(fields), 2)
+        )
+        return PackedPokemon(
+            id=fields[0],
+            name=name,
+            height=fields[1],
+            weight=fields[2],
+            description=description,
+            sprite_front_default=sprite,
+            sprite_official_artwork=artwork,
+            types=types.split(LIST_SEPARATOR) if types else [],
+            abilities=abilities.split(LIST_SEPARATOR) if abilities else [],
+            stats=[
+                {"name": stat_name, "base_stat": int(base_stat)}
+                for stat_name, base_stat in (
+                    item.split(PAIR_SEPARATOR) for item in stats.split(LIST_SEPARATOR)
+                )
+            ]
+            if stats
+            else [],
+        )
+
+    def _name(self, index: int) -> bytes:
+        start = self._name_starts[index]
+        end = self._name_starts[index + 1] if index + 1 < self.count else self._blob_length
+        offset = self._blob_offset
+        return self._mm[offset + start : offset + end - 1]
+
+    def find_id(self, pokemon_id: int) -> Optional[int]:
+        """Record index of a Pokemon id, or None."""
+        index = bisect_left(self._ids, pokemon_id)
+        if index < self.count and self._ids[index] == pokemon_id:
+            return index
+        return None
+
+    def find_name(self, name: str) -> Optional[int]:
+        """Record index of a Pokemon name (lowercase), or None."""
+        target = name.lower().encode("utf-8")
+        position = bisect_left(self._name_order, target, key=self._name)
+        if position < self.count and self._name(self._name_order[position]) == target:
+            return self._name_order[position]
+        return None
+
+    def _matching(self, query: str) -> List[int]:
+        """Record indices, in id order, of names containing a lowercase query."""
+        needle = query.encode("utf-8")
+        if b"\n" in needle:
+            return []
+
+        matches = []
+        start = self._blob_offset
+        end = self._blob_offset + self._blob_length
+        position = self._mm.find(needle, start, end)
+        while position != -1:
+            index = bisect_right(self._name_starts, position - self._blob_offset) - 1
+            matches.append(index)
+            if index + 1 >= self.count:
+                break
+            # Continue after this name, each Pokemon matches once
+            next_name = self._blob_offset + self._name_starts[index + 1]
+            position = self._mm.find(needle, next_name, end)
+        return matches
+
+    def search(
+        self, query: Optional[str], offset: int, limit: int, sort_by: str
+    ) -> Tuple[int, List[int]]:
+        """Total and record indices of a page of names containing the query."""
+        if not query:
+            if sort_by == "name":
+                return self.count, self._name_order[offset : offset + limit].tolist()
+            return self.count, list(range(offset, min(offset + limit, self.count)))
+
+        matches = self._matching(query.lower())
+        if sort_by == "name":
+            matches.sort(key=self._name_rank.__getitem__)
+        return len(matches), matches[offset : offset + limit]
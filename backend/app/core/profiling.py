@@ -0,0 +1,244 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.core.config import settings
+from app.core.metrics import db_query_duration
+from app.core.slow_queries import slow_query_log
+
+logger = logging.getLogger("app.requests")
+_log_handler: Optional[logging.Handler] = None
+
+QUERY_METHODS = (
+    "execute_query",
+    "execute_query_dict",
+    "execute_insert",
+    "execute_many",
+    "execute_script",
+)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|\$\d+)\s*,)+\s*(?:\?|\$\d+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def configure_request_log(level: str) -> None:
+    """Write the request log to stderr, one JSON line per record, at ``level``."""
+    global _log_handler
+    if _log_handler is None:
+        _log_handler = logging.StreamHandler()
+        _log_handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(_log_handler)
+    logger.setLevel(level.upper())
+
+
+def fingerprint(query: str) -> str:
+    """Normalize a SQL statement so queries differing only in values compare equal."""
+    query = _STRING_LITERAL.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    query = _PLACEHOLDER_LIST.sub("(...)", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+class RequestStats:
+    """SQL and serialization time spent on behalf of one request."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def record_query(self, query: str, seconds: float) -> None:
+        self.query_count += 1
+        self.db_seconds += seconds
+        self.fingerprints[fingerprint(query)] += 1
+
+    def repeated_queries(self, threshold: int) -> Dict[str, int]:
+        """Statements issued at least ``threshold`` times, a sign of N+1 access."""
+        if threshold <= 0:
+            return {}
+        return {query: n for query, n in self.fingerprints.items() if n >= threshold}
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+# Set while a query is being timed, so backends calling one execute method
+# from another are counted once
+_in_query: ContextVar[bool] = ContextVar("in_query", default=False)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats of the request being handled, None outside a request."""
+    return _request_stats.get()
+
+
+def _timed(method: Callable) -> Callable:
+    @wraps(method)
+    async def timed_method(self, query: str, *args: Any, **kwargs: Any):
+        if _in_query.get():
+            return await method(self, query, *args, **kwargs)
+
+        token = _in_query.set(True)
+        started = time.perf_counter()
+        try:
+            return await method(self, query, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            if elapsed >= slow_query_log.threshold_seconds:
+                # Still flagged as in a query, so the EXPLAIN it schedules
+                # is not timed (or logged as slow) itself
+                values = args[0] if args else kwargs.get("values")
+                slow_query_log.observe(self, query, values, elapsed, fingerprint(query))
+            _in_query.reset(token)
+            db_query_duration.observe(elapsed)
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.record_query(query, elapsed)
+
+    timed_method.__profiled__ = True
+    return timed_method
+
+
+def _client_classes(cls: type) -> List[type]:
+    classes = []
+    for subclass in cls.__subclasses__():
+        classes.append(subclass)
+        classes.extend(_client_classes(subclass))
+    return classes
+
+
+def instrument_db_clients() -> None:
+    """
+    Time the query methods of every loaded Tortoise client class.
+
+    Idempotent; call again after new backends are imported. Every query
+    feeds the DB latency histogram; it is also attributed to the current
+    request while one is being profiled.
+    """
+    for cls in _client_classes(BaseDBAsyncClient):
+        for name in QUERY_METHODS:
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(method, "__profiled__", False):
+                setattr(cls, name, _timed(method))
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON response that records its rendering time on the current request."""
+
+    def render(self, content: Any) -> bytes:
+        stats = _request_stats.get()
+        if stats is None:
+            return self.encode(content)
+
+        started = time.perf_counter()
+        body = self.encode(content)
+        stats.serialize_seconds += time.perf_counter() - started
+        return body
+
+    def encode(self, content: Any) -> bytes:
+        return super().render(content)
+
+
+class FastJSONResponse(TimedJSONResponse):
+    """
+    JSON response encoded by pydantic-core's serializer.
+
+    Handles plain data as well as pydantic models, which are serialized in
+    one pass without being converted to dicts first. Hot routes return it
+    with their model directly, so FastAPI skips re-validating the result
+    against ``response_model`` (kept for the OpenAPI schema) and running
+    ``jsonable_encoder`` over it.
+    """
+
+    def encode(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+def server_timing(stats: RequestStats) -> str:
+    """Server-Timing header value for a request's stats."""
+    return ", ".join(
+        [
+            f"app;dur={stats.elapsed() * 1000:.1f}",
+            f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.query_count} queries"',
+            f"serialize;dur={stats.serialize_seconds * 1000:.1f}",
+        ]
+    )
+
+
+class RequestProfilingMiddleware:
+    """
+    Per-request SQL accounting.
+
+    Counts and times the queries each HTTP request issues, reports request,
+    DB and serialization time in a ``Server-Timing`` header and writes one
+    JSON log line per request to the ``app.requests`` logger. Statements
+    repeated ``SQL_REPEATED_QUERY_THRESHOLD`` times or more are logged as a
+    warning, as they usually mean a query runs once per item (N+1).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        instrument_db_clients()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.REQUEST_PROFILING:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(stats).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            self._log(scope, status_code, stats)
+
+    def _log(self, scope: Scope, status_code: int, stats: RequestStats) -> None:
+        if not logger.isEnabledFor(logging.WARNING):
+            return
+        repeated = stats.repeated_queries(settings.SQL_REPEATED_QUERY_THRESHOLD)
+        if not repeated and not logger.isEnabledFor(logging.INFO):
+            return
+
+        route = scope.get("route")
+        record = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status_code,
+            "duration_ms": round(stats.elapsed() * 1000, 2),
+            "db_ms": round(stats.db_seconds * 1000, 2),
+            "queries": stats.query_count,
+            "serialize_ms": round(stats.serialize_seconds * 1000, 2),
+        }
+        if repeated:
+            record["repeated_queries"] = repeated
+            logger.warning(json.dumps(record))
+        else:
+            logger.info(json.dumps(record))
@@ -0,0 +1,158 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class TokenBucketLimiter:
+    """
+    In-memory token buckets, one per key.
+
+    Each key may burst up to ``capacity`` requests and then earns
+    ``rate_per_minute`` new tokens per minute. The number of tracked keys is
+    bounded; the least recently seen buckets are dropped first, which only
+    ever errs on the side of letting a request through.
+    """
+
+    def __init__(self, capacity: int, rate_per_minute: float, max_keys: int = 100_000):
+        self.capacity = capacity
+        self.refill_per_second = rate_per_minute / 60
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, tuple[float, float]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0 and self.refill_per_second > 0
+
+    def acquire(self, key: Hashable) -> float:
+        """
+        Take one token for a key.
+
+        Returns:
+            0 if the request is allowed, otherwise the seconds to wait until
+            a token becomes available
+        """
+        if not self.enabled:
+            return 0.0
+
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (float(self.capacity), now))
+        tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+
+        if tokens >= 1:
+            retry_after = 0.0
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self.refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ConcurrencyLimiter:
+    """Non-blocking cap on how many operations may run at once."""
+
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max_concurrent
+        self.active = 0
+
+    def try_acquire(self) -> bool:
+        if self.max_concurrent > 0 and self.active >= self.max_concurrent:
+            return False
+        self.active += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+
+
+class LoginThrottle:
+    """
+    Admission control for password logins.
+
+    Every attempt takes a token from the bucket of its username and of its
+    client IP, and must get one of a fixed number of verification slots.
+    Rejections happen before any password hashing, so a credential
+    stuffing burst cannot saturate the hashing workers.
+    """
+
+    def __init__(
+        self,
+        username_limiter: TokenBucketLimiter,
+        ip_limiter: TokenBucketLimiter,
+        verifications: ConcurrencyLimiter,
+    ):
+        self.username_limiter = username_limiter
+        self.ip_limiter = ip_limiter
+        self.verifications = verifications
+        self.allowed = 0
+        self.limited_by_username = 0
+        self.limited_by_ip = 0
+        self.limited_by_concurrency = 0
+
+    def check(self, username: str, client_ip: Optional[str] = None) -> float:
+        """
+        Admit a login attempt against the per-IP and per-username buckets.
+
+        Returns:
+            0 if allowed, otherwise the seconds the client should wait
+        """
+        if client_ip is not None:
+            retry_after = self.ip_limiter.acquire(client_ip)
+            if retry_after:
+                self.limited_by_ip += 1
+                return retry_after
+
+        # Usernames are case-folded so variants share one bucket
+        retry_after = self.username_limiter.acquire(username.lower())
+        if retry_after:
+            self.limited_by_username += 1
+            return retry_after
+
+        return 0.0
+
+    def acquire_verification(self) -> bool:
+        """Reserve a verification slot; release it with release_verification."""
+        if not self.verifications.try_acquire():
+            self.limited_by_concurrency += 1
+            return False
+        self.allowed += 1
+        return True
+
+    def release_verification(self) -> None:
+        self.verifications.release()
+
+    def reset(self) -> None:
+        """Forget every bucket and counter."""
+        self.username_limiter.clear()
+        self.ip_limiter.clear()
+        self.allowed = 0
+        self.limited_by_username = 0
+        self.limited_by_ip = 0
+        self.limited_by_concurrency = 0
+
+    def stats(self) -> dict:
+        """Limiter hit counts and current load."""
+        return {
+            "allowed": self.allowed,
+            "limited_by_username": self.limited_by_username,
+            "limited_by_ip": self.limited_by_ip,
+            "limited_by_concurrency": self.limited_by_concurrency,
+            "active_verifications": self.verifications.active,
+            "max_concurrent_verifications": self.verifications.max_concurrent,
+            "tracked_usernames": len(self.username_limiter),
+            "tracked_ips": len(self.ip_limiter),
+        }
+
+
+def retry_after_header(seconds: float) -> str:
+    """Format a wait time for the Retry-After header (whole seconds, at least 1)."""
+    return str(max(1, math.ceil(seconds)))
@@ -1,26 +1,106 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
-from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.hashing import hashing_pool
 
-pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
+def build_pwd_context(time_cost: int, memory_cost: int, parallelism: int) -> CryptContext:
+    """
+    Build the password hashing policy.
+
+    New hashes use argon2 with the given cost; bcrypt is only kept to
+    recognise legacy hashes, which are marked for rehashing.
+    """
+    return CryptContext(
+        schemes=["argon2", "bcrypt"],
+        deprecated="auto",
+        argon2__rounds=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism,
+    )
+
+
+pwd_context = build_pwd_context(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+
+
+def _verify_bcrypt(plain_password: str, hashed_password: str) -> bool:
+    # passlib 1.7 cannot load the bcrypt>=4 backend, so legacy hashes are
+    # checked with the bcrypt package directly (bcrypt only uses 72 bytes).
+    # Imported here as only users not logged in since the argon2 switch need it
+    import bcrypt
+
+    try:
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8")[:72], hashed_password.encode("utf-8")
+        )
+    except ValueError:
+        return False
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
+    if hashed_password.startswith(BCRYPT_PREFIXES):
+        return _verify_bcrypt(plain_password, hashed_password)
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored hash is outdated.
+
+    Returns:
+        Whether the password matched, and a replacement hash when the stored
+        one does not follow the current policy (legacy bcrypt or argon2 with
+        other cost parameters), otherwise None
+    """
+    if hashed_password.startswith(BCRYPT_PREFIXES):
+        if not _verify_bcrypt(plain_password, hashed_password):
+            return False, None
+        return True, get_password_hash(plain_password)
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash without blocking the event loop."""
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify and maybe rehash a password without blocking the event loop."""
+    return await hashing_pool.run(
+        verify_and_update_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash without blocking the event loop."""
+    return await hashing_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
+    # jose loads the cryptography backend (~40 ms), which workers that only
+    # serve public Pokemon reads never need; imported on first use
+    from jose import jwt
+
     to_encode = data.copy()
 
     if expires_delta:
@@ -35,6 +115,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def decode_access_token(token: str) -> Optional[dict]:
     """Decode JWT access token."""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
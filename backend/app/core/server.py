@@ -0,0 +1,169 @@
+import gc
+import glob
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Callable, Dict, Optional
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+# A worker dying sooner than this after starting is restarted after a pause,
+# so a worker that cannot start does not spin the supervisor
+MIN_WORKER_LIFETIME_SECONDS = 1.0
+# Time for lifespan shutdown after in-flight requests were drained
+SHUTDOWN_MARGIN_SECONDS = 10.0
+
+EXIT_SIGNALS = {signal.SIGTERM, signal.SIGINT}
+
+
+def worker_count() -> int:
+    """Configured number of worker processes; 0 means one per CPU."""
+    return settings.SERVER_WORKERS if settings.SERVER_WORKERS > 0 else os.cpu_count() or 1
+
+
+def server_config(app) -> uvicorn.Config:
+    """uvicorn settings for each production worker."""
+    return uvicorn.Config(
+        app,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        loop=settings.SERVER_LOOP,
+        http=settings.SERVER_HTTP,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        lifespan="on",
+    )
+
+
+def clear_metrics_snapshots(directory: str) -> None:
+    """Remove snapshots of a previous run, whose workers no longer exist."""
+    for path in glob.glob(os.path.join(directory, "metrics-*.json*")):
+        os.remove(path)
+
+
+class PreforkServer:
+    """
+    Pre-forking supervisor for uvicorn workers.
+
+    The parent binds the listening socket, runs ``preload`` (importing the
+    app and loading read-mostly data) and freezes the garbage collector, so
+    that forked workers share those objects copy-on-write instead of each
+    building its own copy. uvicorn's own multi-worker mode spawns fresh
+    interpreters and cannot share them.
+
+    On SIGTERM or SIGINT every worker gets SIGTERM and drains in-flight
+    requests for up to ``SERVER_GRACEFUL_SHUTDOWN_SECONDS`` before running
+    its lifespan shutdown; workers still alive after that are killed.
+    Workers that exit on their own are replaced.
+    """
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        preload: Optional[Callable[[], None]] = None,
+    ):
+        self.config = config
+        self.workers = workers
+        self.preload = preload
+        self.children: Dict[int, float] = {}
+        self._socket: Optional[socket.socket] = None
+        self._stopping = False
+
+    def run(self) -> None:
+        self._socket = self.config.bind_socket()
+        if self.preload is not None:
+            self.preload()
+        # Objects created so far are never collected; the collector would
+        # otherwise write to their pages and unshare them in every worker
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+        logger.info("Starting %d workers (parent pid %d)", self.workers, os.getpid())
+        for _ in range(self.workers):
+            self._spawn()
+
+        try:
+            self._supervise()
+        finally:
+            self._socket.close()
+
+    def _spawn(self) -> None:
+        # Held back until the new worker is registered (parent) or has
+        # dropped the supervisor's handlers (worker)
+        signal.pthread_sigmask(signal.SIG_BLOCK, EXIT_SIGNALS)
+        pid = os.fork()
+        if pid:
+            self.children[pid] = time.monotonic()
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, EXIT_SIGNALS)
+            return
+
+        # Worker: its own process group, so a terminal Ctrl+C reaches only
+        # the parent, which then stops the workers once and gracefully
+        os.setpgid(0, 0)
+        for signum in EXIT_SIGNALS:
+            signal.signal(signum, signal.SIG_DFL)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, EXIT_SIGNALS)
+        code = 0
+        try:
+            uvicorn.Server(self.config).run(sockets=[self._socket])
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _handle_exit(self, signum: int, frame) -> None:
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info("Stopping workers gracefully")
+        for pid in list(self.children):
+            self._signal(pid, signal.SIGTERM)
+
+    @staticmethod
+    def _signal(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _supervise(self) -> None:
+        while self.children and not self._stopping:
+            try:
+                pid, _ = os.waitpid(-1, 0)
+            except ChildProcessError:
+                break
+            started_at = self.children.pop(pid, None)
+            if started_at is None or self._stopping:
+                continue
+            logger.warning("Worker %d exited, starting a new one", pid)
+            if time.monotonic() - started_at < MIN_WORKER_LIFETIME_SECONDS:
+                time.sleep(MIN_WORKER_LIFETIME_SECONDS)
+            if not self._stopping:
+                self._spawn()
+
+        grace = settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS + SHUTDOWN_MARGIN_SECONDS
+        deadline = time.monotonic() + grace
+        while self.children:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                self.children.pop(pid, None)
+            elif time.monotonic() >= deadline:
+                for pid in list(self.children):
+                    logger.warning("Worker %d did not stop in time, killing it", pid)
+                    self._signal(pid, signal.SIGKILL)
+                deadline = float("inf")
+            else:
+                time.sleep(0.1)
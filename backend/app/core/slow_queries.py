@@ -0,0 +1,212 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.slow_queries")
+
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+CALLER_MODULES = ("app.services.", "app.routes.")
+MAX_PARAMS_LENGTH = 500
+
+# Parameters are logged for reads only, and not when they are compared with
+# these columns: writes and lookups would put password and token hashes on disk
+LOGGED_PARAMS = ("SELECT", "WITH")
+SENSITIVE_COLUMNS = ("hashed_password", "token_hash")
+REDACTED = "<redacted>"
+WHERE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+
+
+def find_caller() -> Optional[str]:
+    """Innermost service or route function on the stack, e.g. ``PokemonService.search_pokemon``."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(CALLER_MODULES):
+            return frame.f_code.co_qualname
+        frame = frame.f_back
+    return None
+
+
+def loggable_params(query: str, values: Optional[list]) -> Optional[str]:
+    """Parameters of a statement as written to the log, redacted if sensitive."""
+    if not values:
+        return None
+    statement = query.lstrip()
+    if not statement.upper().startswith(LOGGED_PARAMS):
+        return REDACTED
+    conditions = WHERE.split(statement, maxsplit=1)[-1]
+    if any(column in conditions for column in SENSITIVE_COLUMNS):
+        return REDACTED
+    return repr(values)[:MAX_PARAMS_LENGTH]
+
+
+def worker_log_path(path: str) -> str:
+    """The log file of this process: ``logs/slow_queries.log`` becomes ``logs/slow_queries.<pid>.log``."""
+    root, extension = os.path.splitext(path)
+    return f"{root}.{os.getpid()}{extension}"
+
+
+class SlowQueryLog:
+    """
+    Log of statements slower than a threshold.
+
+    Every slow statement is counted in an in-memory summary by fingerprint.
+    A sampled share of them is written, with the parameters of reads,
+    calling service method and query plan, as JSON lines to a rotating log file. The plan is
+    captured in the background with ``EXPLAIN QUERY PLAN`` (``EXPLAIN`` on
+    PostgreSQL) so the slow request is not delayed further.
+
+    Both are per process: each server worker keeps its own summary and
+    writes its own file (see ``worker_log_path``), as rotating a file that
+    several processes append to loses lines.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        sample_rate: float,
+        path: str,
+        max_bytes: int,
+        backups: int,
+        max_fingerprints: int = 500,
+    ):
+        self.threshold_seconds = threshold_ms / 1000 if threshold_ms > 0 else float("inf")
+        self.sample_rate = sample_rate
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.max_fingerprints = max_fingerprints
+        self._summary: Dict[str, dict] = {}
+        self._handler: Optional[logging.Handler] = None
+        self._handler_pid: Optional[int] = None
+        self._pending: set = set()
+
+    def _ensure_handler(self) -> None:
+        if not self.path:
+            return
+        if self._handler is not None:
+            if self._handler_pid == os.getpid():
+                return
+            # Opened before the server forked; this worker gets its own file
+            logger.removeHandler(self._handler)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._handler = RotatingFileHandler(
+            worker_log_path(self.path), maxBytes=self.max_bytes, backupCount=self.backups
+        )
+        self._handler_pid = os.getpid()
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(self._handler)
+        logger.setLevel(logging.INFO)
+
+    def observe(
+        self, client: Any, query: str, values: Optional[list], seconds: float, query_fingerprint: str
+    ) -> None:
+        """Record a statement that took at least the threshold."""
+        caller = find_caller()
+        entry = self._summary.get(query_fingerprint)
+        if entry is None:
+            if len(self._summary) >= self.max_fingerprints:
+                # Forget the offender with the least total time
+                del self._summary[min(self._summary, key=lambda k: self._summary[k]["total_ms"])]
+            entry = self._summary[query_fingerprint] = {
+                "fingerprint": query_fingerprint,
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "callers": {},
+                "example": query,
+                "plan": None,
+            }
+
+        duration_ms = seconds * 1000
+        entry["count"] += 1
+        entry["total_ms"] += duration_ms
+        entry["max_ms"] = max(entry["max_ms"], duration_ms)
+        entry["last_seen"] = time.time()
+        if caller:
+            entry["callers"][caller] = entry["callers"].get(caller, 0) + 1
+
+        if random.random() >= self.sample_rate:
+            return
+
+        record = {
+            "timestamp": time.time(),
+            "duration_ms": round(duration_ms, 2),
+            "caller": caller,
+            "sql": query,
+            "params": loggable_params(query, values),
+            "fingerprint": query_fingerprint,
+        }
+        task = asyncio.ensure_future(self._explain_and_write(client, query, values, record, entry))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _explain_and_write(
+        self, client: Any, query: str, values: Optional[list], record: dict, entry: dict
+    ) -> None:
+        plan = None
+        if query.lstrip().upper().startswith(EXPLAINABLE):
+            plan = await self.explain(client, query, values)
+            entry["plan"] = plan
+        record["plan"] = plan
+
+        self._ensure_handler()
+        logger.info(json.dumps(record, default=str))
+
+    @staticmethod
+    async def explain(client: Any, query: str, values: Optional[list]) -> Optional[List[str]]:
+        """Query plan of a statement, or None if it cannot be explained."""
+        if client.capabilities.dialect == "sqlite":
+            statement = f"EXPLAIN QUERY PLAN {query}"
+        else:
+            statement = f"EXPLAIN {query}"
+
+        try:
+            rows = await client.execute_query_dict(statement, values or None)
+        except Exception as e:  # The connection may be gone (closed transaction)
+            return [f"EXPLAIN failed: {e}"]
+
+        if client.capabilities.dialect == "sqlite":
+            return [row["detail"] for row in rows]
+        return [next(iter(row.values())) for row in rows]
+
+    async def drain(self) -> None:
+        """Wait for plans still being captured."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> List[dict]:
+        """Worst statements by total time, count or maximum time."""
+        entries = sorted(self._summary.values(), key=lambda e: e[order_by], reverse=True)
+        return [
+            {
+                **entry,
+                "total_ms": round(entry["total_ms"], 2),
+                "max_ms": round(entry["max_ms"], 2),
+                "avg_ms": round(entry["total_ms"] / entry["count"], 2),
+            }
+            for entry in entries[:limit]
+        ]
+
+    def reset(self) -> None:
+        self._summary.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    sample_rate=settings.SLOW_QUERY_SAMPLE_RATE,
+    path=settings.SLOW_QUERY_LOG_PATH,
+    max_bytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+    backups=settings.SLOW_QUERY_LOG_BACKUPS,
+)
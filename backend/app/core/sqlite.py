@@ -0,0 +1,54 @@
+import sqlite3
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import aiosqlite
+from tortoise.backends.sqlite.client import SqliteClient
+
+# PRAGMAs that write to the database file, which read-only and immutable
+# connections cannot do ("attempt to write a readonly database")
+WRITING_PRAGMAS = ("journal_mode", "auto_vacuum", "page_size", "user_version", "application_id")
+
+
+def is_read_only_uri(file_path: str) -> bool:
+    """Whether a ``file:`` URI opens the database read-only or immutable."""
+    if not file_path.startswith("file:"):
+        return False
+    query = parse_qs(urlparse(file_path).query)
+    return query.get("mode") == ["ro"] or query.get("immutable") == ["1"]
+
+
+class SqliteURIClient(SqliteClient):
+    """
+    SQLite client that opens its file as a URI.
+
+    Needed for ``file:...?mode=ro`` and ``immutable=1`` connections, which
+    the stock client cannot express because it opens plain filenames. Such
+    connections skip the PRAGMAs that write to the file, including the
+    ``journal_mode=WAL`` the stock client adds by default.
+    """
+
+    def __init__(self, file_path: str, **kwargs: Any) -> None:
+        super().__init__(file_path, **kwargs)
+        if is_read_only_uri(file_path):
+            for pragma in WRITING_PRAGMAS:
+                self.pragmas.pop(pragma, None)
+
+    async def create_connection(self, with_db: bool) -> None:
+        if not self._connection:
+            self._connection = aiosqlite.connect(self.filename, isolation_level=None, uri=True)
+            self._connection.start()
+            await self._connection._connect()
+            self._connection._conn.row_factory = sqlite3.Row
+            for pragma, val in self.pragmas.items():
+                cursor = await self._connection.execute(f"PRAGMA {pragma}={val}")
+                await cursor.close()
+            self.log.debug(
+                "Created connection %s with params: filename=%s %s",
+                self._connection,
+                self.filename,
+                " ".join(f"{k}={v}" for k, v in self.pragmas.items()),
+            )
+
+
+client_class = SqliteURIClient
@@ -1,3 +1,4 @@
-from app.models.user import User
+from app.models.refresh_token import RefreshToken
+from app.models.user import DeletedUser, User
 
-__all__ = ["User"]
+__all__ = ["DeletedUser", "RefreshToken", "User"]
@@ -12,7 +12,7 @@ class Pokemon(Model):
     description = fields.TextField(null=True)  # Pokemon description from species
     sprite_front_default = fields.CharField(max_length=500, null=True)
     sprite_official_artwork = fields.CharField(max_length=500, null=True)
-    # Store types, abilities, and stats as JSON fields
+    # Store types, abilities, and stats as JSON fields (JSONB on PostgreSQL)
     types = fields.JSONField()  # List of type names
     abilities = fields.JSONField()  # List of ability names
     stats = fields.JSONField()  # List of stat objects with name and base_stat
@@ -0,0 +1,27 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class RefreshToken(Model):
+    """Refresh token model; only an HMAC of the token itself is stored."""
+
+    id = fields.IntField(primary_key=True)
+    user = fields.ForeignKeyField(
+        "models.User", related_name="refresh_tokens", on_delete=fields.CASCADE
+    )
+    token_hash = fields.CharField(max_length=64, unique=True)
+    # Every token produced by rotating the same login shares a family
+    family = fields.CharField(max_length=32, db_index=True)
+    # User token version at issue time; a bump revokes the token
+    token_version = fields.IntField()
+    session_started_at = fields.DatetimeField()
+    expires_at = fields.DatetimeField()
+    used_at = fields.DatetimeField(null=True)  # Set once rotated
+    revoked_at = fields.DatetimeField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "refresh_tokens"
+
+    def __str__(self):
+        return f"RefreshToken(user_id={self.user_id}, family={self.family})"
@@ -11,11 +11,28 @@ class User(Model):
     hashed_password = fields.CharField(max_length=255)
     is_active = fields.BooleanField(default=True)
     is_admin = fields.BooleanField(default=False)
+    # Bumped to revoke every access token issued before the change
+    token_version = fields.IntField(default=0)
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
 
     class Meta:
         table = "users"
+        # Admin directory filters, paged in id order
+        indexes = (("is_active", "id"), ("is_admin", "id"))
 
     def __str__(self):
         return f"User(username={self.username}, email={self.email})"
+
+
+class DeletedUser(Model):
+    """Id of a deleted user, kept a while so other workers revoke its tokens."""
+
+    user_id = fields.IntField(primary_key=True, generated=False)
+    deleted_at = fields.DatetimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        table = "deleted_users"
+
+    def __str__(self):
+        return f"DeletedUser(user_id={self.user_id})"
@@ -1,5 +1,6 @@
 from app.routes.auth import router as auth_router
 from app.routes.admin import router as admin_router
 from app.routes.pokemon import router as pokemon_router
+from app.routes.metrics import router as metrics_router
 
-__all__ = ["auth_router", "admin_router", "pokemon_router"]
+__all__ = ["auth_router", "admin_router", "pokemon_router", "metrics_router"]
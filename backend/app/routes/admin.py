@@ -1,18 +1,33 @@
-from typing import List
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from app.core.database import read_pool
+from app.core.hashing import hashing_pool
+from app.core.slow_queries import slow_query_log
 from app.routes.auth import oauth2_scheme
-from app.schemas.user import UserCreate, UserResponse, UserUpdate
-from app.services.auth_service import AuthService
+from app.schemas.user import (
+    BulkUserImportResponse,
+    BulkUserUpdate,
+    BulkUserUpdateResponse,
+    UserCreate,
+    UserResponse,
+    UserUpdate,
+)
+from app.services.auth_service import AuthService, login_throttle, principal_cache
+from app.services.pokedex_refresh_service import pokedex_refresher
+from app.services.token_version_service import token_versions
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
 async def get_current_admin_user(token: str = Depends(oauth2_scheme)):
-    """Dependency to get current admin user from token."""
-    return await AuthService.get_current_admin_user(token)
+    """Dependency to get current admin claims from token."""
+    return await AuthService.get_current_admin_principal(token)
 
 
 @router.post("/users", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -32,20 +47,173 @@ async def create_user(
     return user
 
 
+async def _iter_lines(request: Request) -> AsyncIterator[str]:
+    """
+    Yield the lines of a request body as it streams in.
+
+    Bytes that are not UTF-8 are kept as lone surrogates, so the row holding
+    them can be reported as malformed (see ``_is_utf8``) instead of failing
+    the whole import.
+    """
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig", "surrogateescape").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig", "surrogateescape").rstrip("\r")
+
+
+def _is_utf8(text: str) -> bool:
+    """Whether a line from ``_iter_lines`` was valid UTF-8."""
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+async def _iter_csv_records(request: Request) -> AsyncIterator[str]:
+    """Yield the non-empty CSV records of a body; quoted fields may span lines."""
+    pending: List[str] = []
+    quotes = 0
+    async for line in _iter_lines(request):
+        if not pending and not line.strip():
+            continue
+        pending.append(line)
+        # An odd number of quotes so far means a quoted field is still open
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield "\n".join(pending)
+            pending, quotes = [], 0
+    if pending:
+        yield "\n".join(pending)
+
+
+async def _iter_import_rows(request: Request) -> AsyncIterator[Any]:
+    """
+    Parse a bulk import body into rows.
+
+    CSV (``text/csv``, header row required) and NDJSON
+    (``application/x-ndjson``) bodies are parsed record by record while they
+    stream in; a plain JSON array is parsed whole. Malformed rows, including
+    rows that are not UTF-8, are yielded as None so they are reported
+    without aborting the import.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type == "text/csv":
+        header = None
+        async for record in _iter_csv_records(request):
+            try:
+                values = next(csv.reader(io.StringIO(record, newline="")))
+            except csv.Error:
+                values = None
+            if not _is_utf8(record):
+                values = None
+            if header is None:
+                if values is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="CSV header is malformed or not UTF-8",
+                    )
+                header = [name.strip() for name in values]
+                continue
+            if values is None or len(values) != len(header):
+                yield None
+                continue
+            # Empty cells mean "use the default"
+            yield {name: value for name, value in zip(header, values) if value != ""}
+
+    elif content_type in ("application/x-ndjson", "application/jsonl"):
+        async for line in _iter_lines(request):
+            if not line.strip():
+                continue
+            if not _is_utf8(line):
+                yield None
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+    elif content_type == "application/json":
+        try:
+            rows = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Body is not valid JSON",
+            )
+        if not isinstance(rows, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="JSON body must be an array of users",
+            )
+        for row in rows:
+            yield row
+
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Use text/csv, application/x-ndjson or application/json",
+        )
+
+
+@router.post("/users/bulk", response_model=BulkUserImportResponse)
+async def bulk_create_users(
+    request: Request,
+    current_admin=Depends(get_current_admin_user),
+):
+    """
+    Create many users in one request (Admin only).
+
+    Accepts CSV (`text/csv` with a `username,email,password,is_admin` header),
+    NDJSON (`application/x-ndjson`, one user object per line) or a JSON array.
+    Each row is validated like `POST /admin/users`; invalid or duplicate rows
+    are reported per row without failing the import.
+    """
+    return await UserService.bulk_create_users(_iter_import_rows(request))
+
+
 @router.get("/users", response_model=List[UserResponse])
 async def get_all_users(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    is_active: Optional[bool] = None,
+    is_admin: Optional[bool] = None,
+    search: Optional[str] = Query(None, min_length=1, max_length=100),
+    cursor: Optional[str] = None,
     current_admin=Depends(get_current_admin_user),
 ):
     """
-    Get all users with pagination (Admin only).
+    Get users with filters and pagination (Admin only).
+
+    Users are returned in id order. The total number of matching users is
+    sent in the `X-Total-Count` header and, when there are more, the cursor
+    of the next page in `X-Next-Cursor`.
 
-    - **skip**: Number of records to skip (default: 0)
-    - **limit**: Maximum number of records to return (default: 100)
+    - **skip**: Number of records to skip (default: 0, ignored with a cursor)
+    - **limit**: Maximum number of records to return (default: 100, max: 1000)
+    - **is_active**: Only active or only inactive users
+    - **is_admin**: Only admins or only non-admins
+    - **search**: Prefix of the username or email (case-sensitive)
+    - **cursor**: Value of `X-Next-Cursor` from the previous page
     """
-    users = await UserService.get_all_users(skip=skip, limit=limit)
-    return users
+    page = await UserService.search_users(
+        is_active=is_active,
+        is_admin=is_admin,
+        search=search,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
+    response.headers["X-Total-Count"] = str(page.total)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.users
 
 
 @router.get("/users/{user_id}", response_model=UserResponse)
@@ -62,6 +230,33 @@ async def get_user(
     return user
 
 
+@router.patch("/users", response_model=BulkUserUpdateResponse)
+async def bulk_update_users(
+    changes: BulkUserUpdate,
+    current_admin=Depends(get_current_admin_user),
+):
+    """
+    Change or delete many users at once (Admin only).
+
+    Users are selected by `ids`, by a non-empty `filter` (`is_active`,
+    `is_admin`, `search` as in the user listing) or all of them with
+    `all: true`, and either get the given `is_active` / `is_admin` values or
+    are deleted with `delete: true`. The change runs as
+    one statement in a transaction and revokes the affected users' tokens.
+    The calling admin is never affected.
+
+    - **ids**: User IDs to change
+    - **filter**: Attributes selecting the users to change
+    - **all**: Change every user
+    - **is_active**: New active status (optional)
+    - **is_admin**: New admin status (optional)
+    - **delete**: Delete the selected users instead
+    """
+    return await UserService.bulk_update_users(
+        changes, exclude_user_id=current_admin.user_id
+    )
+
+
 @router.put("/users/{user_id}", response_model=UserResponse)
 async def update_user(
     user_id: int,
@@ -94,3 +289,72 @@ async def delete_user(
     """
     await UserService.delete_user(user_id)
     return None
+
+
+@router.get("/metrics")
+async def get_metrics(current_admin=Depends(get_current_admin_user)):
+    """
+    Get runtime metrics (Admin only).
+
+    - **password_hashing**: Hashing pool size, queue depth and saturation
+    - **principal_cache**: Authenticated-user cache size and hit ratio
+    - **token_versions**: Token version registry size and refresh counters
+    - **login_throttle**: Login limiter hit counts and active verifications
+    - **read_pool**: Reader connections and reads pinned to the primary
+    """
+    return {
+        "password_hashing": hashing_pool.stats(),
+        "login_throttle": login_throttle.stats(),
+        "principal_cache": principal_cache.stats(),
+        "token_versions": token_versions.stats(),
+        "read_pool": read_pool.stats(),
+    }
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=500),
+    order_by: Literal["total_ms", "count", "max_ms"] = "total_ms",
+    current_admin=Depends(get_current_admin_user),
+):
+    """
+    Get the slowest SQL statements, grouped by fingerprint (Admin only).
+
+    Statements slower than `SLOW_QUERY_THRESHOLD_MS` since startup, with
+    their count, total/average/maximum time, calling service methods, an
+    example and the last captured query plan. The summary is kept by each
+    server worker, so it covers the worker that answers the request.
+
+    - **limit**: Maximum number of statements to return (default: 20)
+    - **order_by**: Rank by `total_ms` (default), `count` or `max_ms`
+    """
+    return slow_query_log.top(limit=limit, order_by=order_by)
+
+
+@router.post("/pokemon/refresh", status_code=status.HTTP_202_ACCEPTED)
+async def refresh_pokemon(current_admin=Depends(get_current_admin_user)):
+    """
+    Refresh the Pokemon dataset in the background (Admin only).
+
+    Runs the seed pipeline (PokeAPI, or `POKEDEX_REFRESH_SNAPSHOT` when set)
+    into a staging file and swaps the result in atomically once every
+    Pokemon was fetched. Pokemon requests keep being served from the current
+    data meanwhile. Returns the initial status; follow it with
+    `GET /admin/pokemon/refresh`. Answers 409 while a refresh is running.
+    """
+    return pokedex_refresher.start()
+
+
+@router.get("/pokemon/refresh")
+async def get_pokemon_refresh(current_admin=Depends(get_current_admin_user)):
+    """
+    Get the status of the current or last Pokemon refresh (Admin only).
+
+    - **state**: `idle`, `running`, `succeeded` or `failed`
+    - **phase**: `fetching`, `swapping`, `packing` or `reloading` while running
+    - **processed** / **total**: Pokemon fetched so far and listed by the source
+    - **count**: Pokemon in the current dataset
+    - **generation**: Number of refreshes applied so far
+    - **error**: Why the last refresh failed, if it did
+    """
+    return pokedex_refresher.status()
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
-from app.schemas.user import Token, UserLogin, UserResponse
+from app.core.profiling import FastJSONResponse
+from app.schemas.user import RefreshRequest, Token, UserLogin, UserResponse
 from app.services.auth_service import AuthService
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -14,28 +15,63 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     return await AuthService.get_current_active_user(token)
 
 
+def get_client_ip(request: Request) -> str | None:
+    """Client address used for login throttling."""
+    return request.client.host if request.client else None
+
+
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+):
     """
     Login endpoint - returns JWT token.
 
     - **username**: User's username
     - **password**: User's password
     """
-    token = await AuthService.login(form_data.username, form_data.password)
-    return token
+    token = await AuthService.login(
+        form_data.username, form_data.password, client_ip=get_client_ip(request)
+    )
+    return FastJSONResponse(token)
 
 
 @router.post("/login/json", response_model=Token)
-async def login_json(user_data: UserLogin):
+async def login_json(request: Request, user_data: UserLogin):
     """
     Login endpoint with JSON body - returns JWT token.
 
     - **username**: User's username
     - **password**: User's password
     """
-    token = await AuthService.login(user_data.username, user_data.password)
-    return token
+    token = await AuthService.login(
+        user_data.username, user_data.password, client_ip=get_client_ip(request)
+    )
+    return FastJSONResponse(token)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(refresh_data: RefreshRequest):
+    """
+    Refresh endpoint - exchanges a refresh token for new tokens.
+
+    The presented refresh token is consumed; reusing it revokes the session.
+
+    - **refresh_token**: Refresh token from login or a previous refresh
+    """
+    return FastJSONResponse(await AuthService.refresh(refresh_data.refresh_token))
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(refresh_data: RefreshRequest):
+    """
+    Logout endpoint - revokes the session of a refresh token.
+
+    - **refresh_token**: Refresh token of the session to end
+    """
+    await AuthService.logout(refresh_data.refresh_token)
+    return None
 
 
 @router.get("/me", response_model=UserResponse)
@@ -45,4 +81,4 @@ async def get_current_user_info(current_user=Depends(get_current_user)):
 
     Requires authentication token.
     """
-    return current_user
+    return FastJSONResponse(UserResponse.from_user(current_user))
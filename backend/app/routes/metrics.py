@@ -0,0 +1,91 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.database import read_pool
+from app.core.hashing import hashing_pool
+from app.core.metrics import Family, registry, value_family
+from app.services.auth_service import login_throttle, principal_cache
+from app.services.user_service import user_count_cache
+
+router = APIRouter(tags=["Metrics"])
+
+CACHES = {"principal": principal_cache, "user_count": user_count_cache}
+
+
+def collect_runtime_metrics() -> List[Family]:
+    """Gauges and counters kept by the caches, limiters and pools themselves."""
+    hashing = hashing_pool.stats()
+    throttle = login_throttle.stats()
+    cache_stats = {name: cache.stats() for name, cache in CACHES.items()}
+
+    return [
+        value_family(
+            "cache_requests_total",
+            "counter",
+            "Cache lookups by cache and result",
+            {
+                **{(name, "hit"): stats["hits"] for name, stats in cache_stats.items()},
+                **{(name, "miss"): stats["misses"] for name, stats in cache_stats.items()},
+            },
+            ("cache", "result"),
+        ),
+        value_family(
+            "cache_entries",
+            "gauge",
+            "Entries held by each cache",
+            {(name,): stats["size"] for name, stats in cache_stats.items()},
+            ("cache",),
+        ),
+        value_family(
+            "password_hash_queue_depth",
+            "gauge",
+            "Password hashes waiting for a worker thread",
+            {(): hashing["queued"]},
+        ),
+        value_family(
+            "password_hash_active",
+            "gauge",
+            "Password hashes being computed",
+            {(): hashing["active"]},
+        ),
+        value_family(
+            "password_hash_rejected_total",
+            "counter",
+            "Password hashes rejected because the pool queue was full",
+            {(): hashing["rejected"]},
+        ),
+        value_family(
+            "login_throttled_total",
+            "counter",
+            "Login attempts rejected by the throttle, by limit",
+            {
+                ("username",): throttle["limited_by_username"],
+                ("ip",): throttle["limited_by_ip"],
+                ("concurrency",): throttle["limited_by_concurrency"],
+            },
+            ("limit",),
+        ),
+        value_family(
+            "db_reads_pinned_to_primary_total",
+            "counter",
+            "Reads sent to the primary during the read-your-writes window",
+            {(): read_pool.stats()["pinned_to_primary"]},
+        ),
+    ]
+
+
+registry.register_callback(collect_runtime_metrics)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Metrics in the Prometheus text format."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -2,6 +2,7 @@ from typing import Literal, Optional
 
 from fastapi import APIRouter, Query
 
+from app.core.profiling import FastJSONResponse
 from app.schemas.pokemon import PokemonDetails, PokemonListResponse
 from app.services.pokemon_service import PokemonService
 
@@ -31,8 +32,10 @@ async def get_pokemon_list(
     Returns:
         Paginated list of Pokemon with name and URL
     """
-    return await PokemonService.search_pokemon(
-        query=query, offset=offset, limit=limit, sort_by=sort_by
+    return FastJSONResponse(
+        await PokemonService.search_pokemon(
+            query=query, offset=offset, limit=limit, sort_by=sort_by
+        )
     )
 
 
@@ -47,4 +50,4 @@ async def get_pokemon_details(name_or_id: str):
     Returns:
         Detailed Pokemon information including sprites, types, abilities, and stats
     """
-    return await PokemonService.get_pokemon_details(name_or_id=name_or_id)
+    return FastJSONResponse(await PokemonService.get_pokemon_details(name_or_id=name_or_id))
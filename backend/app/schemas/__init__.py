@@ -2,14 +2,26 @@ from app.schemas.user import (
     UserCreate,
     UserUpdate,
     UserResponse,
+    BulkUserRowResult,
+    BulkUserImportResponse,
+    UserFilter,
+    BulkUserUpdate,
+    BulkUserUpdateResponse,
     UserLogin,
     Token,
+    RefreshRequest,
 )
 
 __all__ = [
     "UserCreate",
     "UserUpdate",
     "UserResponse",
+    "BulkUserRowResult",
+    "BulkUserImportResponse",
+    "UserFilter",
+    "BulkUserUpdate",
+    "BulkUserUpdateResponse",
     "UserLogin",
     "Token",
+    "RefreshRequest",
 ]
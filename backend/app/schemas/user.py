@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Literal, Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, model_validator
 
 
 class UserBase(BaseModel):
@@ -40,6 +40,69 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+    @classmethod
+    def from_user(cls, user: Any) -> "UserResponse":
+        """Build from a stored user without validating its fields again."""
+        return cls.model_construct(**{field: getattr(user, field) for field in cls.model_fields})
+
+
+class BulkUserRowResult(BaseModel):
+    """Schema for the outcome of one row of a bulk user import."""
+
+    row: int
+    username: Optional[str] = None
+    status: Literal["created", "error"]
+    id: Optional[int] = None
+    errors: List[str] = []
+
+
+class BulkUserImportResponse(BaseModel):
+    """Schema for bulk user import report."""
+
+    total: int
+    created: int
+    failed: int
+    results: List[BulkUserRowResult]
+
+
+class UserFilter(BaseModel):
+    """Schema for selecting users by their attributes."""
+
+    is_active: Optional[bool] = None
+    is_admin: Optional[bool] = None
+    search: Optional[str] = Field(None, min_length=1, max_length=100)
+
+
+class BulkUserUpdate(BaseModel):
+    """Schema for changing or deleting many users at once."""
+
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    filter: Optional[UserFilter] = None
+    # Every user, spelled out so an empty filter cannot select them by mistake
+    all: bool = False
+    is_active: Optional[bool] = None
+    is_admin: Optional[bool] = None
+    delete: bool = False
+
+    @model_validator(mode="after")
+    def check_target_and_action(self) -> "BulkUserUpdate":
+        if [self.ids is not None, self.filter is not None, self.all].count(True) != 1:
+            raise ValueError("Provide exactly one of ids, filter or all")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("An empty filter selects every user; send all: true instead")
+        has_changes = self.is_active is not None or self.is_admin is not None
+        if self.delete == has_changes:
+            raise ValueError("Provide either delete or is_active/is_admin changes")
+        return self
+
+
+class BulkUserUpdateResponse(BaseModel):
+    """Schema for bulk user change counts."""
+
+    matched: int
+    updated: int
+    deleted: int
+
 
 class UserLogin(BaseModel):
     """Schema for user login."""
@@ -53,9 +116,19 @@ class Token(BaseModel):
 
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    """Schema for refreshing or revoking a session."""
+
+    refresh_token: str
 
 
 class TokenData(BaseModel):
     """Schema for token data."""
 
     username: Optional[str] = None
+    user_id: Optional[int] = None
+    is_admin: bool = False
+    version: Optional[int] = None
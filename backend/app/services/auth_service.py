@@ -1,16 +1,50 @@
+import time
 from datetime import timedelta
 from typing import Optional
 
 from fastapi import HTTPException, status
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.database import read_connection
+from app.core.rate_limit import (
+    ConcurrencyLimiter,
+    LoginThrottle,
+    TokenBucketLimiter,
+    retry_after_header,
+)
 from app.core.security import (
     create_access_token,
     decode_access_token,
-    verify_password,
+    verify_and_update_password_async,
 )
 from app.models.user import User
-from app.schemas.user import Token
+from app.schemas.user import Token, TokenData
+from app.services.refresh_token_service import RefreshTokenService
+from app.services.token_version_service import (
+    claims_version,
+    token_claims,
+    token_versions,
+)
+
+# Users and claims resolved from access tokens, keyed by the raw token and
+# tagged with the user id so admin changes to a user can drop its sessions
+principal_cache = TTLCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+)
+
+login_throttle = LoginThrottle(
+    username_limiter=TokenBucketLimiter(
+        capacity=settings.LOGIN_USERNAME_BURST,
+        rate_per_minute=settings.LOGIN_USERNAME_RATE_PER_MINUTE,
+    ),
+    ip_limiter=TokenBucketLimiter(
+        capacity=settings.LOGIN_IP_BURST,
+        rate_per_minute=settings.LOGIN_IP_RATE_PER_MINUTE,
+    ),
+    verifications=ConcurrencyLimiter(settings.LOGIN_MAX_CONCURRENT_VERIFICATIONS),
+)
 
 
 class AuthService:
@@ -18,24 +52,68 @@ class AuthService:
 
     @staticmethod
     async def authenticate_user(username: str, password: str) -> Optional[User]:
-        """Authenticate a user by username and password."""
-        user = await User.filter(username=username).first()
+        """
+        Authenticate a user by username and password.
+
+        Stored hashes that do not follow the current hashing policy are
+        transparently replaced after a successful verification.
+        """
+        user = await User.filter(username=username).using_db(read_connection()).first()
 
         if not user:
             return None
 
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = await verify_and_update_password_async(
+            password, user.hashed_password
+        )
+        if not verified:
             return None
 
         if not user.is_active:
             return None
 
+        if new_hash:
+            user.hashed_password = new_hash
+            await user.save(update_fields=["hashed_password"])
+
         return user
 
     @staticmethod
-    async def login(username: str, password: str) -> Token:
-        """Login a user and return access token."""
-        user = await AuthService.authenticate_user(username, password)
+    def create_user_token(user: User) -> str:
+        """Create an access token carrying the user's id, role and token version."""
+        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        return create_access_token(
+            data=token_claims(user), expires_delta=access_token_expires
+        )
+
+    @staticmethod
+    async def login(username: str, password: str, client_ip: Optional[str] = None) -> Token:
+        """
+        Login a user and return access token.
+
+        Attempts are throttled per username, per client IP and by the number
+        of verifications in progress; rejected attempts get a 429 before any
+        password hashing happens.
+        """
+        retry_after = login_throttle.check(username, client_ip)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please retry later",
+                headers={"Retry-After": retry_after_header(retry_after)},
+            )
+
+        if not login_throttle.acquire_verification():
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please retry later",
+                headers={"Retry-After": "1"},
+            )
+
+        try:
+            user = await AuthService.authenticate_user(username, password)
+        finally:
+            login_throttle.release_verification()
 
         if not user:
             raise HTTPException(
@@ -44,22 +122,71 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": user.username}, expires_delta=access_token_expires
+        token_versions.record(user)
+        access_token = AuthService.create_user_token(user)
+        refresh_token = await RefreshTokenService.issue(user)
+
+        return Token(
+            access_token=access_token, token_type="bearer", refresh_token=refresh_token
         )
 
-        return Token(access_token=access_token, token_type="bearer")
+    @staticmethod
+    async def refresh(refresh_token: str) -> Token:
+        """
+        Exchange a refresh token for a new access token and refresh token.
+
+        This avoids the password verification entirely, so sessions can be
+        kept alive without repeated logins.
+        """
+        user, new_refresh_token = await RefreshTokenService.rotate(refresh_token)
+        token_versions.record(user)
+        access_token = AuthService.create_user_token(user)
+
+        return Token(
+            access_token=access_token, token_type="bearer", refresh_token=new_refresh_token
+        )
 
     @staticmethod
-    async def get_current_user(token: str) -> User:
-        """Get current user from token."""
-        credentials_exception = HTTPException(
+    async def logout(refresh_token: str) -> None:
+        """Revoke the session a refresh token belongs to."""
+        await RefreshTokenService.revoke(refresh_token)
+
+    @staticmethod
+    def _credentials_exception() -> HTTPException:
+        return HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    @staticmethod
+    async def _is_revoked(user_id: int, version: Optional[int]) -> bool:
+        """Whether a token issued at ``version`` has been revoked."""
+        if version is None:
+            # Legacy token without a version claim
+            return False
+        return await token_versions.get(user_id) != version
+
+    @staticmethod
+    async def get_current_user(token: str) -> User:
+        """
+        Get current user from token.
+
+        Resolved users are cached per token for a short TTL, so repeat
+        requests from the same session skip both the JWT verification and
+        the user lookup. The token version is still checked against the
+        in-memory registry, so revocation takes effect immediately.
+        """
+        cached = principal_cache.get(token)
+        if cached is not None:
+            user, version = cached
+            if await AuthService._is_revoked(user.id, version):
+                principal_cache.delete(token)
+                raise AuthService._credentials_exception()
+            return user
+
+        credentials_exception = AuthService._credentials_exception()
+
         payload = decode_access_token(token)
         if payload is None:
             raise credentials_exception
@@ -68,12 +195,79 @@ class AuthService:
         if username is None:
             raise credentials_exception
 
-        user = await User.filter(username=username).first()
+        version = claims_version(payload)
+        if version is not None and await AuthService._is_revoked(payload["uid"], version):
+            raise credentials_exception
+
+        user = await User.filter(username=username).using_db(read_connection()).first()
         if user is None:
             raise credentials_exception
 
+        # Never keep a principal around longer than its token is valid
+        expires_in = payload.get("exp", 0) - time.time()
+        principal_cache.set(token, (user, version), ttl_seconds=expires_in, tag=user.id)
         return user
 
+    @staticmethod
+    async def get_current_principal(token: str) -> TokenData:
+        """
+        Get the authorization claims of a token without loading the user.
+
+        Tokens carrying ``uid``/``role``/``ver`` claims are authorized from
+        the claims and the in-memory token version registry alone; legacy
+        ``sub``-only tokens fall back to a user lookup.
+        """
+        cache_key = ("claims", token)
+        principal = principal_cache.get(cache_key)
+
+        if principal is None:
+            payload = decode_access_token(token)
+            if payload is None or payload.get("sub") is None:
+                raise AuthService._credentials_exception()
+
+            if claims_version(payload) is None:
+                user = await AuthService.get_current_active_user(token)
+                return TokenData(
+                    username=user.username,
+                    user_id=user.id,
+                    is_admin=user.is_admin,
+                )
+
+            principal = TokenData(
+                username=payload["sub"],
+                user_id=payload["uid"],
+                is_admin=payload.get("role") == "admin",
+                version=payload["ver"],
+            )
+            expires_in = payload.get("exp", 0) - time.time()
+            principal_cache.set(
+                cache_key, principal, ttl_seconds=expires_in, tag=principal.user_id
+            )
+
+        if await AuthService._is_revoked(principal.user_id, principal.version):
+            principal_cache.delete(cache_key)
+            raise AuthService._credentials_exception()
+
+        return principal
+
+    @staticmethod
+    async def get_current_admin_principal(token: str) -> TokenData:
+        """Get admin claims from token, without a user query for current tokens."""
+        principal = await AuthService.get_current_principal(token)
+
+        if not principal.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions",
+            )
+
+        return principal
+
+    @staticmethod
+    def invalidate_principal(user_id: int) -> None:
+        """Drop every cached session of a user after it changed."""
+        principal_cache.invalidate_tag(user_id)
+
     @staticmethod
     async def get_current_active_user(token: str) -> User:
         """Get current active user from token."""
@@ -0,0 +1,267 @@
+import asyncio
+import fcntl
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.database import read_pool
+from app.core.packed_pokedex import write_packed_pokedex
+from app.models.pokemon import Pokemon
+from app.services.pokemon_service import pokedex
+
+logger = logging.getLogger("app.pokedex_refresh")
+
+# Written next to the status file while a refresh is fetching
+STAGING_FILE = "pokedex-staging.jsonl.gz"
+# Staged records between status file updates
+PROGRESS_EVERY = 50
+
+
+def read_refresh_status() -> dict:
+    """Contents of the status file, or {} when there is none."""
+    try:
+        with open(settings.POKEDEX_REFRESH_STATUS_FILE, encoding="utf-8") as status_file:
+            return json.load(status_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class PokedexRefresher:
+    """
+    Background refresh of the Pokemon dataset, shared by all workers.
+
+    A refresh runs the seed pipeline (PokeAPI through the response cache, or
+    the ``POKEDEX_REFRESH_SNAPSHOT`` file) into a staging snapshot file. Only
+    when every Pokemon was fetched is the table replaced with it, in one
+    transaction; then the packed file is rewritten and the generation in the
+    status file bumped. Until then requests keep being answered from the
+    current data.
+
+    The status file also carries the progress, so any worker can report it,
+    and a lock on ``<status file>.lock`` keeps refreshes from overlapping
+    across workers. Workers that did not run the refresh pick up the new
+    generation in ``sync`` and reload their Pokedex.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._lock_fd: Optional[int] = None
+        self._status: dict = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @staticmethod
+    def _lock_path() -> str:
+        return f"{settings.POKEDEX_REFRESH_STATUS_FILE}.lock"
+
+    @staticmethod
+    def _staging_path() -> str:
+        directory = os.path.dirname(settings.POKEDEX_REFRESH_STATUS_FILE)
+        return os.path.join(directory, STAGING_FILE)
+
+    def _try_lock(self) -> Optional[int]:
+        fd = os.open(self._lock_path(), os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    def _unlock(self, fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+    def _update(self, **changes) -> None:
+        self._status.update(changes)
+        path = settings.POKEDEX_REFRESH_STATUS_FILE
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as status_file:
+            json.dump(self._status, status_file)
+        os.replace(temp_path, path)
+
+    def status(self) -> dict:
+        """State of the current or last refresh, as seen by every worker."""
+        current = read_refresh_status()
+        if not current:
+            return {"state": "idle", "generation": 0}
+        if current.get("state") == "running" and not self.running:
+            fd = self._try_lock()
+            if fd is not None:
+                # Nobody holds the lock: the worker running it has died
+                self._unlock(fd)
+                current.update(state="failed", error="Refresh was interrupted")
+        return current
+
+    def start(self) -> dict:
+        """
+        Start a refresh in the background.
+
+        Raises:
+            HTTPException: 409 if a refresh is already running in any worker
+        """
+        fd = None if self.running else self._try_lock()
+        if fd is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A Pokedex refresh is already running",
+            )
+
+        self._lock_fd = fd
+        previous = read_refresh_status()
+        self._status = {
+            "state": "running",
+            "phase": "fetching",
+            "source": "snapshot" if settings.POKEDEX_REFRESH_SNAPSHOT else "pokeapi",
+            "processed": 0,
+            "total": None,
+            "count": previous.get("count"),
+            "generation": previous.get("generation", 0),
+            "started_at": _now(),
+            "finished_at": None,
+            "error": None,
+        }
+        self._update()
+        self._task = asyncio.create_task(self._run())
+        return dict(self._status)
+
+    async def wait(self) -> None:
+        """Wait for the refresh started in this worker, if any, to finish."""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def cancel(self) -> None:
+        """Stop a refresh running in this worker, keeping the current data."""
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _records(self) -> AsyncIterator[Tuple[int, Optional[int], str, Optional[dict]]]:
+        # The seed pipeline pulls in httpx; only import it when refreshing
+        from app.services.pokedex_seed import ResponseCache, fetch_pokedex, read_snapshot_async
+
+        if not settings.POKEDEX_REFRESH_SNAPSHOT:
+            async for item in fetch_pokedex(ResponseCache()):
+                yield item
+            return
+
+        position = 0
+        async for record in read_snapshot_async(settings.POKEDEX_REFRESH_SNAPSHOT):
+            position += 1
+            yield position, None, record.get("name"), record
+
+    async def _stage(self, path: str) -> int:
+        from app.services.pokedex_seed import snapshot_header, snapshot_line
+
+        staged = 0
+        lines = [snapshot_header(None)]
+        # Compression runs in a worker thread, a batch of lines at a time
+        with gzip.open(path, "wt", encoding="utf-8") as staging:
+            async for position, total, name, record in self._records():
+                if record is None:
+                    raise RuntimeError(f"Could not fetch {name}; the current Pokedex is kept")
+                lines.append(snapshot_line(record))
+                staged += 1
+                if position % PROGRESS_EVERY == 0:
+                    await asyncio.to_thread(staging.write, "".join(lines))
+                    lines = []
+                    self._update(processed=position, total=total)
+            await asyncio.to_thread(staging.write, "".join(lines))
+        if not staged:
+            raise RuntimeError("The source has no Pokemon; the current Pokedex is kept")
+        self._update(processed=staged, total=staged)
+        return staged
+
+    async def _run(self) -> None:
+        from app.services.pokedex_seed import (
+            SNAPSHOT_FIELDS,
+            load_snapshot_records,
+            read_snapshot_async,
+        )
+
+        staging = self._staging_path()
+        try:
+            await self._stage(staging)
+
+            self._update(phase="swapping")
+            count = await load_snapshot_records(read_snapshot_async(staging), replace=True)
+            read_pool.mark_write()
+
+            if settings.POKEDEX_FILE:
+                self._update(phase="packing")
+                rows = await Pokemon.all().order_by("id").values(*SNAPSHOT_FIELDS)
+                await asyncio.to_thread(write_packed_pokedex, settings.POKEDEX_FILE, rows)
+
+            generation = self._status["generation"] + 1
+            self._update(phase="reloading")
+            await self._reload(generation)
+            self._update(
+                state="succeeded",
+                phase=None,
+                count=count,
+                generation=generation,
+                finished_at=_now(),
+            )
+            logger.info("Pokedex refreshed: %d Pokemon, generation %d", count, generation)
+        except asyncio.CancelledError:
+            self._update(state="failed", error="Refresh was cancelled", finished_at=_now())
+            raise
+        except Exception as e:
+            logger.exception("Pokedex refresh failed")
+            self._update(state="failed", error=str(e), finished_at=_now())
+        finally:
+            if os.path.exists(staging):
+                os.remove(staging)
+            self._unlock(self._lock_fd)
+            self._lock_fd = None
+
+    @staticmethod
+    async def _reload(generation: int) -> None:
+        # A lagging replica would serve the old Pokedex under the new
+        # generation, and it would never be reloaded again
+        if pokedex.loaded or settings.POKEDEX_PRELOAD:
+            await pokedex.load(primary=True)
+        pokedex.generation = generation
+
+    async def load(self) -> int:
+        """Load the Pokedex at startup, at the current generation."""
+        generation = read_refresh_status().get("generation", 0)
+        count = await pokedex.load()
+        pokedex.generation = generation
+        return count
+
+    async def sync(self) -> bool:
+        """Reload the Pokedex if another worker refreshed it; returns whether it did."""
+        generation = read_refresh_status().get("generation", 0)
+        if generation == pokedex.generation:
+            return False
+        await self._reload(generation)
+        return True
+
+
+pokedex_refresher = PokedexRefresher()
+
+
+async def sync_pokedex_periodically(interval: float) -> None:
+    """Pick up refreshes made by other workers."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await pokedex_refresher.sync()
+        except Exception:
+            logger.exception("Pokedex sync failed")
@@ -0,0 +1,444 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import zlib
+from itertools import islice
+from typing import AsyncIterable, AsyncIterator
+
+import httpx
+from tortoise.transactions import in_transaction
+
+from app.models.pokemon import Pokemon
+
+logger = logging.getLogger("app.pokedex_seed")
+
+POKEAPI_URL = "https://pokeapi.co/api/v2"
+CACHE_DIR = ".cache/pokeapi"
+# Used when PokeAPI sends no Cache-Control max-age
+CACHE_DEFAULT_MAX_AGE = 24 * 60 * 60
+
+SNAPSHOT_FORMAT = "pokedex-snapshot"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_BATCH_SIZE = 500
+
+# Columns carried in a snapshot record, in the order they are written
+SNAPSHOT_FIELDS = (
+    "id",
+    "name",
+    "height",
+    "weight",
+    "description",
+    "sprite_front_default",
+    "sprite_official_artwork",
+    "types",
+    "abilities",
+    "stats",
+)
+
+
+class ResponseCache:
+    """
+    On-disk cache of PokeAPI JSON responses.
+
+    Each URL is stored as one JSON file holding the body together with the
+    validators (ETag / Last-Modified) and freshness lifetime sent by the
+    server. Fresh entries are served without any request; stale ones are
+    revalidated with a conditional GET.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR):
+        self.directory = directory
+        self.hits = 0
+        self.revalidated = 0
+        self.downloaded = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, url: str) -> dict | None:
+        """Return the cached entry for a URL, if any."""
+        try:
+            with open(self._path(url), encoding="utf-8") as entry_file:
+                return json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, response: httpx.Response, body: dict) -> dict:
+        """Store a response body with its validators and freshness lifetime."""
+        entry = {
+            "url": url,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "max_age": parse_max_age(response.headers.get("cache-control")),
+            "fetched_at": time.time(),
+            "body": body,
+        }
+        self._write(url, entry)
+        return entry
+
+    def touch(self, url: str, entry: dict, response: httpx.Response) -> None:
+        """Refresh an entry's freshness after a 304 Not Modified."""
+        entry["fetched_at"] = time.time()
+        entry["max_age"] = parse_max_age(response.headers.get("cache-control"))
+        entry["etag"] = response.headers.get("etag") or entry.get("etag")
+        self._write(url, entry)
+
+    def _write(self, url: str, entry: dict) -> None:
+        path = self._path(url)
+        # Write then rename so an interrupted run never leaves a torn entry
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as entry_file:
+            json.dump(entry, entry_file, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def is_fresh(entry: dict) -> bool:
+        """Whether an entry can be used without contacting the server."""
+        max_age = entry.get("max_age")
+        if max_age is None:
+            max_age = CACHE_DEFAULT_MAX_AGE
+        return time.time() - entry.get("fetched_at", 0) < max_age
+
+    @property
+    def network_requests(self) -> int:
+        """Number of requests that actually reached PokeAPI."""
+        return self.revalidated + self.downloaded
+
+    def summary(self) -> str:
+        """Human readable request statistics."""
+        return (
+            f"{self.hits} served from cache, {self.revalidated} revalidated (304), "
+            f"{self.downloaded} downloaded"
+        )
+
+
+def parse_max_age(cache_control: str | None) -> int | None:
+    """Extract max-age (seconds) from a Cache-Control header."""
+    if not cache_control:
+        return None
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return 0
+    match = re.search(r"max-age=(\d+)", cache_control)
+    return int(match.group(1)) if match else None
+
+
+async def fetch_json(
+    client: httpx.AsyncClient,
+    url: str,
+    cache: ResponseCache | None = None,
+    timeout: float = 10.0,
+) -> dict:
+    """
+    GET a JSON document, going through the response cache when given.
+
+    Raises:
+        httpx.HTTPError: If the request fails and nothing usable is cached
+    """
+    if cache is None:
+        response = await client.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    entry = cache.get(url)
+    if entry and cache.is_fresh(entry):
+        cache.hits += 1
+        return entry["body"]
+
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = await client.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and entry:
+        cache.revalidated += 1
+        cache.touch(url, entry, response)
+        return entry["body"]
+
+    response.raise_for_status()
+    body = response.json()
+    cache.downloaded += 1
+    cache.put(url, response, body)
+    return body
+
+
+async def fetch_pokemon_details(
+    client: httpx.AsyncClient, pokemon_id: int, cache: ResponseCache | None = None
+) -> dict | None:
+    """Fetch detailed information for a single Pokemon."""
+    try:
+        return await fetch_json(client, f"{POKEAPI_URL}/pokemon/{pokemon_id}", cache)
+    except Exception as e:
+        logger.warning("Error fetching Pokemon %s: %s", pokemon_id, e)
+        return None
+
+
+async def fetch_pokemon_species(
+    client: httpx.AsyncClient, species_url: str, cache: ResponseCache | None = None
+) -> dict | None:
+    """
+    Fetch species information to get a Pokemon's description.
+
+    The species URL comes from the Pokemon payload rather than being derived
+    from the Pokemon id: alternate forms (ids above 10000) share the species
+    of their base form and have no species resource of their own.
+    """
+    try:
+        return await fetch_json(client, species_url, cache)
+    except Exception as e:
+        logger.warning("Error fetching Pokemon species %s: %s", species_url, e)
+        return None
+
+
+def extract_english_description(species_data: dict) -> str | None:
+    """Extract the first English flavor text entry from species data."""
+    if not species_data or "flavor_text_entries" not in species_data:
+        return None
+
+    for entry in species_data["flavor_text_entries"]:
+        if entry.get("language", {}).get("name") == "en":
+            # Clean up the text (remove newlines and form feeds)
+            text = entry.get("flavor_text", "")
+            text = text.replace("\n", " ").replace("\f", " ")
+            # Replace multiple spaces with single space
+            text = " ".join(text.split())
+            return text
+
+    return None
+
+
+def transform_pokemon(details: dict, description: str | None) -> dict:
+    """Transform a PokeAPI Pokemon payload into a Pokemon record."""
+    types = [t["type"]["name"] for t in details["types"]]
+    abilities = [a["ability"]["name"] for a in details["abilities"]]
+    stats = [
+        {
+            "name": s["stat"]["name"],
+            "base_stat": s["base_stat"]
+        }
+        for s in details["stats"]
+    ]
+
+    sprite_front = details["sprites"].get("front_default")
+    sprite_artwork = (
+        details["sprites"]
+        .get("other", {})
+        .get("official-artwork", {})
+        .get("front_default")
+    )
+
+    return {
+        "id": details["id"],
+        "name": details["name"],
+        "height": details["height"],
+        "weight": details["weight"],
+        "description": description,
+        "sprite_front_default": sprite_front,
+        "sprite_official_artwork": sprite_artwork,
+        "types": types,
+        "abilities": abilities,
+        "stats": stats,
+    }
+
+
+async def fetch_pokedex(cache: ResponseCache | None = None):
+    """
+    Fetch and transform every Pokemon PokeAPI lists.
+
+    Yields ``(position, total, name, record)`` for each listed Pokemon;
+    ``record`` is None when its details could not be fetched.
+    """
+    # Descriptions by species URL; forms of the same species share one lookup
+    species_descriptions: dict[str, str | None] = {}
+    requests_at_last_pause = 0
+
+    async with httpx.AsyncClient() as client:
+        # First, get the list of all Pokemon
+        data = await fetch_json(
+            client,
+            f"{POKEAPI_URL}/pokemon?limit=2000",  # Fetch all Pokemon
+            cache,
+            timeout=15.0,
+        )
+        total_pokemon = len(data["results"])
+
+        # Fetch details for each Pokemon
+        for idx, pokemon_item in enumerate(data["results"], 1):
+            # Extract ID from URL
+            pokemon_id = int(pokemon_item["url"].split("/")[-2])
+
+            # Fetch both pokemon details and species data
+            details = await fetch_pokemon_details(client, pokemon_id, cache)
+            record = None
+            if details:
+                species_url = details.get("species", {}).get("url")
+                if species_url and species_url not in species_descriptions:
+                    species_data = await fetch_pokemon_species(client, species_url, cache)
+                    species_descriptions[species_url] = (
+                        extract_english_description(species_data) if species_data else None
+                    )
+                record = transform_pokemon(details, species_descriptions.get(species_url))
+
+            yield idx, total_pokemon, pokemon_item["name"], record
+
+            # Add a small delay to avoid overwhelming the API; batches
+            # served entirely from the cache never touched it
+            if idx % 10 == 0:
+                if cache is None or cache.network_requests > requests_at_last_pause:
+                    await asyncio.sleep(0.5)
+                requests_at_last_pause = cache.network_requests if cache else 0
+
+
+def snapshot_header(count: int | None) -> str:
+    """First line of a snapshot; ``count`` may be None when not known upfront."""
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "count": count,
+    }
+    return json.dumps(header) + "\n"
+
+
+def snapshot_line(record: dict) -> str:
+    """One Pokemon record as a snapshot line."""
+    row = {field: record.get(field) for field in SNAPSHOT_FIELDS}
+    return json.dumps(row, separators=(",", ":")) + "\n"
+
+
+async def dump_snapshot(path: str, batch_size: int = SNAPSHOT_BATCH_SIZE) -> int:
+    """
+    Write every Pokemon in the database to a snapshot file.
+
+    Rows are read in id order and in batches, so the whole table is never
+    held in memory at once.
+
+    Returns:
+        Number of Pokemon written
+    """
+    total = await Pokemon.all().count()
+    written = 0
+
+    with gzip.open(path, "wt", encoding="utf-8") as snapshot:
+        snapshot.write(snapshot_header(total))
+
+        last_id = 0
+        while True:
+            # Keyset pagination keeps each batch an index range scan
+            rows = (
+                await Pokemon.filter(id__gt=last_id)
+                .order_by("id")
+                .limit(batch_size)
+                .values(*SNAPSHOT_FIELDS)
+            )
+            if not rows:
+                break
+
+            for row in rows:
+                snapshot.write(snapshot_line(row))
+
+            written += len(rows)
+            last_id = rows[-1]["id"]
+
+    return written
+
+
+def read_snapshot(path: str):
+    """
+    Stream Pokemon records out of a snapshot file, one dict at a time.
+
+    Raises:
+        ValueError: If the file is not a supported snapshot
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as snapshot:
+        try:
+            header = json.loads(snapshot.readline() or "{}")
+            if header.get("format") != SNAPSHOT_FORMAT:
+                raise ValueError(f"{path} is not a Pokedex snapshot")
+            if header.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(
+                    f"Unsupported snapshot version {header.get('version')} "
+                    f"(expected {SNAPSHOT_VERSION})"
+                )
+
+            for line in snapshot:
+                if line.strip():
+                    yield json.loads(line)
+        except (gzip.BadGzipFile, EOFError, zlib.error) as e:
+            raise ValueError(f"{path} is corrupt or truncated: {e}") from e
+
+
+async def read_snapshot_async(
+    path: str, batch_size: int = SNAPSHOT_BATCH_SIZE
+) -> AsyncIterator[dict]:
+    """
+    ``read_snapshot`` for the event loop: decompression and parsing run in a
+    worker thread, one batch of records at a time.
+
+    Raises:
+        ValueError: If the file is not a supported snapshot
+    """
+    records = read_snapshot(path)
+    try:
+        while True:
+            batch = await asyncio.to_thread(list, islice(records, batch_size))
+            if not batch:
+                return
+            for record in batch:
+                yield record
+    finally:
+        records.close()
+
+
+async def load_snapshot_records(
+    records: AsyncIterable[dict], batch_size: int = SNAPSHOT_BATCH_SIZE, replace: bool = False
+) -> int:
+    """
+    Bulk-load Pokemon records into the database.
+
+    Records are upserted on id in batches inside a single transaction, so an
+    import either lands completely or not at all. With ``replace`` the
+    table is emptied first in the same transaction, so Pokemon missing from
+    the records are removed and readers see either the old or the new
+    Pokedex, never a mix.
+
+    Returns:
+        Number of Pokemon loaded
+    """
+    update_fields = [field for field in SNAPSHOT_FIELDS if field != "id"]
+    loaded = 0
+
+    async with in_transaction("default") as connection:
+        if replace:
+            await Pokemon.all().using_db(connection).delete()
+        batch = []
+        async for record in records:
+            batch.append(Pokemon(**{field: record.get(field) for field in SNAPSHOT_FIELDS}))
+            if len(batch) >= batch_size:
+                await Pokemon.bulk_create(
+                    batch,
+                    on_conflict=["id"],
+                    update_fields=update_fields,
+                    using_db=connection,
+                )
+                loaded += len(batch)
+                batch = []
+
+        if batch:
+            await Pokemon.bulk_create(
+                batch,
+                on_conflict=["id"],
+                update_fields=update_fields,
+                using_db=connection,
+            )
+            loaded += len(batch)
+
+    return loaded
@@ -1,14 +1,103 @@
-from typing import List, Optional
+import os
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 
+from app.core.config import settings
+from app.core.database import read_connection
+from app.core.packed_pokedex import PackedPokedex
 from app.models.pokemon import Pokemon
-from app.schemas.pokemon import PokemonDetails, PokemonListItem, PokemonListResponse
+from app.schemas.pokemon import (
+    OfficialArtwork,
+    OtherSprites,
+    PokemonAbility,
+    PokemonAbilitySlot,
+    PokemonDetails,
+    PokemonListItem,
+    PokemonListResponse,
+    PokemonSprites,
+    PokemonStat,
+    PokemonStatValue,
+    PokemonType,
+    PokemonTypeSlot,
+)
 
 
 class PokemonService:
     """Service for managing Pokemon data from database."""
 
+    # Rows come from our own table or packed file, whose columns already
+    # have the schema's types, so responses are built with model_construct
+    # instead of being validated field by field
+
+    @staticmethod
+    def to_details(pokemon: Pokemon) -> PokemonDetails:
+        """Transform a database row to match the details schema."""
+        return PokemonDetails.model_construct(
+            id=pokemon.id,
+            name=pokemon.name,
+            description=pokemon.description,
+            sprite=pokemon.sprite_official_artwork or pokemon.sprite_front_default,
+            sprites=PokemonSprites.model_construct(
+                front_default=pokemon.sprite_front_default,
+                other=OtherSprites.model_construct(
+                    official_artwork=OfficialArtwork.model_construct(
+                        front_default=pokemon.sprite_official_artwork
+                    )
+                ),
+            ),
+            types=[
+                PokemonTypeSlot.model_construct(type=PokemonType.model_construct(name=type_name))
+                for type_name in pokemon.types
+            ],
+            height=pokemon.height,
+            weight=pokemon.weight,
+            abilities=[
+                PokemonAbilitySlot.model_construct(
+                    ability=PokemonAbility.model_construct(name=ability_name)
+                )
+                for ability_name in pokemon.abilities
+            ],
+            stats=[
+                PokemonStatValue.model_construct(
+                    base_stat=stat["base_stat"], stat=PokemonStat.model_construct(name=stat["name"])
+                )
+                for stat in pokemon.stats
+            ],
+        )
+
+    @staticmethod
+    def to_list_item(pokemon: Pokemon) -> PokemonListItem:
+        """Transform a database row to a list entry."""
+        return PokemonListItem.model_construct(
+            id=pokemon.id,
+            name=pokemon.name,
+            url=f"/pokemon/{pokemon.id}",
+            sprite=pokemon.sprite_front_default,
+            types=pokemon.types,
+        )
+
+    @staticmethod
+    def _page(
+        total_count: int, offset: int, limit: int, results: List[PokemonListItem]
+    ) -> PokemonListResponse:
+        next_url = None
+        previous_url = None
+
+        if offset + limit < total_count:
+            next_url = f"offset={offset + limit}&limit={limit}"
+
+        if offset > 0:
+            prev_offset = max(0, offset - limit)
+            previous_url = f"offset={prev_offset}&limit={limit}"
+
+        return PokemonListResponse.model_construct(
+            count=total_count,
+            next=next_url,
+            previous=previous_url,
+            results=results,
+        )
+
     @staticmethod
     async def get_pokemon_details(name_or_id: str) -> PokemonDetails:
         """
@@ -20,12 +109,22 @@ class PokemonService:
         Returns:
             PokemonDetails with full Pokemon information
         """
+        if pokedex.loaded:
+            pokemon = pokedex.details(name_or_id)
+            if not pokemon:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Pokemon '{name_or_id}' not found",
+                )
+            return pokemon
+
         try:
+            db = read_connection()
             # Try to find by ID if it's numeric, otherwise by name
             if name_or_id.isdigit():
-                pokemon = await Pokemon.filter(id=int(name_or_id)).first()
+                pokemon = await Pokemon.filter(id=int(name_or_id)).using_db(db).first()
             else:
-                pokemon = await Pokemon.filter(name=name_or_id.lower()).first()
+                pokemon = await Pokemon.filter(name=name_or_id.lower()).using_db(db).first()
 
             if not pokemon:
                 raise HTTPException(
@@ -33,35 +132,7 @@ class PokemonService:
                     detail=f"Pokemon '{name_or_id}' not found",
                 )
 
-            # Transform database data to match the schema
-            pokemon_data = {
-                "id": pokemon.id,
-                "name": pokemon.name,
-                "description": pokemon.description,
-                "sprite": pokemon.sprite_official_artwork or pokemon.sprite_front_default,
-                "sprites": {
-                    "front_default": pokemon.sprite_front_default,
-                    "other": {
-                        "official_artwork": {
-                            "front_default": pokemon.sprite_official_artwork
-                        }
-                    },
-                },
-                "types": [
-                    {"type": {"name": type_name}} for type_name in pokemon.types
-                ],
-                "height": pokemon.height,
-                "weight": pokemon.weight,
-                "abilities": [
-                    {"ability": {"name": ability_name}} for ability_name in pokemon.abilities
-                ],
-                "stats": [
-                    {"base_stat": stat["base_stat"], "stat": {"name": stat["name"]}}
-                    for stat in pokemon.stats
-                ],
-            }
-
-            return PokemonDetails(**pokemon_data)
+            return PokemonService.to_details(pokemon)
         except HTTPException:
             raise
         except Exception as e:
@@ -88,49 +159,16 @@ class PokemonService:
             PokemonListResponse with filtered and paginated results
         """
         try:
-            # If no query provided, return all Pokemon (same as get_pokemon_list)
-            if not query:
-                total_count = await Pokemon.all().count()
-                pokemon_list = await Pokemon.all().offset(offset).limit(limit).order_by(sort_by)
-
-                results = [
-                    PokemonListItem(
-                        id=p.id,
-                        name=p.name,
-                        url=f"/pokemon/{p.id}",
-                        sprite=p.sprite_front_default,
-                        types=p.types,
-                    )
-                    for p in pokemon_list
-                ]
-
-                next_url = None
-                previous_url = None
-
-                if offset + limit < total_count:
-                    next_url = f"offset={offset + limit}&limit={limit}"
-
-                if offset > 0:
-                    prev_offset = max(0, offset - limit)
-                    previous_url = f"offset={prev_offset}&limit={limit}"
-
-                return PokemonListResponse(
-                    count=total_count,
-                    next=next_url,
-                    previous=previous_url,
-                    results=results,
-                )
-
             # If query is numeric, try direct ID lookup first
-            if query.isdigit():
+            if query and query.isdigit():
                 try:
                     pokemon = await PokemonService.get_pokemon_details(query)
-                    return PokemonListResponse(
+                    return PokemonListResponse.model_construct(
                         count=1,
                         next=None,
                         previous=None,
                         results=[
-                            PokemonListItem(
+                            PokemonListItem.model_construct(
                                 id=pokemon.id,
                                 name=pokemon.name,
                                 url=f"/pokemon/{pokemon.id}",
@@ -144,52 +182,133 @@ class PokemonService:
                     # If not found, continue with name search
                     pass
 
-            # Search database for Pokemon matching the query
-            query_lower = query.lower()
+            if pokedex.loaded:
+                total_count, results = pokedex.search(query, offset, limit, sort_by)
+                return PokemonService._page(total_count, offset, limit, results)
 
-            # Get total count of matching Pokemon
-            total_count = await Pokemon.filter(name__icontains=query_lower).count()
+            db = read_connection()
+            # If no query provided, return all Pokemon (same as get_pokemon_list)
+            if not query:
+                pokemon = Pokemon.all().using_db(db)
+            else:
+                # Search database for Pokemon matching the query
+                pokemon = Pokemon.filter(name__icontains=query.lower()).using_db(db)
 
+            total_count = await pokemon.count()
             # Get paginated results with sorting
-            matching_pokemon = (
-                await Pokemon.filter(name__icontains=query_lower)
-                .offset(offset)
-                .limit(limit)
-                .order_by(sort_by)
+            page = await pokemon.offset(offset).limit(limit).order_by(sort_by)
+
+            results = [PokemonService.to_list_item(p) for p in page]
+            return PokemonService._page(total_count, offset, limit, results)
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error: {str(e)}",
             )
 
-            # Build results
-            results = [
-                PokemonListItem(
-                    id=p.id,
-                    name=p.name,
-                    url=f"/pokemon/{p.id}",
-                    sprite=p.sprite_front_default,
-                    types=p.types,
-                )
-                for p in matching_pokemon
-            ]
 
-            # Build next/previous URLs
-            next_url = None
-            previous_url = None
+class Pokedex:
+    """
+    In-memory copy of the Pokemon table.
 
-            if offset + limit < total_count:
-                next_url = f"offset={offset + limit}&limit={limit}"
+    The Pokedex only changes when it is re-seeded, so it is loaded once at
+    startup and Pokemon reads are answered without a query. When
+    ``seed_pokemon.py`` has written the packed file (``POKEDEX_FILE``) it is
+    memory-mapped, which takes constant time and shares one copy of the
+    data between all worker processes; otherwise the table is read into
+    Python objects, which the production server does in the parent process
+    so workers share them copy-on-write. While it is not loaded (or the
+    table is empty) ``PokemonService`` reads from the database.
 
-            if offset > 0:
-                prev_offset = max(0, offset - limit)
-                previous_url = f"offset={prev_offset}&limit={limit}"
+    ``generation`` counts dataset refreshes (see ``pokedex_refresher``);
+    a worker whose generation is behind reloads.
+    """
 
-            return PokemonListResponse(
-                count=total_count,
-                next=next_url,
-                previous=previous_url,
-                results=results,
-            )
+    def __init__(self):
+        self.generation = 0
+        self._set(None, {}, {}, [])
 
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Database error: {str(e)}",
+    def _set(
+        self,
+        packed: Optional[PackedPokedex],
+        by_id: Dict[int, PokemonDetails],
+        id_by_name: Dict[str, int],
+        items_by_id: List[PokemonListItem],
+    ) -> None:
+        # Replaced together without awaiting in between, so a request sees
+        # either the old or the new Pokedex
+        self._packed = packed
+        self._by_id = by_id
+        self._id_by_name = id_by_name
+        self._items_by_id = items_by_id
+        self._items_by_name = sorted(items_by_id, key=lambda item: item.name)
+
+    @property
+    def loaded(self) -> bool:
+        return len(self) > 0
+
+    def __len__(self) -> int:
+        if self._packed is not None:
+            return len(self._packed)
+        return len(self._by_id)
+
+    async def load(self, primary: bool = False) -> int:
+        """
+        Map the packed file, or read every Pokemon from the database; returns how many.
+
+        The current copy keeps serving until the new one is complete. The
+        database is read from a replica unless ``primary`` is set, which a
+        reload right after a refresh must do.
+        """
+        previous = self._packed
+        if settings.POKEDEX_FILE and os.path.exists(settings.POKEDEX_FILE):
+            self._set(PackedPokedex(settings.POKEDEX_FILE), {}, {}, [])
+        else:
+            db = None if primary else read_connection()
+            rows = await Pokemon.all().using_db(db).order_by("id")
+            self._set(
+                None,
+                {row.id: PokemonService.to_details(row) for row in rows},
+                {row.name: row.id for row in rows},
+                [PokemonService.to_list_item(row) for row in rows],
             )
+        if previous is not None:
+            previous.close()
+        return len(self)
+
+    def clear(self) -> None:
+        if self._packed is not None:
+            self._packed.close()
+        self.__init__()
+
+    def details(self, name_or_id: str) -> Optional[PokemonDetails]:
+        """A Pokemon by id or name, or None."""
+        if self._packed is not None:
+            if name_or_id.isdigit():
+                index = self._packed.find_id(int(name_or_id))
+            else:
+                index = self._packed.find_name(name_or_id)
+            return None if index is None else PokemonService.to_details(self._packed.record(index))
+
+        if name_or_id.isdigit():
+            return self._by_id.get(int(name_or_id))
+        pokemon_id = self._id_by_name.get(name_or_id.lower())
+        return self._by_id.get(pokemon_id) if pokemon_id is not None else None
+
+    def search(
+        self, query: Optional[str], offset: int, limit: int, sort_by: str
+    ) -> Tuple[int, List[PokemonListItem]]:
+        """Total and requested page of Pokemon whose name contains the query."""
+        if self._packed is not None:
+            total, indices = self._packed.search(query, offset, limit, sort_by)
+            return total, [PokemonService.to_list_item(self._packed.record(i)) for i in indices]
+
+        items = self._items_by_name if sort_by == "name" else self._items_by_id
+        if query:
+            query_lower = query.lower()
+            items = [item for item in items if query_lower in item.name.lower()]
+        return len(items), items[offset : offset + limit]
+
+
+pokedex = Pokedex()
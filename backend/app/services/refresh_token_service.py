@@ -0,0 +1,140 @@
+import hashlib
+import hmac
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, status
+from tortoise import timezone
+from tortoise.transactions import in_transaction
+
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+def hash_refresh_token(refresh_token: str) -> str:
+    """Keyed hash under which a refresh token is stored and looked up."""
+    return hmac.new(
+        settings.SECRET_KEY.encode("utf-8"),
+        refresh_token.encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+class RefreshTokenService:
+    """
+    Rotating refresh tokens.
+
+    Every refresh consumes the presented token and issues a new one in the
+    same family, sliding the idle expiry forward up to an absolute session
+    lifetime. Presenting an already used token means it leaked, so the whole
+    family is revoked.
+    """
+
+    @staticmethod
+    def _invalid_token_exception() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    @staticmethod
+    async def issue(
+        user: User,
+        family: Optional[str] = None,
+        session_started_at: Optional[datetime] = None,
+        using_db=None,
+    ) -> str:
+        """Issue a new refresh token for a user and return its raw value."""
+        now = timezone.now()
+        session_started_at = session_started_at or now
+        session_ends_at = session_started_at + timedelta(days=settings.REFRESH_SESSION_MAX_DAYS)
+        expires_at = min(
+            now + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES), session_ends_at
+        )
+
+        refresh_token = secrets.token_urlsafe(32)
+        await RefreshToken.create(
+            user=user,
+            token_hash=hash_refresh_token(refresh_token),
+            family=family or uuid.uuid4().hex,
+            token_version=user.token_version,
+            session_started_at=session_started_at,
+            expires_at=expires_at,
+            using_db=using_db,
+        )
+        return refresh_token
+
+    @staticmethod
+    async def revoke_family(family: str, using_db=None) -> int:
+        """Revoke every live token of a session."""
+        return await RefreshToken.filter(family=family, revoked_at__isnull=True).using_db(
+            using_db
+        ).update(revoked_at=timezone.now())
+
+    @staticmethod
+    async def rotate(refresh_token: str) -> tuple[User, str]:
+        """
+        Exchange a refresh token for a new one.
+
+        Returns:
+            The session's user and the new raw refresh token
+
+        Raises:
+            HTTPException: 401 if the token is unknown, expired, revoked,
+                reused or belongs to a user who can no longer log in
+        """
+        now = timezone.now()
+        new_token = None
+
+        # Revocations must commit, so failures are raised after the block
+        async with in_transaction("default") as connection:
+            record = (
+                await RefreshToken.filter(token_hash=hash_refresh_token(refresh_token))
+                .using_db(connection)
+                .select_related("user")
+                .first()
+            )
+            if record is None or record.revoked_at is not None:
+                raise RefreshTokenService._invalid_token_exception()
+
+            # Mark the token used; a concurrent or repeated use finds it taken
+            claimed = await RefreshToken.filter(id=record.id, used_at__isnull=True).using_db(
+                connection
+            ).update(used_at=now)
+
+            user = record.user
+            if (
+                not claimed
+                or record.expires_at <= now
+                or not user.is_active
+                or user.token_version != record.token_version
+            ):
+                await RefreshTokenService.revoke_family(record.family, using_db=connection)
+            else:
+                new_token = await RefreshTokenService.issue(
+                    user,
+                    family=record.family,
+                    session_started_at=record.session_started_at,
+                    using_db=connection,
+                )
+
+        if new_token is None:
+            raise RefreshTokenService._invalid_token_exception()
+
+        return user, new_token
+
+    @staticmethod
+    async def revoke(refresh_token: str) -> None:
+        """Log out the session a refresh token belongs to."""
+        record = await RefreshToken.filter(token_hash=hash_refresh_token(refresh_token)).first()
+        if record is not None:
+            await RefreshTokenService.revoke_family(record.family)
+
+    @staticmethod
+    async def purge_expired() -> int:
+        """Delete refresh tokens that can no longer be used."""
+        return await RefreshToken.filter(expires_at__lt=timezone.now()).delete()
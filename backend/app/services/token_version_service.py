@@ -0,0 +1,161 @@
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, Optional
+
+from tortoise import timezone
+
+from app.core.config import settings
+from app.core.database import read_connection
+from app.models.user import DeletedUser, User
+
+
+class TokenVersionRegistry:
+    """
+    In-memory map of user id to current token version.
+
+    Access tokens carry the version they were issued with. Deactivating a
+    user, changing their role or password bumps the version stored on the
+    user row, which revokes every outstanding token at once. Inactive and
+    deleted users map to ``REVOKED``.
+
+    Entries are loaded on first use with a point query and kept in sync
+    with a periodic incremental query on ``updated_at`` (cheap, and catches
+    changes made by other workers). Deleted rows cannot show up there, so
+    deletions are also written to ``deleted_users``, which the same sync
+    reads. Every entry is dropped every ``reset_seconds`` to bound memory.
+    """
+
+    REVOKED = -1
+
+    def __init__(self, sync_seconds: float, reset_seconds: float):
+        self.sync_seconds = sync_seconds
+        self.reset_seconds = reset_seconds
+        self._versions: Dict[int, int] = {}
+        self._synced_at = 0.0
+        self._reset_at = 0.0
+        self._high_water = None
+        self.point_lookups = 0
+        self.syncs = 0
+
+    async def get(self, user_id: int) -> int:
+        """Current token version of a user, or ``REVOKED``."""
+        await self._maybe_sync()
+
+        version = self._versions.get(user_id)
+        if version is None:
+            self.point_lookups += 1
+            row = (
+                await User.filter(id=user_id)
+                .using_db(read_connection())
+                .values_list("token_version", "is_active")
+            )
+            version = row[0][0] if row and row[0][1] else self.REVOKED
+            self._versions[user_id] = version
+        return version
+
+    def record(self, user: User) -> None:
+        """Store the version of a user that was just read or written."""
+        self._versions[user.id] = user.token_version if user.is_active else self.REVOKED
+
+    def revoke(self, user_id: int) -> None:
+        """Mark a user (for example a deleted one) as having no valid tokens."""
+        self._versions[user_id] = self.REVOKED
+
+    async def record_deletions(self, user_ids: Iterable[int], using_db=None) -> None:
+        """
+        Revoke deleted users here and publish them to the other workers.
+
+        Call within the transaction deleting the users. Registries forget
+        everything every ``reset_seconds``, so older entries of
+        ``deleted_users`` are never read again and are pruned here.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        await DeletedUser.bulk_create(
+            [DeletedUser(user_id=user_id) for user_id in user_ids],
+            ignore_conflicts=True,
+            using_db=using_db,
+        )
+        horizon = timezone.now() - timedelta(seconds=self.reset_seconds + self.sync_seconds)
+        await DeletedUser.filter(deleted_at__lt=horizon).using_db(using_db).delete()
+        for user_id in user_ids:
+            self.revoke(user_id)
+
+    def forget(self, user_id: int) -> None:
+        """Drop the version of a user changed in bulk; it is reloaded on demand."""
+        self._versions.pop(user_id, None)
+
+    def reset(self) -> None:
+        """Forget every version; they are reloaded on demand."""
+        self._versions.clear()
+        self._synced_at = 0.0
+        self._reset_at = 0.0
+        self._high_water = None
+
+    async def _maybe_sync(self) -> None:
+        now = time.monotonic()
+        if self._high_water is None or now - self._reset_at >= self.reset_seconds:
+            self._versions.clear()
+            self._reset_at = now
+            self._synced_at = now
+            self._high_water = timezone.now()
+            return
+
+        if now - self._synced_at < self.sync_seconds:
+            return
+
+        self._synced_at = now
+        self.syncs += 1
+        # Re-read a window of one sync interval to tolerate clock skew
+        # between app nodes writing updated_at
+        since = self._high_water - timedelta(seconds=self.sync_seconds)
+        rows = (
+            await User.filter(updated_at__gte=since)
+            .using_db(read_connection())
+            .values_list("id", "token_version", "is_active", "updated_at")
+        )
+        deletions = (
+            await DeletedUser.filter(deleted_at__gte=since)
+            .using_db(read_connection())
+            .values_list("user_id", "deleted_at")
+        )
+        for user_id, version, is_active, updated_at in rows:
+            self._versions[user_id] = version if is_active else self.REVOKED
+            if updated_at > self._high_water:
+                self._high_water = updated_at
+        for user_id, deleted_at in deletions:
+            self._versions[user_id] = self.REVOKED
+            if deleted_at > self._high_water:
+                self._high_water = deleted_at
+
+    def stats(self) -> dict:
+        """Size and refresh counters."""
+        return {
+            "size": len(self._versions),
+            "point_lookups": self.point_lookups,
+            "syncs": self.syncs,
+        }
+
+
+token_versions = TokenVersionRegistry(
+    sync_seconds=settings.TOKEN_VERSION_SYNC_SECONDS,
+    reset_seconds=settings.TOKEN_VERSION_RESET_SECONDS,
+)
+
+
+def token_claims(user: User) -> Dict[str, object]:
+    """Authorization claims carried by an access token for a user."""
+    return {
+        "sub": user.username,
+        "uid": user.id,
+        "role": "admin" if user.is_admin else "user",
+        "ver": user.token_version,
+    }
+
+
+def claims_version(payload: dict) -> Optional[int]:
+    """Token version from decoded claims, None for legacy ``sub``-only tokens."""
+    if "uid" not in payload or "ver" not in payload:
+        return None
+    return payload["ver"]
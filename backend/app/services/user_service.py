@@ -1,15 +1,94 @@
-from typing import List, Optional
+import base64
+import binascii
+import sys
+from typing import Any, AsyncIterator, List, NamedTuple, Optional, Tuple
 
 from fastapi import HTTPException, status
+from pydantic import ValidationError
+from tortoise import connections, timezone
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F, Q
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
 
-from app.core.security import get_password_hash
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import read_connection, read_pool
+from app.core.hashing import bulk_hasher
+from app.core.security import get_password_hash_async
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import (
+    BulkUserImportResponse,
+    BulkUserRowResult,
+    BulkUserUpdate,
+    BulkUserUpdateResponse,
+    UserCreate,
+    UserUpdate,
+)
+from app.services.auth_service import AuthService
+from app.services.token_version_service import token_versions
+
+# Totals of the admin user directory by filter; dropped on every user write
+user_count_cache = TTLCache(
+    ttl_seconds=settings.USER_COUNT_CACHE_TTL_SECONDS,
+    max_size=256,
+)
+
+# Surrogates cannot be encoded, so no bound may end in one
+SURROGATES = range(0xD800, 0xE000)
+
+
+class UserPage(NamedTuple):
+    """One page of the admin user directory."""
+
+    users: List[User]
+    total: int
+    next_cursor: Optional[str]
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    Least string above every string starting with ``prefix``, in code point order.
+
+    That is the prefix with its last character incremented (after dropping
+    trailing characters that cannot be). None if every character is the
+    highest code point, when the prefix range has no upper end.
+    """
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    code_point = ord(prefix[-1]) + 1
+    if code_point in SURROGATES:
+        code_point = SURROGATES.stop
+    return prefix[:-1] + chr(code_point)
+
+
+def encode_user_cursor(user_id: int) -> str:
+    """Opaque cursor pointing just after a user id."""
+    return base64.urlsafe_b64encode(str(user_id).encode()).decode().rstrip("=")
+
+
+def decode_user_cursor(cursor: str) -> int:
+    """Decode a cursor from encode_user_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
 
 
 class UserService:
     """User service for CRUD operations."""
 
+    @staticmethod
+    def _users_changed() -> None:
+        """Drop cached totals and read from the primary until replicas catch up."""
+        user_count_cache.clear()
+        read_pool.mark_write()
+
     @staticmethod
     async def create_user(user_data: UserCreate) -> User:
         """Create a new user."""
@@ -33,16 +112,23 @@ class UserService:
         user = await User.create(
             username=user_data.username,
             email=user_data.email,
-            hashed_password=get_password_hash(user_data.password),
+            hashed_password=await get_password_hash_async(user_data.password),
             is_admin=user_data.is_admin,
         )
+        UserService._users_changed()
 
         return user
 
     @staticmethod
-    async def get_user_by_id(user_id: int) -> Optional[User]:
-        """Get user by ID."""
-        user = await User.filter(id=user_id).first()
+    async def get_user_by_id(user_id: int, primary: bool = False) -> Optional[User]:
+        """
+        Get user by ID.
+
+        Reads from a replica unless ``primary`` is set, which callers that
+        are about to modify the user must do.
+        """
+        db = None if primary else read_connection()
+        user = await User.filter(id=user_id).using_db(db).first()
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -53,7 +139,7 @@ class UserService:
     @staticmethod
     async def get_user_by_username(username: str) -> Optional[User]:
         """Get user by username."""
-        user = await User.filter(username=username).first()
+        user = await User.filter(username=username).using_db(read_connection()).first()
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -64,16 +150,102 @@ class UserService:
     @staticmethod
     async def get_all_users(skip: int = 0, limit: int = 100) -> List[User]:
         """Get all users with pagination."""
-        users = await User.all().offset(skip).limit(limit)
+        users = (
+            await User.all().using_db(read_connection()).order_by("id").offset(skip).limit(limit)
+        )
         return users
 
+    @staticmethod
+    def _filter_users(
+        is_active: Optional[bool] = None,
+        is_admin: Optional[bool] = None,
+        search: Optional[str] = None,
+    ) -> QuerySet[User]:
+        """Users matching the admin directory filters."""
+        filters = {}
+        if is_active is not None:
+            filters["is_active"] = is_active
+        if is_admin is not None:
+            filters["is_admin"] = is_admin
+
+        query = User.filter(**filters)
+        if not search:
+            return query
+
+        if connections.get("default").capabilities.dialect == "postgres":
+            # Ranges follow the collation, which need not be code point
+            # order; LIKE 'x%' is case-sensitive here and uses the
+            # text_pattern_ops indexes (see create_search_indexes)
+            return query.filter(Q(username__startswith=search) | Q(email__startswith=search))
+
+        # Range conditions use the unique indexes; LIKE 'x%' would not, as
+        # SQLite's LIKE is case-insensitive. SQLite compares text as UTF-8
+        # bytes, which sort in code point order
+        upper = prefix_upper_bound(search)
+        username = {"username__gte": search}
+        email = {"email__gte": search}
+        if upper is not None:
+            username["username__lt"] = upper
+            email["email__lt"] = upper
+        return query.filter(Q(**username) | Q(**email))
+
+    @staticmethod
+    async def search_users(
+        is_active: Optional[bool] = None,
+        is_admin: Optional[bool] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> UserPage:
+        """
+        Filter and page through users in id order.
+
+        Args:
+            is_active: Only users with this active status
+            is_admin: Only users with this admin status
+            search: Case-sensitive prefix of the username or email
+            cursor: Cursor from a previous page; takes precedence over skip
+            skip: Offset for callers that do not use cursors
+            limit: Maximum number of users to return
+
+        Returns:
+            UserPage with the users, the total matching the filters and the
+            cursor of the next page (None on the last page)
+        """
+        query = UserService._filter_users(is_active, is_admin, search).using_db(
+            read_connection()
+        )
+
+        count_key = (is_active, is_admin, search)
+        total = user_count_cache.get(count_key)
+        if total is None:
+            total = await query.count()
+            user_count_cache.set(count_key, total)
+
+        page_query = query.order_by("id")
+        if cursor:
+            page_query = page_query.filter(id__gt=decode_user_cursor(cursor))
+        elif skip:
+            page_query = page_query.offset(skip)
+
+        # One extra row tells whether another page exists
+        users = await page_query.limit(limit + 1)
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_user_cursor(users[-1].id)
+
+        return UserPage(users=users, total=total, next_cursor=next_cursor)
+
     @staticmethod
     async def update_user(user_id: int, user_data: UserUpdate) -> User:
         """Update a user."""
-        user = await UserService.get_user_by_id(user_id)
+        user = await UserService.get_user_by_id(user_id, primary=True)
 
         # Update fields if provided
         update_data = user_data.model_dump(exclude_unset=True)
+        revoke_tokens = False
 
         if "username" in update_data:
             # Check if new username is already taken
@@ -83,6 +255,7 @@ class UserService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Username already taken",
                 )
+            revoke_tokens = revoke_tokens or user.username != update_data["username"]
             user.username = update_data["username"]
 
         if "email" in update_data:
@@ -96,19 +269,262 @@ class UserService:
             user.email = update_data["email"]
 
         if "password" in update_data:
-            user.hashed_password = get_password_hash(update_data["password"])
+            user.hashed_password = await get_password_hash_async(update_data["password"])
+            revoke_tokens = True
 
         if "is_active" in update_data:
+            revoke_tokens = revoke_tokens or user.is_active != update_data["is_active"]
             user.is_active = update_data["is_active"]
 
         if "is_admin" in update_data:
+            revoke_tokens = revoke_tokens or user.is_admin != update_data["is_admin"]
             user.is_admin = update_data["is_admin"]
 
+        # Outstanding tokens carry the old identity or role; revoke them all
+        if revoke_tokens:
+            user.token_version += 1
+
         await user.save()
+        UserService._users_changed()
+        token_versions.record(user)
+        AuthService.invalidate_principal(user.id)
         return user
 
     @staticmethod
     async def delete_user(user_id: int) -> None:
         """Delete a user."""
-        user = await UserService.get_user_by_id(user_id)
-        await user.delete()
+        user = await UserService.get_user_by_id(user_id, primary=True)
+        async with in_transaction("default") as connection:
+            await user.delete(using_db=connection)
+            await token_versions.record_deletions([user_id], using_db=connection)
+        UserService._users_changed()
+        AuthService.invalidate_principal(user_id)
+
+    @staticmethod
+    async def bulk_update_users(
+        changes: BulkUserUpdate, exclude_user_id: Optional[int] = None
+    ) -> BulkUserUpdateResponse:
+        """
+        Change or delete many users with one set-based statement.
+
+        The users are selected by id, by the admin directory filters or all
+        together, and
+        the UPDATE or DELETE runs on that filter directly. Updates only
+        touch rows whose values actually change, and bump their token
+        version in the same statement so outstanding tokens carrying the old
+        status or role are revoked. The affected ids are read beforehand,
+        in the same transaction, to invalidate the caches.
+
+        Args:
+            changes: Target users and the change to apply
+            exclude_user_id: User left untouched (the acting admin, so a broad
+                filter cannot lock them out)
+
+        Returns:
+            Number of users matched, updated and deleted
+        """
+        if changes.ids is not None:
+            query = User.filter(id__in=changes.ids)
+        elif changes.all:
+            query = User.all()
+        else:
+            query = UserService._filter_users(**changes.filter.model_dump())
+        if exclude_user_id is not None:
+            query = query.exclude(id=exclude_user_id)
+
+        updated = deleted = 0
+        async with in_transaction("default") as connection:
+            matched = await query.using_db(connection).count()
+
+            if changes.delete:
+                # Ids only feed the cache invalidation; the rows go with one
+                # DELETE on the filter itself
+                affected_ids = await query.using_db(connection).values_list("id", flat=True)
+                deleted = await query.using_db(connection).delete()
+                await token_versions.record_deletions(affected_ids, using_db=connection)
+            else:
+                values = changes.model_dump(include={"is_active", "is_admin"}, exclude_none=True)
+                differs = Q(
+                    *[~Q(**{field: value}) for field, value in values.items()],
+                    join_type=Q.OR,
+                )
+                to_change = query.filter(differs).using_db(connection)
+                affected_ids = await to_change.values_list("id", flat=True)
+                if affected_ids:
+                    updated = await to_change.update(
+                        token_version=F("token_version") + 1,
+                        # Bulk updates skip auto_now; other workers sync on it
+                        updated_at=timezone.now(),
+                        **values,
+                    )
+
+        if updated or deleted:
+            UserService._users_changed()
+        for user_id in affected_ids:
+            if not changes.delete:
+                token_versions.forget(user_id)
+            AuthService.invalidate_principal(user_id)
+
+        return BulkUserUpdateResponse(matched=matched, updated=updated, deleted=deleted)
+
+    @staticmethod
+    async def bulk_create_users(
+        rows: AsyncIterator[Any], batch_size: Optional[int] = None
+    ) -> BulkUserImportResponse:
+        """
+        Create many users from a stream of rows.
+
+        Rows are validated one by one and imported in batches: uniqueness is
+        checked with one query per batch, passwords are hashed in the bulk
+        process pool and users are inserted with a single bulk insert per
+        batch. Invalid rows are reported and skipped without failing the
+        rest of the import.
+        """
+        batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+        results: List[BulkUserRowResult] = []
+        seen_usernames: set = set()
+        seen_emails: set = set()
+        batch: List[Tuple[int, UserCreate]] = []
+        row_number = 0
+
+        async for raw in rows:
+            row_number += 1
+            if not isinstance(raw, dict):
+                results.append(
+                    BulkUserRowResult(row=row_number, status="error", errors=["Malformed row"])
+                )
+                continue
+
+            try:
+                user_data = UserCreate.model_validate(raw)
+            except ValidationError as e:
+                username = raw.get("username")
+                results.append(
+                    BulkUserRowResult(
+                        row=row_number,
+                        username=username if isinstance(username, str) else None,
+                        status="error",
+                        errors=[
+                            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                            for error in e.errors()
+                        ],
+                    )
+                )
+                continue
+
+            errors = []
+            if user_data.username in seen_usernames:
+                errors.append("Duplicate username in import")
+            if user_data.email in seen_emails:
+                errors.append("Duplicate email in import")
+            if errors:
+                results.append(
+                    BulkUserRowResult(
+                        row=row_number, username=user_data.username, status="error", errors=errors
+                    )
+                )
+                continue
+
+            seen_usernames.add(user_data.username)
+            seen_emails.add(user_data.email)
+            batch.append((row_number, user_data))
+            if len(batch) >= batch_size:
+                results.extend(await UserService._import_batch(batch))
+                batch = []
+
+        if batch:
+            results.extend(await UserService._import_batch(batch))
+
+        UserService._users_changed()
+        results.sort(key=lambda result: result.row)
+        created = sum(1 for result in results if result.status == "created")
+        return BulkUserImportResponse(
+            total=len(results),
+            created=created,
+            failed=len(results) - created,
+            results=results,
+        )
+
+    @staticmethod
+    async def _import_batch(batch: List[Tuple[int, UserCreate]]) -> List[BulkUserRowResult]:
+        """Check, hash and insert one batch of validated rows."""
+        results: List[BulkUserRowResult] = []
+
+        taken_usernames = set(
+            await User.filter(username__in=[u.username for _, u in batch]).values_list(
+                "username", flat=True
+            )
+        )
+        taken_emails = set(
+            await User.filter(email__in=[u.email for _, u in batch]).values_list(
+                "email", flat=True
+            )
+        )
+
+        pending: List[Tuple[int, UserCreate]] = []
+        for row, user_data in batch:
+            errors = []
+            if user_data.username in taken_usernames:
+                errors.append("Username already registered")
+            if user_data.email in taken_emails:
+                errors.append("Email already registered")
+            if errors:
+                results.append(
+                    BulkUserRowResult(
+                        row=row, username=user_data.username, status="error", errors=errors
+                    )
+                )
+            else:
+                pending.append((row, user_data))
+
+        if not pending:
+            return results
+
+        hashes = await bulk_hasher.hash_many([u.password for _, u in pending])
+        users = [
+            User(
+                username=user_data.username,
+                email=user_data.email,
+                hashed_password=hashed_password,
+                is_admin=user_data.is_admin,
+            )
+            for (_, user_data), hashed_password in zip(pending, hashes)
+        ]
+
+        inserted = {row for row, _ in pending}
+        try:
+            async with in_transaction("default") as connection:
+                await User.bulk_create(users, using_db=connection)
+        except IntegrityError:
+            # Someone else registered one of the names meanwhile; insert row
+            # by row so only the conflicting rows fail
+            for (row, user_data), user in zip(pending, users):
+                try:
+                    await user.save()
+                except IntegrityError:
+                    inserted.discard(row)
+                    results.append(
+                        BulkUserRowResult(
+                            row=row,
+                            username=user_data.username,
+                            status="error",
+                            errors=["Username or email already registered"],
+                        )
+                    )
+
+        ids = dict(
+            await User.filter(username__in=[u.username for _, u in pending]).values_list(
+                "username", "id"
+            )
+        )
+        results.extend(
+            BulkUserRowResult(
+                row=row,
+                username=user_data.username,
+                status="created",
+                id=ids.get(user_data.username),
+            )
+            for row, user_data in pending
+            if row in inserted
+        )
+        return results
@@ -0,0 +1,344 @@
+"""
+Load test the API with a realistic request mix.
+
+Seeds a throwaway SQLite database with synthetic Pokemon and users, then
+runs concurrent virtual users against the app for a fixed time. Each one
+logs in and then picks requests from ``MIX``: logins, ``/auth/me``, list
+pages, name searches and details. Two modes:
+
+  asgi    the app runs in this process and is called through ASGI, with
+          no network in between; measures the app itself
+  socket  the production server (``main.py`` with DEBUG=false and
+          ``--workers`` workers) runs as a subprocess and is called over
+          TCP; measures the whole stack. The client shares the host, so
+          leave it a CPU of its own
+
+Requests per second and p50/p95/p99 latency are reported per route.
+``--save-baseline`` stores the results as JSON; ``--baseline`` compares
+against a stored file and exits with status 1 when a route got slower or
+failed more than ``--tolerance`` allows. Record baselines on the machine
+that runs the comparison: the numbers only mean something on one host.
+
+Login throttling is switched off, since every request comes from one IP.
+Logins pay the configured Argon2 cost.
+
+Usage (from the backend directory):
+    python -m benchmarks.load
+    python -m benchmarks.load --mode socket --workers 2 --concurrency 64
+    python -m benchmarks.load --save-baseline load-baseline.json
+    python -m benchmarks.load --baseline load-baseline.json --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from benchmarks.synthetic import PASSWORD, SYLLABLES, create_dataset, pokemon_name
+
+# Route and relative weight of each request in the mix
+MIX = [
+    ("POST /auth/login", 2),
+    ("GET /auth/me", 18),
+    ("GET /pokemon/", 30),
+    ("GET /pokemon/?query", 20),
+    ("GET /pokemon/{name_or_id}", 30),
+]
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class VirtualUser:
+    """One client: logs in, then sends requests from the mix back to back."""
+
+    def __init__(self, client: httpx.AsyncClient, number: int, args: argparse.Namespace):
+        self.client = client
+        self.args = args
+        self.random = random.Random(args.seed + number)
+        # Every tenth synthetic user is inactive
+        user_id = number % args.users + 1
+        self.username = f"user{user_id - 1 if user_id % 10 == 0 else user_id}"
+        self.token: Optional[str] = None
+
+    async def login(self) -> httpx.Response:
+        response = await self.client.post(
+            "/auth/login", data={"username": self.username, "password": PASSWORD}
+        )
+        if response.status_code == 200:
+            self.token = response.json()["access_token"]
+        return response
+
+    async def request(self, route: str) -> httpx.Response:
+        if route == "POST /auth/login":
+            return await self.login()
+        if route == "GET /auth/me":
+            return await self.client.get(
+                "/auth/me", headers={"Authorization": f"Bearer {self.token}"}
+            )
+        if route == "GET /pokemon/":
+            limit = self.random.choice([20, 20, 20, 50, 100])
+            offset = self.random.randrange(0, max(1, self.args.pokemon - limit))
+            sort_by = self.random.choice(["id", "name"])
+            return await self.client.get(
+                "/pokemon/", params={"offset": offset, "limit": limit, "sort_by": sort_by}
+            )
+        if route == "GET /pokemon/?query":
+            return await self.client.get(
+                "/pokemon/", params={"query": self.random.choice(SYLLABLES), "limit": 20}
+            )
+        pokemon_id = self.random.randint(1, self.args.pokemon)
+        name_or_id = self.random.choice([str(pokemon_id), pokemon_name(pokemon_id)])
+        return await self.client.get(f"/pokemon/{name_or_id}")
+
+    async def sign_in(self) -> None:
+        # Logins beyond LOGIN_MAX_CONCURRENT_VERIFICATIONS are shed with a
+        # 429; everyone logs in at once here, so retry until it is our turn
+        while (await self.login()).status_code != 200:
+            await asyncio.sleep(0.05)
+
+    async def run(self, deadline: float, measure_from: float, samples, errors) -> None:
+        routes = [route for route, _ in MIX]
+        weights = [weight for _, weight in MIX]
+        while time.perf_counter() < deadline:
+            route = self.random.choices(routes, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await self.request(route)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            if started < measure_from:
+                continue
+            samples[route].append(time.perf_counter() - started)
+            if failed:
+                errors[route] += 1
+
+
+async def drive(client: httpx.AsyncClient, args: argparse.Namespace) -> Dict[str, dict]:
+    """Run the virtual users and summarize latencies per route."""
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    users = [VirtualUser(client, number, args) for number in range(args.concurrency)]
+    await asyncio.gather(*(user.sign_in() for user in users))
+
+    measure_from = time.perf_counter() + args.warmup
+    deadline = measure_from + args.seconds
+    await asyncio.gather(*(user.run(deadline, measure_from, samples, errors) for user in users))
+
+    results = {}
+    for route, _ in MIX:
+        latencies = sorted(samples[route])
+        if not latencies:
+            continue
+        results[route] = {
+            "requests": len(latencies),
+            "errors": errors[route],
+            "rps": len(latencies) / args.seconds,
+            **{
+                metric: percentile(latencies, fraction) * 1000
+                for metric, fraction in zip(LATENCY_METRICS, (0.5, 0.95, 0.99))
+            },
+        }
+    return results
+
+
+async def run_asgi(
+    database_url: str, directory: str, args: argparse.Namespace
+) -> Dict[str, dict]:
+    from main import app, lifespan
+    from app.services.auth_service import login_throttle
+
+    settings.DATABASE_URL = database_url
+    settings.POKEDEX_FILE = os.path.join(directory, "pokedex.bin")
+    settings.POKEDEX_REFRESH_STATUS_FILE = os.path.join(directory, "pokedex-refresh.json")
+    login_throttle.username_limiter.capacity = 0
+    login_throttle.ip_limiter.capacity = 0
+
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+            return await drive(client, args)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_socket(
+    database_url: str, directory: str, args: argparse.Namespace
+) -> Dict[str, dict]:
+    port = free_port()
+    env = {
+        **os.environ,
+        "DEBUG": "False",
+        "DATABASE_URL": database_url,
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(port),
+        "SERVER_WORKERS": str(args.workers),
+        "POKEDEX_FILE": os.path.join(directory, "pokedex.bin"),
+        "POKEDEX_REFRESH_STATUS_FILE": os.path.join(directory, "pokedex-refresh.json"),
+        "LOGIN_USERNAME_BURST": "0",
+        "LOGIN_IP_BURST": "0",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "main.py"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30
+        ) as client:
+            for _ in range(300):
+                if server.poll() is not None:
+                    raise RuntimeError(f"Server exited with code {server.returncode}")
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("Server did not start in time")
+            return await drive(client, args)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def report(results: Dict[str, dict]) -> None:
+    print(f"{'route':<28} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for route, result in results.items():
+        print(
+            f"{route:<28} {result['rps']:>9.1f} {result['p50_ms']:>8.2f} "
+            f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['errors']:>7}"
+        )
+    print(f"{'total':<28} {sum(result['rps'] for result in results.values()):>9.1f}")
+
+
+def regressions(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Routes that got slower, lost throughput or failed more than the baseline allows."""
+    problems = []
+    for route, expected in baseline.items():
+        actual = results.get(route)
+        if actual is None:
+            problems.append(f"{route}: no requests completed")
+            continue
+        for metric in LATENCY_METRICS:
+            limit = expected[metric] * (1 + tolerance)
+            if actual[metric] > limit:
+                problems.append(
+                    f"{route}: {metric} {actual[metric]:.2f} > {limit:.2f} "
+                    f"(baseline {expected[metric]:.2f})"
+                )
+        minimum = expected["rps"] * (1 - tolerance)
+        if actual["rps"] < minimum:
+            problems.append(
+                f"{route}: {actual['rps']:.1f} req/s < {minimum:.1f} "
+                f"(baseline {expected['rps']:.1f})"
+            )
+        error_rate = actual["errors"] / actual["requests"]
+        if error_rate > expected["errors"] / expected["requests"]:
+            problems.append(f"{route}: {actual['errors']} of {actual['requests']} requests failed")
+    return problems
+
+
+def configuration(args: argparse.Namespace) -> dict:
+    workers = args.workers if args.mode == "socket" else None
+    return {
+        "mode": args.mode,
+        "workers": workers,
+        "concurrency": args.concurrency,
+        "pokemon": args.pokemon,
+        "users": args.users,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, dict]:
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite://{os.path.join(directory, 'load.sqlite3')}"
+        print(f"Creating {args.pokemon} synthetic Pokemon and {args.users} users...")
+        await create_dataset(database_url, args.pokemon, args.users)
+
+        print(
+            f"{args.mode}: {args.concurrency} virtual users, "
+            f"{args.warmup:.0f}s warm-up, {args.seconds:.0f}s measured\n"
+        )
+        run = run_asgi if args.mode == "asgi" else run_socket
+        return await run(database_url, directory, args)
+
+
+def main():
+    """Entry point for the load test."""
+    parser = argparse.ArgumentParser(description="Load test the API")
+    parser.add_argument("--mode", choices=["asgi", "socket"], default="asgi")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Server workers in socket mode (default: 1)"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="Virtual users (default: 32)"
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=10.0, help="Measured duration (default: 10)"
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=2.0, help="Unmeasured warm-up (default: 2)"
+    )
+    parser.add_argument(
+        "--pokemon", type=int, default=2000, help="Synthetic Pokemon (default: 2000)"
+    )
+    parser.add_argument("--users", type=int, default=500, help="Synthetic users (default: 500)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed of the request mix")
+    parser.add_argument("--baseline", help="Fail when results regress past this stored result")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Store the results as a baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed regression against the baseline, as a fraction (default: 0.25)",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    report(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump({"config": configuration(args), "routes": results}, baseline_file, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline["config"] != configuration(args):
+            print(f"\nWarning: baseline was recorded with {baseline['config']}")
+        problems = regressions(results, baseline["routes"], args.tolerance)
+        if problems:
+            print(f"\nRegressions beyond {args.tolerance:.0%} of {args.baseline}:")
+            for problem in problems:
+                print(f"  {problem}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
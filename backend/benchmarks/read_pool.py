@@ -0,0 +1,129 @@
+"""
+Benchmark Pokemon reads against the SQLite reader pool size.
+
+Builds a throwaway database with synthetic Pokemon, then for every pool
+size runs concurrent PokemonService calls for a fixed time and reports
+throughput. Size 0 is the single shared connection used without a pool.
+
+Usage (from the backend directory):
+    python -m benchmarks.read_pool
+    python -m benchmarks.read_pool --pool-sizes 0 1 2 4 8 --concurrency 32
+    python -m benchmarks.read_pool --rows 20000 --seconds 10
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from tortoise import Tortoise
+
+from app.core.config import settings
+from app.core.database import close_db, init_db
+from app.models.pokemon import Pokemon
+from app.services.pokemon_service import PokemonService
+
+SEARCH_TERMS = ["a", "char", "saur", "on", "mega", "pi"]
+
+
+async def create_database(path: str, rows: int) -> None:
+    """Fill a new database with synthetic Pokemon."""
+    settings.DATABASE_URL = f"sqlite://{path}"
+    settings.SQLITE_READ_POOL_SIZE = 0
+    await init_db()
+    await Pokemon.bulk_create(
+        [
+            Pokemon(
+                id=i,
+                name=f"{SEARCH_TERMS[i % len(SEARCH_TERMS)]}mon-{i}",
+                height=i % 30,
+                weight=i % 1000,
+                description=f"Synthetic pokemon number {i}",
+                sprite_front_default=f"https://example.com/{i}.png",
+                types=["normal"],
+                abilities=["run-away"],
+                stats=[{"name": "hp", "base_stat": 50}],
+            )
+            for i in range(1, rows + 1)
+        ],
+        batch_size=1000,
+    )
+    await close_db()
+
+
+async def run_workload(concurrency: int, seconds: float) -> int:
+    """Issue list, search and detail reads from concurrent tasks; return the count."""
+    deadline = time.perf_counter() + seconds
+    completed = 0
+
+    async def worker(worker_id: int) -> None:
+        nonlocal completed
+        step = worker_id
+        while time.perf_counter() < deadline:
+            kind = step % 3
+            if kind == 0:
+                await PokemonService.search_pokemon(offset=step % 500, limit=20)
+            elif kind == 1:
+                term = SEARCH_TERMS[step % len(SEARCH_TERMS)]
+                await PokemonService.search_pokemon(query=term, limit=20, sort_by="name")
+            else:
+                await PokemonService.get_pokemon_details(str(step % 500 + 1))
+            completed += 1
+            step += concurrency
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return completed
+
+
+async def benchmark(pool_size: int, path: str, concurrency: int, seconds: float) -> float:
+    """Requests per second with a given reader pool size."""
+    settings.DATABASE_URL = f"sqlite://{path}"
+    settings.SQLITE_READ_POOL_SIZE = pool_size
+    settings.SQLITE_OPTIMIZE_ON_STARTUP = False
+    await init_db()
+    try:
+        await run_workload(concurrency, min(1.0, seconds))  # Warm up caches
+        completed = await run_workload(concurrency, seconds)
+    finally:
+        await Tortoise.close_connections()
+    return completed / seconds
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.sqlite3")
+        print(f"Creating {args.rows} synthetic Pokemon...")
+        await create_database(path, args.rows)
+
+        print(f"Concurrency {args.concurrency}, {args.seconds:.0f}s per run\n")
+        print(f"{'readers':>8} {'req/s':>10} {'speedup':>8}")
+        baseline = None
+        for pool_size in args.pool_sizes:
+            throughput = await benchmark(pool_size, path, args.concurrency, args.seconds)
+            baseline = baseline or throughput
+            print(f"{pool_size:>8} {throughput:>10.1f} {throughput / baseline:>7.2f}x")
+
+
+def main():
+    """Entry point for the read pool benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite reader pool")
+    parser.add_argument("--rows", type=int, default=5000, help="Synthetic Pokemon (default: 5000)")
+    parser.add_argument(
+        "--pool-sizes",
+        type=int,
+        nargs="+",
+        default=[0, 1, 2, 4, 8],
+        help="Reader pool sizes to compare (default: 0 1 2 4 8)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="Concurrent tasks (default: 16)"
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=5.0, help="Duration of each run (default: 5)"
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Benchmark service methods as the dataset grows.
+
+Builds one throwaway SQLite database of synthetic data and grows it through
+``--sizes`` Pokemon (with a tenth as many users). At every size, times the
+service paths behind the hot routes:
+
+  PokemonService.search_pokemon      first and middle pages, substring search
+  PokemonService.get_pokemon_details by id and by name
+  AuthService.get_current_user       cached token and first use of a token
+  UserService.get_all_users          first and middle pages
+  security helpers                   JWT create/decode, password verification
+
+Pokemon paths run against the database and against the packed Pokedex
+file. The median time per call is printed per size, with the growth from
+the smallest to the largest size: a path whose time grows with the data is
+a scan that will hurt before the data gets there.
+
+Usage (from the backend directory):
+    python -m benchmarks.services
+    python -m benchmarks.services --sizes 1000 10000 100000 1000000
+    python -m benchmarks.services --budget 0.5 --json services.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List, Union
+
+from app.core.config import settings
+from app.core.database import close_db, init_db
+from app.core.packed_pokedex import write_packed_pokedex
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    get_password_hash,
+    verify_password,
+)
+from app.models.user import User
+from app.services.auth_service import AuthService, principal_cache
+from app.services.pokemon_service import PokemonService, pokedex
+from app.services.token_version_service import token_versions
+from app.services.user_service import UserService
+from benchmarks.synthetic import (
+    PASSWORD,
+    insert_pokemon,
+    insert_users,
+    pokemon_name,
+    pokemon_record,
+)
+
+Case = Callable[[], Union[Awaitable, object]]
+
+
+async def time_case(case: Case, iterations: int, budget: float) -> float:
+    """Median seconds per call, over up to ``iterations`` calls within ``budget``."""
+    # Untimed first call: imports, statement caches, cold pages
+    result = case()
+    if asyncio.iscoroutine(result):
+        await result
+
+    samples: List[float] = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < iterations and (len(samples) < 3 or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        result = case()
+        if asyncio.iscoroutine(result):
+            await result
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def pokemon_cases(size: int, rng: random.Random) -> Dict[str, Case]:
+    return {
+        "search: first page": lambda: PokemonService.search_pokemon(limit=20),
+        "search: middle page by name": lambda: PokemonService.search_pokemon(
+            offset=size // 2, limit=20, sort_by="name"
+        ),
+        "search: substring": lambda: PokemonService.search_pokemon(query="char", limit=20),
+        "search: no match": lambda: PokemonService.search_pokemon(query="zzz", limit=20),
+        "details: by id": lambda: PokemonService.get_pokemon_details(
+            str(rng.randint(1, size))
+        ),
+        "details: by name": lambda: PokemonService.get_pokemon_details(
+            pokemon_name(rng.randint(1, size))
+        ),
+    }
+
+
+async def user_cases(users: int, rng: random.Random) -> Dict[str, Case]:
+    # Active users only (every tenth one is inactive)
+    sample = [
+        user_id for user_id in rng.sample(range(1, users + 1), min(users, 200)) if user_id % 10
+    ]
+    tokens = [AuthService.create_user_token(user) for user in await User.filter(id__in=sample)]
+    cached_token = tokens[0]
+    await AuthService.get_current_user(cached_token)
+    fresh_tokens = iter(tokens[1:] * 1000)
+
+    def first_use():
+        principal_cache.clear()
+        token_versions.reset()
+        return AuthService.get_current_user(next(fresh_tokens))
+
+    return {
+        "get_current_user: cached": lambda: AuthService.get_current_user(cached_token),
+        "get_current_user: first use": first_use,
+        "get_all_users: first page": lambda: UserService.get_all_users(skip=0, limit=100),
+        "get_all_users: middle page": lambda: UserService.get_all_users(
+            skip=users // 2, limit=100
+        ),
+    }
+
+
+def security_cases(hashed_password: str) -> Dict[str, Case]:
+    token = create_access_token({"sub": "user1", "uid": 1, "ver": 0})
+    return {
+        "create_access_token": lambda: create_access_token({"sub": "user1", "uid": 1, "ver": 0}),
+        "decode_access_token": lambda: decode_access_token(token),
+        "verify_password": lambda: verify_password(PASSWORD, hashed_password),
+    }
+
+
+async def measure_size(
+    size: int, directory: str, hashed_password: str, args: argparse.Namespace
+) -> Dict[str, float]:
+    """Median microseconds per call of every case at the current size."""
+    rng = random.Random(args.seed)
+    users = max(size // 10, 1)
+    results: Dict[str, float] = {}
+
+    async def run(label: str, cases: Dict[str, Case]) -> None:
+        for name, case in cases.items():
+            seconds = await time_case(case, args.iterations, args.budget)
+            results[f"{label}{name}"] = seconds * 1_000_000
+
+    pokedex.clear()
+    await run("[db] ", pokemon_cases(size, rng))
+
+    path = os.path.join(directory, "pokedex.bin")
+    write_packed_pokedex(path, (pokemon_record(i) for i in range(1, size + 1)))
+    settings.POKEDEX_FILE = path
+    await pokedex.load()
+    await run("[packed] ", pokemon_cases(size, rng))
+    pokedex.clear()
+
+    await run("", await user_cases(users, rng))
+    await run("", security_cases(hashed_password))
+    return results
+
+
+def report(sizes: List[int], rows: Dict[str, List[float]]) -> None:
+    header = "".join(f"{size:>12,}" for size in sizes)
+    print(f"\n{'microseconds per call':<38}{header}{'growth':>9}")
+    for name, values in rows.items():
+        cells = "".join(f"{value:>12.1f}" for value in values)
+        print(f"{name:<38}{cells}{values[-1] / values[0]:>8.1f}x")
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    sizes = sorted(args.sizes)
+    rows: Dict[str, List[float]] = {}
+    hashed_password = get_password_hash(PASSWORD)
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings.DATABASE_URL = f"sqlite://{os.path.join(directory, 'services.sqlite3')}"
+        settings.DATABASE_GENERATE_SCHEMAS = True
+        pokemon = users = 0
+        for size in sizes:
+            # Grow the same database instead of building each size anew
+            await init_db()
+            started = time.perf_counter()
+            await insert_pokemon(pokemon + 1, size + 1)
+            await insert_users(users + 1, max(size // 10, 1) + 1, hashed_password)
+            pokemon, users = size, max(size // 10, 1)
+            await close_db()
+            await init_db()
+            print(
+                f"{size:,} Pokemon and {users:,} users "
+                f"(generated in {time.perf_counter() - started:.1f}s), measuring..."
+            )
+            try:
+                results = await measure_size(size, directory, hashed_password, args)
+            finally:
+                await close_db()
+            for name, value in results.items():
+                rows.setdefault(name, []).append(value)
+
+    report(sizes, rows)
+    return {"sizes": sizes, "microseconds": rows}
+
+
+def main():
+    """Entry point for the service benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmark service methods by dataset size")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10_000, 100_000],
+        help="Pokemon counts to measure; users are a tenth (default: 1000 10000 100000)",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=200, help="Maximum calls per case (default: 200)"
+    )
+    parser.add_argument(
+        "--budget", type=float, default=1.0, help="Seconds per case, at least 3 calls (default: 1)"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed of the lookups")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
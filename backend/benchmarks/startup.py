@@ -0,0 +1,128 @@
+"""
+Benchmark cold start: import time and time to first request.
+
+Starts the server as a fresh uvicorn process against a throwaway SQLite
+database and measures how long it takes until ``GET /pokemon/`` answers,
+once with schema generation at startup and once with the migration
+version check used in production. The import time of ``main`` in a fresh
+interpreter is reported separately, as it is paid by every worker.
+
+Usage (from the backend directory):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from tortoise import Tortoise, connections
+
+from app.core.database import MIGRATIONS_DIR, migration_versions
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+async def migrate(path: str) -> None:
+    """Apply the migrations to a new database and record them, like `aerich upgrade`."""
+    await Tortoise.init(db_url=f"sqlite://{path}", modules={"models": []})
+    connection = connections.get("default")
+    try:
+        for version in migration_versions():
+            spec = importlib.util.spec_from_file_location(
+                version[:-3], os.path.join(MIGRATIONS_DIR, version)
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            await connection.execute_script(await module.upgrade(connection))
+            await connection.execute_insert(
+                "INSERT INTO aerich (version, app, content) VALUES (?, ?, ?)",
+                [version, "models", json.dumps({})],
+            )
+    finally:
+        await Tortoise.close_connections()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def import_seconds() -> float:
+    """Time to import the application in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def first_request_seconds(path: str, generate_schemas: bool, timeout: float = 30.0) -> float:
+    """Seconds from spawning the server until it answers a Pokemon list request."""
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite://{path}",
+        "DATABASE_GENERATE_SCHEMAS": str(generate_schemas),
+        "REQUEST_PROFILING": "False",
+    }
+    url = f"http://127.0.0.1:{port}/pokemon/?limit=1"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            time.sleep(0.005)
+        raise RuntimeError("Server did not answer in time")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def report(label: str, samples: list) -> None:
+    print(
+        f"{label:<28} median {statistics.median(samples) * 1000:>7.1f} ms"
+        f"   min {min(samples) * 1000:>7.1f} ms"
+    )
+
+
+def main():
+    """Entry point for the startup benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark server cold start")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement (default: 5)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "startup.sqlite3")
+        asyncio.run(migrate(path))
+
+        report("import main", [import_seconds() for _ in range(args.runs)])
+        for generate_schemas in (True, False):
+            label = f"first request ({'generate' if generate_schemas else 'check'})"
+            report(label, [first_request_seconds(path, generate_schemas) for _ in range(args.runs)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Script to pick argon2 cost parameters for this host.
+
+Benchmarks password verification with the application's own hashing
+policy and selects the highest time cost whose median verify latency stays
+within the target. Memory cost is halved when even a single pass is too
+slow. The result is printed as .env lines for ARGON2_* settings, together
+with the login capacity it implies per core.
+
+Usage:
+    python calibrate_argon2.py                   # Target 250ms per verify
+    python calibrate_argon2.py --target-ms 100
+    python calibrate_argon2.py --memory-cost 19456 --parallelism 1
+"""
+
+import argparse
+import statistics
+import time
+
+from app.core.config import settings
+from app.core.security import build_pwd_context
+
+MIN_MEMORY_COST = 8 * 1024  # KiB
+MAX_TIME_COST = 20
+
+
+def measure_verify_ms(time_cost: int, memory_cost: int, parallelism: int, samples: int) -> float:
+    """Median wall time of one password verification, in milliseconds."""
+    context = build_pwd_context(time_cost, memory_cost, parallelism)
+    password = "calibration-password"
+    hashed = context.hash(password)
+
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify(password, hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, memory_cost: int, parallelism: int, samples: int) -> dict:
+    """
+    Find the strongest parameters whose verify latency fits the target.
+
+    Returns:
+        Dict with the chosen time_cost, memory_cost, parallelism and the
+        measured latency in milliseconds
+    """
+    while True:
+        latency = measure_verify_ms(1, memory_cost, parallelism, samples)
+        print(f"  t=1 m={memory_cost} p={parallelism}: {latency:.1f}ms")
+        if latency <= target_ms or memory_cost // 2 < MIN_MEMORY_COST:
+            break
+        memory_cost //= 2
+
+    best = {
+        "time_cost": 1,
+        "memory_cost": memory_cost,
+        "parallelism": parallelism,
+        "latency_ms": latency,
+    }
+
+    for time_cost in range(2, MAX_TIME_COST + 1):
+        latency = measure_verify_ms(time_cost, memory_cost, parallelism, samples)
+        print(f"  t={time_cost} m={memory_cost} p={parallelism}: {latency:.1f}ms")
+        if latency > target_ms:
+            break
+        best = {
+            "time_cost": time_cost,
+            "memory_cost": memory_cost,
+            "parallelism": parallelism,
+            "latency_ms": latency,
+        }
+
+    return best
+
+
+def main():
+    """Entry point for the calibration command."""
+    parser = argparse.ArgumentParser(description="Calibrate argon2 cost for this host")
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=250.0,
+        help="Target median verify latency in milliseconds (default: 250)",
+    )
+    parser.add_argument(
+        "--memory-cost",
+        type=int,
+        default=settings.ARGON2_MEMORY_COST,
+        help=f"Starting memory cost in KiB (default: {settings.ARGON2_MEMORY_COST})",
+    )
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=settings.ARGON2_PARALLELISM,
+        help=f"Lanes per hash (default: {settings.ARGON2_PARALLELISM})",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=5,
+        help="Verifications timed per candidate (default: 5)",
+    )
+    args = parser.parse_args()
+
+    print(f"Calibrating argon2 for a {args.target_ms:.0f}ms verify target...")
+    result = calibrate(args.target_ms, args.memory_cost, args.parallelism, args.samples)
+
+    logins_per_second = 1000 / result["latency_ms"]
+    print(
+        f"\n✓ Verify takes {result['latency_ms']:.1f}ms "
+        f"(~{logins_per_second:.1f} logins/s per hashing worker, "
+        f"{settings.PASSWORD_HASH_WORKERS} workers configured)"
+    )
+    print("\nAdd to .env:")
+    print(f"ARGON2_TIME_COST={result['time_cost']}")
+    print(f"ARGON2_MEMORY_COST={result['memory_cost']}")
+    print(f"ARGON2_PARALLELISM={result['parallelism']}")
+
+
+if __name__ == "__main__":
+    main()
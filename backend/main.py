@@ -1,11 +1,23 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.core.config import settings
-from app.core.database import close_db, init_db
-from app.routes import admin_router, auth_router, pokemon_router
+from app.core.database import close_db, init_db, is_read_only
+from app.core.hashing import HashingPoolSaturatedError, bulk_hasher, hashing_pool
+from app.core.metrics import MetricsMiddleware, flush_metrics_periodically, registry
+from app.core.profiling import (
+    FastJSONResponse,
+    RequestProfilingMiddleware,
+    configure_request_log,
+)
+from app.routes import admin_router, auth_router, metrics_router, pokemon_router
+from app.services.pokedex_refresh_service import pokedex_refresher, sync_pokedex_periodically
+from app.services.pokemon_service import pokedex
+from app.services.refresh_token_service import RefreshTokenService
 
 
 @asynccontextmanager
@@ -14,10 +26,35 @@ async def lifespan(app: FastAPI):
     # Startup
     await init_db()
     print("Database initialized")
+    if not is_read_only():
+        purged = await RefreshTokenService.purge_expired()
+        print(f"Purged {purged} expired refresh tokens")
+    # Workers forked by the production server inherit the parent's copy
+    if settings.POKEDEX_PRELOAD and not pokedex.loaded:
+        print(f"Loaded {await pokedex_refresher.load()} Pokemon")
+    pokedex_syncer = asyncio.create_task(sync_pokedex_periodically(settings.POKEDEX_SYNC_SECONDS))
+    metrics_flusher = None
+    if settings.METRICS_MULTIPROC_DIR:
+        metrics_flusher = asyncio.create_task(
+            flush_metrics_periodically(
+                settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_SECONDS
+            )
+        )
     yield
     # Shutdown
+    await pokedex_refresher.cancel()
+    pokedex_syncer.cancel()
+    with suppress(asyncio.CancelledError):
+        await pokedex_syncer
+    if metrics_flusher is not None:
+        metrics_flusher.cancel()
+        with suppress(asyncio.CancelledError):
+            await metrics_flusher
+        registry.write_snapshot(settings.METRICS_MULTIPROC_DIR)
     await close_db()
     print("Database connection closed")
+    hashing_pool.shutdown()
+    bulk_hasher.shutdown()
 
 
 app = FastAPI(
@@ -25,6 +62,7 @@ app = FastAPI(
     description="API for Pokedex application with user authentication",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # CORS middleware
@@ -34,12 +72,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "Server-Timing"],
 )
 
+app.add_middleware(MetricsMiddleware)
+configure_request_log(settings.REQUEST_LOG_LEVEL)
+# Outermost, so the timings cover every other middleware
+app.add_middleware(RequestProfilingMiddleware)
+
+
+@app.exception_handler(HashingPoolSaturatedError)
+async def hashing_pool_saturated_handler(request: Request, exc: HashingPoolSaturatedError):
+    """Shed load when too many password hashes are already queued."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(admin_router)
 app.include_router(pokemon_router)
+app.include_router(metrics_router)
 
 
 @app.get("/")
@@ -58,10 +114,38 @@ async def health_check():
     return {"status": "healthy"}
 
 
+def preload_pokedex():
+    """Load the Pokedex in the server parent, before the workers are forked."""
+
+    async def load():
+        await init_db()
+        try:
+            print(f"Preloaded {await pokedex_refresher.load()} Pokemon")
+        finally:
+            await close_db()
+
+    asyncio.run(load())
+
+
 def run_server():
     """Entry point for running the server via uv."""
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+
+    if settings.DEBUG:
+        # Development: one process, reloaded on code changes
+        uvicorn.run("main:app", host=settings.SERVER_HOST, port=settings.SERVER_PORT, reload=True)
+        return
+
+    from app.core.server import PreforkServer, clear_metrics_snapshots, server_config, worker_count
+
+    workers = worker_count()
+    if settings.METRICS_MULTIPROC_DIR:
+        clear_metrics_snapshots(settings.METRICS_MULTIPROC_DIR)
+    elif workers > 1 and settings.METRICS_ENABLED:
+        print("METRICS_MULTIPROC_DIR is not set; each scrape sees a single worker")
+
+    preload = preload_pokedex if settings.POKEDEX_PRELOAD else None
+    PreforkServer(server_config(app), workers, preload=preload).run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+# The schema as the first release created it with generate_schemas, so
+# databases from before migrations adopt them with a plain `aerich upgrade`.
+# aerich generates SQL for the database it runs against; each migration
+# ships it for every dialect the app supports
+
+UPGRADE_SQL = {
+    "sqlite": """
+        CREATE TABLE IF NOT EXISTS "users" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "username" VARCHAR(50) NOT NULL UNIQUE,
+    "email" VARCHAR(100) NOT NULL UNIQUE,
+    "hashed_password" VARCHAR(255) NOT NULL,
+    "is_active" INT NOT NULL DEFAULT 1,
+    "is_admin" INT NOT NULL DEFAULT 0,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) /* User model. */;
+CREATE INDEX IF NOT EXISTS "idx_users_usernam_266d85" ON "users" ("username");
+CREATE INDEX IF NOT EXISTS "idx_users_email_133a6f" ON "users" ("email");
+CREATE TABLE IF NOT EXISTS "pokemon" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "name" VARCHAR(100) NOT NULL UNIQUE,
+    "height" INT NOT NULL,
+    "weight" INT NOT NULL,
+    "description" TEXT,
+    "sprite_front_default" VARCHAR(500),
+    "sprite_official_artwork" VARCHAR(500),
+    "types" JSON NOT NULL,
+    "abilities" JSON NOT NULL,
+    "stats" JSON NOT NULL,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) /* Pokemon model for storing Pokemon data. */;
+CREATE INDEX IF NOT EXISTS "idx_pokemon_name_784079" ON "pokemon" ("name");
+CREATE TABLE IF NOT EXISTS "aerich" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "version" VARCHAR(255) NOT NULL,
+    "app" VARCHAR(100) NOT NULL,
+    "content" JSON NOT NULL
+);""",
+    "postgres": """
+        CREATE TABLE IF NOT EXISTS "users" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "username" VARCHAR(50) NOT NULL UNIQUE,
+    "email" VARCHAR(100) NOT NULL UNIQUE,
+    "hashed_password" VARCHAR(255) NOT NULL,
+    "is_active" BOOL NOT NULL DEFAULT True,
+    "is_admin" BOOL NOT NULL DEFAULT False,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS "idx_users_usernam_266d85" ON "users" ("username");
+CREATE INDEX IF NOT EXISTS "idx_users_email_133a6f" ON "users" ("email");
+COMMENT ON TABLE "users" IS 'User model.';
+CREATE TABLE IF NOT EXISTS "pokemon" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "name" VARCHAR(100) NOT NULL UNIQUE,
+    "height" INT NOT NULL,
+    "weight" INT NOT NULL,
+    "description" TEXT,
+    "sprite_front_default" VARCHAR(500),
+    "sprite_official_artwork" VARCHAR(500),
+    "types" JSONB NOT NULL,
+    "abilities" JSONB NOT NULL,
+    "stats" JSONB NOT NULL,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS "idx_pokemon_name_784079" ON "pokemon" ("name");
+COMMENT ON TABLE "pokemon" IS 'Pokemon model for storing Pokemon data.';
+CREATE TABLE IF NOT EXISTS "aerich" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "version" VARCHAR(255) NOT NULL,
+    "app" VARCHAR(100) NOT NULL,
+    "content" JSONB NOT NULL
+);""",
+}
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    dialect = db.capabilities.dialect
+    if dialect not in UPGRADE_SQL:
+        raise NotImplementedError(f"No migration for {dialect}")
+    return UPGRADE_SQL[dialect]
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    # aerich's own table stays: it deletes this version's row afterwards
+    return """
+        DROP TABLE IF EXISTS "users";
+        DROP TABLE IF EXISTS "pokemon";"""
+
+
+MODELS_STATE = (
+    "eJztme1P4jAYwP+VhU+acEY5UXPfQLmTi4LReWc0ZilbgYatnW0nEuP/fm3Z2PsEIgjevr"
+    "HnpWt/bZ89z8NrxSEWtNneLYO08kN7rWDgQPEjJq9qFeC6oVQKOOjZytATFkoCeoxTYHIh"
+    "7AObQSGyIDMpcjkiWJrKwTQ1xJ50sIgpPBAeZOg8jJ48aHAygHyopvbwKMQIW/AFsuDRHR"
+    "l9BG0rNnNkyQGU3OATV8namP9UhvK1PcMktufg0Nid8CHBM2uEuZQOIIYUcCiH59STC8Ke"
+    "bfsLD9Y4nWloMp1ixMeCfeDZEov0TlEJhBEYvsgkWBIVs2FqgQP5lm+1g8Pjw5PvR4cnwk"
+    "TNZCY5fpsuL1z71FER6OiVN6UHHEwtFMaQm9xI9TtF73QIaDa+qE8Coph6EmKA7FMpOuDF"
+    "sCEe8KF4rO8XIPvTuD49b1zv1Pd35UqIONzTI9/xNTWlklRDitAByF4E4cxhG/kd7M8DUF"
+    "jlElS6OMIhYENoGS5gbExoxm3Oh5nh+jFYA0HINYxxqwBbq9fnACuscsEqXRwsYoaIz+g5"
+    "44o3CbEhwDlBMuqX4NkTjqsCOju6SwEt4Nfsdi/kpB3GnmwlaOsJjreXzZY4uQqvMEIcRq"
+    "NonKnlILwE0sBtjUSzP8wbhtSkUC7bADwN9UxoOHJgNtW4Z4Kr5bvuBT82NA6INVhdbE/8"
+    "C1DAXG9ftm70xuVVDPxZQ29JTU1JJwnpzlEiYswG0f629XNNPmr33U5LESSMD6h6Y2in31"
+    "fknIDHiYHJWJzjyGcmkAZgYhvrudaSGxv3LDf2UzdWTV6m3/1RJJGUgh4wR2NALSOlITWS"
+    "Z5tWOTUnKQEYDNSuSLZyln59ckVG0FH7kCpdAlW1qHpxI0bv1i/+iNMyResTqjFO5J5rgU"
+    "Ym1+naZgG/su5Ze92zaM2zzfXOavJ1iAbDjJCee/hCh/cP4IbE7g85gyGy8aLIxv89sug0"
+    "Utx0+JIDLuG21KX1r+Qa4RXlBq07PZYWBHdz57JxtxtLDS66nV+BeeQun150mwm4zKUiHT"
+    "f6lGBuBItYICbm+W8J7mRTaL6uUFFbKBUkfUKk30cmArYBKB8TOloCctYQJeeA83SQFNXf"
+    "N91ONtWZQ4LhLRaLe7CQyauajRh/3MwwW0BQrrk4UiSDQqIykAMkIwXoIVG5o8UYx5xKzv"
+    "NwZhzwhRjPHEq+8/Atm0xfohdRNpm+6MZuUpOpASkyh5WMHpOvqRa1mEBo816HKX+by77Q"
+    "2vtCz5CyzGIzP0OPuJR/O4Ypo7gaC0D0zbcT4EoabOKNHOKM71l+NhhxKfPBvHzwUz8vb/"
+    "8AFcP4Kg=="
+)
@@ -0,0 +1,86 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+UPGRADE_SQL = {
+    "sqlite": """
+        CREATE TABLE IF NOT EXISTS "refresh_tokens" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "token_hash" VARCHAR(64) NOT NULL UNIQUE,
+    "family" VARCHAR(32) NOT NULL,
+    "token_version" INT NOT NULL,
+    "session_started_at" TIMESTAMP NOT NULL,
+    "expires_at" TIMESTAMP NOT NULL,
+    "used_at" TIMESTAMP,
+    "revoked_at" TIMESTAMP,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "user_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+) /* Refresh token model; only an HMAC of the token itself is stored. */;
+CREATE INDEX IF NOT EXISTS "idx_refresh_tok_family_8ce7f3" ON "refresh_tokens" ("family");
+        ALTER TABLE "users" ADD "token_version" INT NOT NULL DEFAULT 0;
+        CREATE INDEX "idx_users_is_acti_7a996a" ON "users" ("is_active", "id");
+        CREATE INDEX "idx_users_is_admi_cea6a7" ON "users" ("is_admin", "id");""",
+    "postgres": """
+        CREATE TABLE IF NOT EXISTS "refresh_tokens" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "token_hash" VARCHAR(64) NOT NULL UNIQUE,
+    "family" VARCHAR(32) NOT NULL,
+    "token_version" INT NOT NULL,
+    "session_started_at" TIMESTAMPTZ NOT NULL,
+    "expires_at" TIMESTAMPTZ NOT NULL,
+    "used_at" TIMESTAMPTZ,
+    "revoked_at" TIMESTAMPTZ,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "user_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS "idx_refresh_tok_family_8ce7f3" ON "refresh_tokens" ("family");
+COMMENT ON TABLE "refresh_tokens" IS 'Refresh token model;
+        ALTER TABLE "users" ADD "token_version" INT NOT NULL DEFAULT 0;
+        CREATE INDEX "idx_users_is_acti_7a996a" ON "users" ("is_active", "id");
+        CREATE INDEX "idx_users_is_admi_cea6a7" ON "users" ("is_admin", "id");""",
+}
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    dialect = db.capabilities.dialect
+    if dialect not in UPGRADE_SQL:
+        raise NotImplementedError(f"No migration for {dialect}")
+    return UPGRADE_SQL[dialect]
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_users_is_admi_cea6a7";
+        DROP INDEX IF EXISTS "idx_users_is_acti_7a996a";
+        ALTER TABLE "users" DROP COLUMN "token_version";
+        DROP TABLE IF EXISTS "refresh_tokens";"""
+
+
+MODELS_STATE = (
+    "eJztm19P2zoUwL9K1CcmcRErhU13T6WUC3dAJyi709AUuYnTWiR2ZrsUNPHdr+0kTZzEbV"
+    "NR2kLe2vPHsX+Oj31O3T+NgLjQZ3u3DNLG39afBgYBFB80+a7VAGGYSqWAg4GvDMfCQknA"
+    "gHEKHC6EHvAZFCIXMoeikCOCpalszFJN7EkHlzjCA+FhiW6M0e8xtDkZQj5SXbv7JcQIu/"
+    "ARMvn1roGYLR6HHqB0QG5DGERCN0A4kUmv8N72EPRdbYBCKVRKbvOnUMnOMT9VhrJ3A9sh"
+    "/jjAqXH4xEcET60R5lI6hBhSwKFsntOxHDce+37MJ0ERDSg1iUaS8XGhB8a+pCe9C/ASYY"
+    "ZZLHIIluBFb5ga4FA+5a/mx9an1ueDo9ZnYaJ6MpV8eo6Gl449clQErvqNZ6UHHEQWinbK"
+    "Tc63+lyg1xkBWo4v65ODKLqeh5ggWyvFADzaPsRDPhJfD/dnIPvevu6cta93Dvc/yJEQsQ"
+    "ailXEVa5pKJammFGEAkF8F4dRhG/l93F8EoLAyElQ6HeEIsBF07RAwNiG0ZDWbYZa4vgzW"
+    "RJByTUPhKsA2Dw8XACusjGCVTgerxVUd6TEhPgTYECSzfjmeA+G4KqDTV3cpoDP4Hfd6F7"
+    "LTAWO/fSU47+c43l4ed8Wbq/AKI8RhNorqTJNtqSLSxO0ViZbv3xuGlJN7iO0HcfqQ3Vt8"
+    "Ly/4zd/WX4rr/rq39ZSeQ6EcnA14Ed2J0HAUwHJ+umcOnhu77iUfNjSKijG4Pew/xeFjBr"
+    "r++WX3pt++/Ka9tiftfldqmkr6lJPuHOXi7bQR67/z/pklv1o/e1ddRZAwPqTqiald/2dD"
+    "9gmMObExmYgokNmkE2kCRpvYceguObG6Zz2xa51Y1XmZvHj3mWO4FAyAcz8B1LU1TfoCUO"
+    "iJh45sFedYyYYT+59+vYY+4OVBME7/rqO2+rKpzZzw5+QtTqRZdqRJTPCKqqAZ5CUAg6Hq"
+    "tXy2fFIZlpKsOY/NnD0XJ2t+Gh23bimfKGf+YhHxzlsAW2eX7Y5FPEtkzbEB4gz6noWYxT"
+    "ih0C3m3i/R4PyEvc7El9qyzZl4dJCRuUyV3Ef32sZs8qi1QM5z1DKmPFKlH4Y8ECCxZVSg"
+    "mHqsKnFcKcKD5gIID5pGhFK19afxTVjdKUAGmURgMw7ocue38ha28xy3Jee2ZNgzT+TwMU"
+    "SiuSVmVPesZ3LdMzlmyyVW7CVXY7wx1FO41BRS+CB2nGVmUfesJ3LNE1kXsN5EnaM0yFK7"
+    "Uk6Y8XhPp8dCdUhnWAR4KrJ1NMRf4ZPieC56BLBT9nNN7tf/zeNnKvsIMQWTaZEh+2qI4Y"
+    "lBwejnhE77ptM+6TaezRW1VRaQvomdJCCltaNEtTurbBRmjObWi+IWo8KO5RGq6jaCrpVo"
+    "ZImhWBaq4FdXf169+lP1DsY2379Yzf0BEQtHJYcH48uXOrynXSaLbFIV2eTdI8t2o8CtDx"
+    "8N4HJuSy3azcovuj/62gE0WZs7l+0fH7RD6EXv6p/EPLOWOxe943zNLKSIQ9ujBHM7GUSF"
+    "mGjy3xLc+Utqi91Sm3VNrRAkY0LE85CDgG8DyieE3i8BuayJmvO0fK4aKVD996Z3ZaibJw"
+    "45hrdYDO7ORQ7ftXzE+K/NDLMzCMoxz44U+aCwq+egsoF8pAAD5COOqjHWnGrOi3AWGSWv"
+    "xHjqUPNdhG9d9XqrVa/62tZbmNiq17ZWWWRqQ4qcUaOkxhRrdmeVmEBqM6/CZJ7mui706n"
+    "Uh4xUM8wndfPviPf8NQi6NChBj8+0EuJICm3gih7hkPzOfBjMu9XnQdB5c6/by/D+aPaMk"
+)
@@ -0,0 +1,63 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+UPGRADE_SQL = {
+    "sqlite": """
+        CREATE TABLE IF NOT EXISTS "deleted_users" (
+    "user_id" INT NOT NULL PRIMARY KEY,
+    "deleted_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) /* Id of a deleted user, kept a while so other workers revoke its tokens. */;
+CREATE INDEX IF NOT EXISTS "idx_deleted_use_deleted_201b89" ON "deleted_users" ("deleted_at");""",
+    "postgres": """
+        CREATE TABLE IF NOT EXISTS "deleted_users" (
+    "user_id" INT NOT NULL PRIMARY KEY,
+    "deleted_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS "idx_deleted_use_deleted_201b89" ON "deleted_users" ("deleted_at");
+COMMENT ON TABLE "deleted_users" IS 'Id of a deleted user, kept a while so other workers revoke its tokens.';""",
+}
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    dialect = db.capabilities.dialect
+    if dialect not in UPGRADE_SQL:
+        raise NotImplementedError(f"No migration for {dialect}")
+    return UPGRADE_SQL[dialect]
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "deleted_users";"""
+
+
+MODELS_STATE = (
+    "eJztm21v4jgQgP+KxaeuxFVd+rKrvU+U0iu3LaxaerfaahUZ4oBFYmdjU1qt+O9nOwl5NS"
+    "U5KNDmG8x4HPuZeOwZzO+aQ01ks8MLZCOOzHuGvNoX8LtGoIPEhzx1HdSg60ZKKeBwYKv2"
+    "pt/QmIqWSgMHjHtwyIXSgjZDddmGDT3sckyJNOmYgFoAgsAUSNM6mCCXC+FsjG0EGAWUj5"
+    "EHZtSbiI6Bhx7pBAHMGeDiA2GH8lkmHYqHYTJab7dTgn9NkcHpCMnWovOHn0KMiYmeEAu/"
+    "uhPDwsg2E/jkQw1syl6U0uDPrlJ0CL9UreWwB8aQ2lOHpCzcZz6mZGGCCZfSESLIg2JGMa"
+    "JkatuBB0KRP2gh4N4ULUZrRgITWXBqS79I64xbQmEMaSAaUiJdKobD1FxH8il/ND6efDr5"
+    "fHx28lk0USNZSD7N/UlGBHxDxaHbr82VHnLot1BEI4ThGwV5luKF4MCxg/JRJi1TNM3A9D"
+    "D8UIZtKNgcXA9Bs0fs56DrJST7nZv2Xb95801OxGHsl60INfttqWko6XNKenD2QcqpWKD+"
+    "8l10Av7t9K+A/Ap+9LptBZAyPvLUE6N2/R81OSY45dQgdGZAM0YhlIak5nKdWJOYm6VgAI"
+    "eTGfRMI6OhDaprm1U5DSctgQSOlFckXDnMIJrpotzL4a1AWJOdAdVFNjaldC8HmIcaZoZ4"
+    "HH5U76mID6KBLzQdTEKZNg4VCkGrRp/Ay285+Eh/q88Zeq0x9PQRPLRJQRRD38kQ7sAnw0"
+    "ZkxMfi6+nREmT/NG9bV83bg9OjVOToBpqGUkmqEUXkQGwXQbgw2Ed+H49WAShaaQkqXRLh"
+    "GLKx2MpcyJg4rOSsZj3MHNP1YM3uflEo3ATYxunpCmBFKy1YpUuCTcTVJNJzSm0EiSZIxu"
+    "1SPAfCcFNAF69uKaBL+J33eteJo8N5p5/ieH9z3hZvrsIrGmGO4lE0yTTclgoiDc1ekWj+"
+    "/r1jSFU6YjyK04cc3up7ecZuPUnFKlyPtr2tR/SG4hhdLodIWr5ODrH2KPq2koi4Y6euWd"
+    "KxScvKsVt1rBp8geQwegE8ZImHjg2/XJOz4QT2l19vkQ15fhAM0r9bv6++7Go3HT4P3+JQ"
+    "Gme3qWw5gSUna05j02fPWWe9nEYHvfv1OD9n/hNQ8c4DSMDVTbMlq3wiaw4aYM6QbQHMAO"
+    "PUQ2Y2915Hh/+jIlhl4uUycf8gI3OZIrlP0mofs8mzkxVynrMTbcojVcnDkAUdLLaMAhQj"
+    "i00ljhtFeNxYAeFxQ4tQqvb+NL4LqzsCyBCTCAzGoVfu/Jbfw36e4/bk3BZOe+mJHD25WH"
+    "RXwqNJy8qT2/bklJVLrNg6V2OwMVQuLOVC//fsMl5MWlaO3LIjqwLWm6hz5AbZbV8Q2Y/T"
+    "Y6Y6lGSYBXgpsnU8Il/Rs+LYESOCZJj3c03q1//d46cr+wixB2eLIkP81RDT86+/SHmred"
+    "dqXrRr8+1ct/gmdhKH5taOQlV9WdnIjTV6sV4U9OgXdoBFPVW3EXRBqJElhmxZqIBdVf15"
+    "9epP0TsY+3z/YjP3B0QsHOccHrQvX2TwnnaZOLJZUWSzd48sPowMtz560oBLmZVatLuVX7"
+    "S/9xMH0HBtHtw0v39IHEKve92/wuaxtdy67p2na2auhzkyLI8SboSTKBATdfZ7gjt9SW21"
+    "W2rLrqllgmRAiFoWHmJoG9Dj8mZ4Cch5XVScF+Vz1UmG6t93va6mbh4apBjeEzG5BxMPeR"
+    "3YmPGfuxlmlxCUc14eKdJBoZ7MQWUH6UgBB9jGHBdjnDCqOK/CWWSUvBDjhUHFdxW+VdXr"
+    "rVa9qmtbb8GxRa9tbbLI1EQeHo5rOTWmQFNfVmKCUZuXKkx6N1d1oVevC2mvYOhP6PrbF+"
+    "/5bxByaRSAGDTfT4AbKbCJJ3JEcvYz/WkwZlKdB3Xnwa1uL/P/ALTCPDI="
+)
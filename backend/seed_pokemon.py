@@ -1,166 +1,205 @@
 """
 Script to fetch all Pokemon from PokeAPI and populate the database.
 Based on the search_pokemon logic that fetches all Pokemon.
+
+The transformed dataset can also be exported to, and restored from, a
+gzip-compressed JSONL snapshot so that environments without network access
+can be seeded offline:
+
+    python seed_pokemon.py                           # Fetch from PokeAPI
+    python seed_pokemon.py --export pokedex.jsonl.gz # Dump the database
+    python seed_pokemon.py --import pokedex.jsonl.gz # Restore without network
+    python seed_pokemon.py --pack pokedex.bin        # Rebuild the packed file
+
+Seeding and importing also write the packed Pokedex file (``POKEDEX_FILE``)
+that the API memory-maps at startup.
+
+PokeAPI responses are kept in an on-disk cache (``--cache-dir``) and
+revalidated with ETag/Last-Modified, so re-seeding mostly costs 304s.
+
+The fetching, caching and snapshot code lives in ``app.services.pokedex_seed``,
+shared with the admin refresh (``POST /admin/pokemon/refresh``).
 """
 
+import argparse
 import asyncio
-import httpx
+import logging
+import os
+import time
+
 from tortoise import Tortoise
 
 from app.core.config import settings
+from app.core.database import tortoise_config
+from app.core.packed_pokedex import write_packed_pokedex
 from app.models.pokemon import Pokemon
+from app.services.pokedex_seed import (
+    CACHE_DIR,
+    SNAPSHOT_FIELDS,
+    ResponseCache,
+    dump_snapshot,
+    fetch_pokedex,
+    load_snapshot_records,
+    read_snapshot_async,
+)
+
+
+async def init_db():
+    """Initialize database connection and schema."""
+    await Tortoise.init(config=tortoise_config(["app.models.user", "app.models.pokemon"]))
+    await Tortoise.generate_schemas()
 
 
-async def fetch_pokemon_details(client: httpx.AsyncClient, pokemon_id: int) -> dict | None:
-    """Fetch detailed information for a single Pokemon."""
-    try:
-        response = await client.get(
-            f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}",
-            timeout=10.0,
-        )
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"Error fetching Pokemon {pokemon_id}: {e}")
-        return None
+async def seed_pokemon(cache_dir: str | None = CACHE_DIR):
+    """
+    Fetch all Pokemon from PokeAPI and store in database.
+
+    Args:
+        cache_dir: Directory of the on-disk response cache, or None to
+            always download
+    """
+    # Initialize database
+    await init_db()
+
+    cache = ResponseCache(cache_dir) if cache_dir else None
+    total_pokemon = 0
 
+    print("Starting Pokemon backup from PokeAPI...")
 
-async def fetch_pokemon_species(client: httpx.AsyncClient, pokemon_id: int) -> dict | None:
-    """Fetch species information for a single Pokemon to get description."""
     try:
-        response = await client.get(
-            f"https://pokeapi.co/api/v2/pokemon-species/{pokemon_id}",
-            timeout=10.0,
-        )
-        response.raise_for_status()
-        return response.json()
+        async for idx, total_pokemon, name, record in fetch_pokedex(cache):
+            if record is None:
+                print(f"[{idx}/{total_pokemon}] ✗ Skipped {name}")
+                continue
+
+            pokemon_fields = {k: v for k, v in record.items() if k != "id"}
+
+            # Check if Pokemon exists
+            exists = await Pokemon.filter(id=record["id"]).exists()
+
+            if exists:
+                # Update existing Pokemon using queryset update
+                await Pokemon.filter(id=record["id"]).update(**pokemon_fields)
+                print(f"[{idx}/{total_pokemon}] ✓ Updated {name}")
+            else:
+                # Create new Pokemon
+                await Pokemon.create(**record)
+                print(f"[{idx}/{total_pokemon}] ✓ Created {name}")
+
+        print(f"\n✓ Successfully backed up {total_pokemon} Pokemon to database!")
+        if cache:
+            print(f"  PokeAPI requests: {cache.summary()}")
+        if settings.POKEDEX_FILE:
+            await write_pack(settings.POKEDEX_FILE)
+
     except Exception as e:
-        print(f"Error fetching Pokemon species {pokemon_id}: {e}")
-        return None
+        print(f"\n✗ Error during backup: {e}")
+        raise
+    finally:
+        await Tortoise.close_connections()
 
 
-def extract_english_description(species_data: dict) -> str | None:
-    """Extract the first English flavor text entry from species data."""
-    if not species_data or "flavor_text_entries" not in species_data:
-        return None
+async def export_snapshot(path: str) -> int:
+    """
+    Export every Pokemon in the database to a gzip-compressed JSONL snapshot.
 
-    for entry in species_data["flavor_text_entries"]:
-        if entry.get("language", {}).get("name") == "en":
-            # Clean up the text (remove newlines and form feeds)
-            text = entry.get("flavor_text", "")
-            text = text.replace("\n", " ").replace("\f", " ")
-            # Replace multiple spaces with single space
-            text = " ".join(text.split())
-            return text
+    The first line is a header describing the format; every following line
+    is one Pokemon record.
 
-    return None
+    Returns:
+        Number of Pokemon written
+    """
+    await init_db()
 
+    try:
+        written = await dump_snapshot(path)
+        print(f"\n✓ Exported {written} Pokemon to {path}")
+        return written
+    finally:
+        await Tortoise.close_connections()
 
-async def seed_pokemon():
-    """Fetch all Pokemon from PokeAPI and store in database."""
-    # Initialize database
-    await Tortoise.init(
-        db_url=settings.DATABASE_URL,
-        modules={"models": ["app.models.user", "app.models.pokemon"]},
-    )
-    await Tortoise.generate_schemas()
 
-    print("Starting Pokemon backup from PokeAPI...")
+async def import_snapshot(path: str) -> int:
+    """Restore the Pokedex from a snapshot file without any network access."""
+    await init_db()
 
     try:
-        async with httpx.AsyncClient() as client:
-            # First, get the list of all Pokemon
-            print("Fetching Pokemon list...")
-            response = await client.get(
-                "https://pokeapi.co/api/v2/pokemon",
-                params={"limit": 2000},  # Fetch all Pokemon
-                timeout=15.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            total_pokemon = len(data["results"])
-            print(f"Found {total_pokemon} Pokemon to backup")
-
-            # Fetch details for each Pokemon
-            for idx, pokemon_item in enumerate(data["results"], 1):
-                # Extract ID from URL
-                pokemon_id = int(pokemon_item["url"].split("/")[-2])
-
-                print(f"[{idx}/{total_pokemon}] Fetching details for {pokemon_item['name']}...")
-
-                # Fetch both pokemon details and species data
-                details = await fetch_pokemon_details(client, pokemon_id)
-                if not details:
-                    continue
-
-                species_data = await fetch_pokemon_species(client, pokemon_id)
-                description = extract_english_description(species_data) if species_data else None
-
-                # Extract and transform data
-                types = [t["type"]["name"] for t in details["types"]]
-                abilities = [a["ability"]["name"] for a in details["abilities"]]
-                stats = [
-                    {
-                        "name": s["stat"]["name"],
-                        "base_stat": s["base_stat"]
-                    }
-                    for s in details["stats"]
-                ]
-
-                sprite_front = details["sprites"].get("front_default")
-                sprite_artwork = (
-                    details["sprites"]
-                    .get("other", {})
-                    .get("official-artwork", {})
-                    .get("front_default")
-                )
-
-                # Check if Pokemon exists
-                exists = await Pokemon.filter(id=details["id"]).exists()
-
-                if exists:
-                    # Update existing Pokemon using queryset update
-                    await Pokemon.filter(id=details["id"]).update(
-                        name=details["name"],
-                        height=details["height"],
-                        weight=details["weight"],
-                        description=description,
-                        sprite_front_default=sprite_front,
-                        sprite_official_artwork=sprite_artwork,
-                        types=types,
-                        abilities=abilities,
-                        stats=stats,
-                    )
-                    print(f"[{idx}/{total_pokemon}] ✓ Updated {pokemon_item['name']}")
-                else:
-                    # Create new Pokemon
-                    await Pokemon.create(
-                        id=details["id"],
-                        name=details["name"],
-                        height=details["height"],
-                        weight=details["weight"],
-                        description=description,
-                        sprite_front_default=sprite_front,
-                        sprite_official_artwork=sprite_artwork,
-                        types=types,
-                        abilities=abilities,
-                        stats=stats,
-                    )
-                    print(f"[{idx}/{total_pokemon}] ✓ Created {pokemon_item['name']}")
-
-                # Add a small delay to avoid overwhelming the API
-                if idx % 10 == 0:
-                    await asyncio.sleep(0.5)
+        started = time.perf_counter()
+        loaded = await load_snapshot_records(read_snapshot_async(path))
+        elapsed = time.perf_counter() - started
+        print(f"\n✓ Imported {loaded} Pokemon from {path} in {elapsed:.2f}s")
+        if settings.POKEDEX_FILE:
+            await write_pack(settings.POKEDEX_FILE)
+        return loaded
+    finally:
+        await Tortoise.close_connections()
 
-        print(f"\n✓ Successfully backed up {total_pokemon} Pokemon to database!")
 
-    except Exception as e:
-        print(f"\n✗ Error during backup: {e}")
-        raise
+async def write_pack(path: str) -> int:
+    """
+    Write every Pokemon in the database to the packed Pokedex file.
+
+    Running servers keep the file they mapped; restart them to serve the
+    new one, or refresh through ``POST /admin/pokemon/refresh`` instead.
+    """
+    rows = await Pokemon.all().order_by("id").values(*SNAPSHOT_FIELDS)
+    written = write_packed_pokedex(path, rows)
+    print(f"✓ Packed {written} Pokemon into {path} ({os.path.getsize(path)} bytes)")
+    return written
+
+
+async def pack_pokedex(path: str) -> int:
+    """Rebuild the packed Pokedex file from the database."""
+    await init_db()
+
+    try:
+        return await write_pack(path)
     finally:
         await Tortoise.close_connections()
 
 
+def main():
+    """Entry point for the Pokemon seeding script."""
+    parser = argparse.ArgumentParser(description="Seed the Pokemon table")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--export",
+        metavar="PATH",
+        help="Export the Pokemon table to a compressed JSONL snapshot",
+    )
+    group.add_argument(
+        "--import",
+        dest="import_path",
+        metavar="PATH",
+        help="Load the Pokemon table from a compressed JSONL snapshot",
+    )
+    group.add_argument(
+        "--pack",
+        metavar="PATH",
+        help="Write the packed Pokedex file served by the API from the database",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=CACHE_DIR,
+        help=f"Directory for cached PokeAPI responses (default: {CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download from PokeAPI, ignoring the response cache",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    if args.export:
+        asyncio.run(export_snapshot(args.export))
+    elif args.import_path:
+        asyncio.run(import_snapshot(args.import_path))
+    elif args.pack:
+        asyncio.run(pack_pokedex(args.pack))
+    else:
+        asyncio.run(seed_pokemon(cache_dir=None if args.no_cache else args.cache_dir))
+
+
 if __name__ == "__main__":
-    asyncio.run(seed_pokemon())
+    main()
@@ -88,6 +88,135 @@ class TestAdminRoutes:
         data = response.json()
         assert len(data) == 1
 
+    async def test_get_all_users_headers_and_cursor(
+        self, async_client: AsyncClient, test_user: User, test_admin: User, admin_token: str
+    ):
+        """Test the total count header and cursor pagination."""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = await async_client.get("/admin/users?limit=1", headers=headers)
+
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == "2"
+        first_page = response.json()
+        cursor = response.headers["X-Next-Cursor"]
+
+        response = await async_client.get(
+            f"/admin/users?limit=1&cursor={cursor}", headers=headers
+        )
+        assert response.status_code == 200
+        second_page = response.json()
+        assert second_page[0]["id"] > first_page[0]["id"]
+        assert "X-Next-Cursor" not in response.headers
+
+    async def test_get_all_users_filters(
+        self, async_client: AsyncClient, test_user: User, test_admin: User, admin_token: str
+    ):
+        """Test filtering users by role and username prefix."""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = await async_client.get("/admin/users?is_admin=true", headers=headers)
+        assert [user["username"] for user in response.json()] == [test_admin.username]
+
+        response = await async_client.get("/admin/users?search=test", headers=headers)
+        assert [user["username"] for user in response.json()] == [test_user.username]
+
+    async def test_get_all_users_invalid_cursor(
+        self, async_client: AsyncClient, admin_token: str
+    ):
+        """Test an invalid cursor is rejected."""
+        response = await async_client.get(
+            "/admin/users?cursor=not-a-cursor",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == 400
+
+    async def test_bulk_deactivate_users_by_ids(
+        self,
+        async_client: AsyncClient,
+        test_user: User,
+        inactive_user: User,
+        admin_token: str,
+        user_token: str,
+    ):
+        """Test deactivating users by id revokes their tokens."""
+        response = await async_client.patch(
+            "/admin/users",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"ids": [test_user.id, inactive_user.id], "is_active": False},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"matched": 2, "updated": 1, "deleted": 0}
+
+        await test_user.refresh_from_db()
+        assert test_user.is_active is False
+        assert test_user.token_version == 1
+
+        response = await async_client.get(
+            "/auth/me", headers={"Authorization": f"Bearer {user_token}"}
+        )
+        assert response.status_code == 401
+
+    async def test_bulk_delete_all_users_spares_caller(
+        self,
+        async_client: AsyncClient,
+        test_user: User,
+        test_admin: User,
+        inactive_user: User,
+        admin_token: str,
+    ):
+        """Test deleting every user, never touching the calling admin."""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = await async_client.patch(
+            "/admin/users", headers=headers, json={"filter": {}, "delete": True}
+        )
+        assert response.status_code == 422
+        assert await User.all().count() == 3
+
+        response = await async_client.patch(
+            "/admin/users", headers=headers, json={"all": True, "delete": True}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"matched": 2, "updated": 0, "deleted": 2}
+        assert await User.all().values_list("id", flat=True) == [test_admin.id]
+
+    async def test_bulk_update_users_invalid_body(
+        self, async_client: AsyncClient, test_user: User, admin_token: str
+    ):
+        """Test a bulk change needs one target and one action."""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = await async_client.patch(
+            "/admin/users", headers=headers, json={"ids": [test_user.id]}
+        )
+        assert response.status_code == 422
+
+        response = await async_client.patch(
+            "/admin/users",
+            headers=headers,
+            json={"ids": [test_user.id], "filter": {}, "is_admin": True},
+        )
+        assert response.status_code == 422
+
+        response = await async_client.patch(
+            "/admin/users",
+            headers=headers,
+            json={"ids": [test_user.id], "all": True, "is_admin": True},
+        )
+        assert response.status_code == 422
+
+    async def test_bulk_update_users_as_non_admin(
+        self, async_client: AsyncClient, test_user: User, user_token: str
+    ):
+        """Test bulk changes as non-admin (should fail)."""
+        response = await async_client.patch(
+            "/admin/users",
+            headers={"Authorization": f"Bearer {user_token}"},
+            json={"ids": [test_user.id], "is_admin": True},
+        )
+
+        assert response.status_code == 403
+
     async def test_get_all_users_as_non_admin(
         self, async_client: AsyncClient, user_token: str
     ):
@@ -249,3 +378,159 @@ class TestAdminRoutes:
 
         assert response.status_code == 400
         assert "Username already registered" in response.json()["detail"]
+
+    async def test_get_metrics_as_admin(self, async_client: AsyncClient, admin_token: str):
+        """Test getting runtime metrics as admin."""
+        response = await async_client.get(
+            "/admin/metrics",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == 200
+        hashing = response.json()["password_hashing"]
+        assert hashing["max_workers"] >= 1
+        assert "queued" in hashing
+        assert "rejected" in hashing
+
+    async def test_get_metrics_as_non_admin(self, async_client: AsyncClient, user_token: str):
+        """Test getting runtime metrics as non-admin (should fail)."""
+        response = await async_client.get(
+            "/admin/metrics",
+            headers={"Authorization": f"Bearer {user_token}"},
+        )
+
+        assert response.status_code == 403
+
+    async def test_bulk_create_users_csv(
+        self, async_client: AsyncClient, test_user: User, admin_token: str
+    ):
+        """Test importing users from CSV with a per-row report."""
+        body = (
+            "username,email,password,is_admin\n"
+            "alice,alice@example.com,password1,true\n"
+            "bob,bob@example.com,password2,\n"
+            "testuser,other@example.com,password3,false\n"
+            "carol,not-an-email,password4,false\n"
+            "alice,alice2@example.com,password5,false\n"
+        )
+        response = await async_client.post(
+            "/admin/users/bulk",
+            headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "text/csv"},
+            content=body,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 5
+        assert data["created"] == 2
+        assert data["failed"] == 3
+
+        results = {result["row"]: result for result in data["results"]}
+        assert results[1]["status"] == "created"
+        assert results[2]["status"] == "created"
+        assert results[3]["errors"] == ["Username already registered"]
+        assert results[4]["errors"][0].startswith("email")
+        assert results[5]["errors"] == ["Duplicate username in import"]
+
+        alice = await User.get(id=results[1]["id"])
+        assert alice.is_admin is True
+        bob = await User.get(username="bob")
+        assert bob.is_admin is False
+
+    async def test_bulk_create_users_csv_multiline_field(
+        self, async_client: AsyncClient, admin_token: str
+    ):
+        """Test a quoted CSV field may contain a line break."""
+        body = (
+            "username,email,password\r\n"
+            'erin,erin@example.com,"first line\r\nsecond, line"\r\n'
+            "frank,frank@example.com,password1\r\n"
+        )
+        response = await async_client.post(
+            "/admin/users/bulk",
+            headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "text/csv"},
+            content=body,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["created"] == 2
+        login = await async_client.post(
+            "/auth/login/json", json={"username": "erin", "password": "first line\nsecond, line"}
+        )
+        assert login.status_code == 200
+
+    async def test_bulk_create_users_invalid_utf8(
+        self, async_client: AsyncClient, admin_token: str
+    ):
+        """Test rows that are not UTF-8 are reported per row, not as a server error."""
+        body = (
+            b"username,email,password\n"
+            b"grace,grace@example.com,pass\xffword\n"
+            b"heidi,heidi@example.com,password1\n"
+        )
+        response = await async_client.post(
+            "/admin/users/bulk",
+            headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "text/csv"},
+            content=body,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 1
+        assert data["results"][0]["errors"] == ["Malformed row"]
+
+        response = await async_client.post(
+            "/admin/users/bulk",
+            headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "text/csv"},
+            content=b"user\xffname,email,password\n",
+        )
+        assert response.status_code == 400
+
+    async def test_bulk_create_users_ndjson(self, async_client: AsyncClient, admin_token: str):
+        """Test importing users from NDJSON, including a malformed line."""
+        body = (
+            '{"username": "dave", "email": "dave@example.com", "password": "password1"}\n'
+            "not json\n"
+        )
+        response = await async_client.post(
+            "/admin/users/bulk",
+            headers={
+                "Authorization": f"Bearer {admin_token}",
+                "Content-Type": "application/x-ndjson",
+            },
+            content=body,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 1
+        assert data["results"][1]["errors"] == ["Malformed row"]
+
+        login = await async_client.post(
+            "/auth/login/json", json={"username": "dave", "password": "password1"}
+        )
+        assert login.status_code == 200
+
+    async def test_bulk_create_users_unsupported_type(
+        self, async_client: AsyncClient, admin_token: str
+    ):
+        """Test unsupported import formats are rejected."""
+        response = await async_client.post(
+            "/admin/users/bulk",
+            headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "text/plain"},
+            content="alice",
+        )
+
+        assert response.status_code == 415
+
+    async def test_bulk_create_users_as_non_admin(
+        self, async_client: AsyncClient, user_token: str
+    ):
+        """Test bulk import as non-admin (should fail)."""
+        response = await async_client.post(
+            "/admin/users/bulk",
+            headers={"Authorization": f"Bearer {user_token}"},
+            json=[],
+        )
+
+        assert response.status_code == 403
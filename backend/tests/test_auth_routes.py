@@ -2,7 +2,9 @@
 import pytest
 from httpx import AsyncClient
 
+from app.core.hashing import hashing_pool
 from app.models.user import User
+from app.services.auth_service import login_throttle
 
 
 @pytest.mark.integration
@@ -104,3 +106,66 @@ class TestAuthRoutes:
         )
 
         assert response.status_code == 401
+
+    async def test_login_when_hashing_pool_saturated(
+        self, async_client: AsyncClient, test_user: User, monkeypatch
+    ):
+        """Test login is shed with 503 when the hashing pool is full."""
+        monkeypatch.setattr(hashing_pool, "max_workers", 0)
+        monkeypatch.setattr(hashing_pool, "max_queue", 0)
+
+        response = await async_client.post(
+            "/auth/login/json",
+            json={"username": "testuser", "password": "testpass123"},
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    async def test_login_throttled_per_username(
+        self, async_client: AsyncClient, test_user: User, monkeypatch
+    ):
+        """Test repeated logins for one username get 429 with Retry-After."""
+        monkeypatch.setattr(login_throttle.username_limiter, "capacity", 2)
+
+        for _ in range(2):
+            response = await async_client.post(
+                "/auth/login/json",
+                json={"username": "testuser", "password": "wrongpassword"},
+            )
+            assert response.status_code == 401
+
+        response = await async_client.post(
+            "/auth/login",
+            data={"username": "testuser", "password": "testpass123"},
+        )
+
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert login_throttle.stats()["limited_by_username"] == 1
+
+    async def test_refresh_flow(self, async_client: AsyncClient, test_user: User):
+        """Test refreshing a session and logging out."""
+        login = await async_client.post(
+            "/auth/login/json",
+            json={"username": "testuser", "password": "testpass123"},
+        )
+        refresh_token = login.json()["refresh_token"]
+
+        response = await async_client.post(
+            "/auth/refresh", json={"refresh_token": refresh_token}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["access_token"]
+        assert data["refresh_token"] != refresh_token
+
+        response = await async_client.post(
+            "/auth/logout", json={"refresh_token": data["refresh_token"]}
+        )
+        assert response.status_code == 204
+
+        response = await async_client.post(
+            "/auth/refresh", json={"refresh_token": data["refresh_token"]}
+        )
+        assert response.status_code == 401
@@ -1,9 +1,13 @@
 """Tests for authentication service."""
+import bcrypt
 import pytest
 from fastapi import HTTPException
 
+from app.core.security import build_pwd_context, pwd_context, verify_password
 from app.models.user import User
-from app.services.auth_service import AuthService
+from app.schemas.user import UserUpdate
+from app.services.auth_service import AuthService, principal_cache
+from app.services.user_service import UserService
 
 
 @pytest.mark.unit
@@ -84,3 +88,70 @@ class TestAuthService:
             await AuthService.get_current_admin_user(user_token)
         assert exc.value.status_code == 403
         assert "Not enough permissions" in str(exc.value.detail)
+
+    async def test_get_current_user_is_cached(self, test_user: User, user_token: str):
+        """Test repeat lookups for the same token skip the database."""
+        await AuthService.get_current_user(user_token)
+        # Bypass the service so the cache is not invalidated
+        await User.filter(id=test_user.id).update(email="changed@example.com")
+
+        user = await AuthService.get_current_user(user_token)
+        assert user.email == "test@example.com"
+        assert principal_cache.stats()["hits"] >= 1
+
+    async def test_update_user_invalidates_cached_principal(
+        self, test_user: User, user_token: str
+    ):
+        """Test updating a user drops its cached sessions."""
+        await AuthService.get_current_user(user_token)
+        await UserService.update_user(test_user.id, UserUpdate(is_active=False))
+
+        with pytest.raises(HTTPException) as exc:
+            await AuthService.get_current_active_user(user_token)
+        assert exc.value.status_code == 401
+
+    async def test_delete_user_invalidates_cached_principal(
+        self, test_user: User, user_token: str
+    ):
+        """Test deleting a user drops its cached sessions."""
+        await AuthService.get_current_user(user_token)
+        await UserService.delete_user(test_user.id)
+
+        with pytest.raises(HTTPException) as exc:
+            await AuthService.get_current_user(user_token)
+        assert exc.value.status_code == 401
+
+    async def test_authenticate_rehashes_outdated_argon2(self, test_user: User):
+        """Test hashes made with other argon2 parameters are upgraded on login."""
+        weak_context = build_pwd_context(time_cost=1, memory_cost=8192, parallelism=1)
+        test_user.hashed_password = weak_context.hash("testpass123")
+        await test_user.save()
+
+        user = await AuthService.authenticate_user("testuser", "testpass123")
+        assert user is not None
+
+        stored = await User.get(id=test_user.id)
+        assert "m=8192" not in stored.hashed_password
+        assert not pwd_context.needs_update(stored.hashed_password)
+        assert verify_password("testpass123", stored.hashed_password)
+
+    async def test_authenticate_rehashes_legacy_bcrypt(self, test_user: User):
+        """Test legacy bcrypt hashes are verified and upgraded to argon2."""
+        test_user.hashed_password = bcrypt.hashpw(b"testpass123", bcrypt.gensalt(4)).decode()
+        await test_user.save()
+
+        user = await AuthService.authenticate_user("testuser", "testpass123")
+        assert user is not None
+
+        stored = await User.get(id=test_user.id)
+        assert stored.hashed_password.startswith("$argon2")
+
+    async def test_authenticate_wrong_password_keeps_legacy_hash(self, test_user: User):
+        """Test a failed login never rewrites the stored hash."""
+        legacy_hash = bcrypt.hashpw(b"testpass123", bcrypt.gensalt(4)).decode()
+        test_user.hashed_password = legacy_hash
+        await test_user.save()
+
+        assert await AuthService.authenticate_user("testuser", "wrong") is None
+        stored = await User.get(id=test_user.id)
+        assert stored.hashed_password == legacy_hash
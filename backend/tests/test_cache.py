@@ -0,0 +1,63 @@
+"""Tests for the in-process TTL cache."""
+import time
+
+import pytest
+
+from app.core.cache import TTLCache
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    """Test TTL cache."""
+
+    def test_get_and_set(self):
+        """Test storing and reading an entry."""
+        cache = TTLCache(ttl_seconds=60, max_size=10)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_entry_expires(self, monkeypatch):
+        """Test entries are dropped once their TTL has passed."""
+        cache = TTLCache(ttl_seconds=60, max_size=10)
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        cache.set("a", 1, ttl_seconds=5)
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = TTLCache(ttl_seconds=60, max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_tag(self):
+        """Test dropping every entry stored under a tag."""
+        cache = TTLCache(ttl_seconds=60, max_size=10)
+        cache.set("token-1", "alice", tag=1)
+        cache.set("token-2", "alice", tag=1)
+        cache.set("token-3", "bob", tag=2)
+
+        assert cache.invalidate_tag(1) == 2
+        assert cache.get("token-1") is None
+        assert cache.get("token-2") is None
+        assert cache.get("token-3") == "bob"
+
+    def test_disabled_with_zero_ttl(self):
+        """Test a zero TTL disables caching."""
+        cache = TTLCache(ttl_seconds=0, max_size=10)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
@@ -0,0 +1,95 @@
+"""Tests for the password hashing pool."""
+import asyncio
+import threading
+
+import pytest
+
+from app.core.hashing import HashingPool, HashingPoolSaturatedError
+from app.core.security import (
+    get_password_hash_async,
+    verify_password,
+    verify_password_async,
+)
+
+
+@pytest.mark.unit
+class TestHashingPool:
+    """Test password hashing pool."""
+
+    async def test_run_returns_result(self):
+        """Test running a function in the pool."""
+        pool = HashingPool(max_workers=2, max_queue=2)
+        try:
+            assert await pool.run(pow, 2, 10) == 1024
+            stats = pool.stats()
+            assert stats["submitted"] == 1
+            assert stats["completed"] == 1
+            assert stats["queued"] == 0
+        finally:
+            pool.shutdown()
+
+    async def test_run_off_event_loop_thread(self):
+        """Test that work does not run on the event loop thread."""
+        pool = HashingPool(max_workers=1, max_queue=0)
+        try:
+            worker_thread = await pool.run(threading.get_ident)
+            assert worker_thread != threading.get_ident()
+        finally:
+            pool.shutdown()
+
+    async def test_rejects_when_saturated(self):
+        """Test that work beyond workers plus queue is rejected."""
+        pool = HashingPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+        try:
+            running = [
+                asyncio.create_task(pool.run(release.wait)) for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+
+            assert pool.queue_depth == 1
+            with pytest.raises(HashingPoolSaturatedError):
+                await pool.run(release.wait)
+
+            release.set()
+            await asyncio.gather(*running)
+            stats = pool.stats()
+            assert stats["rejected"] == 1
+            assert stats["completed"] == 2
+            assert stats["peak_in_flight"] == 2
+        finally:
+            release.set()
+            pool.shutdown()
+
+    async def test_cancelled_caller_keeps_slot_until_done(self):
+        """Test a hash whose caller gave up still counts until its thread finishes."""
+        pool = HashingPool(max_workers=1, max_queue=0)
+        release = threading.Event()
+        try:
+            waiting = asyncio.create_task(pool.run(release.wait))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+
+            assert pool.in_flight == 1
+            with pytest.raises(HashingPoolSaturatedError):
+                await pool.run(pow, 2, 10)
+
+            release.set()
+            for _ in range(100):
+                if not pool.in_flight:
+                    break
+                await asyncio.sleep(0.01)
+            assert pool.in_flight == 0
+            assert await pool.run(pow, 2, 10) == 1024
+        finally:
+            release.set()
+            pool.shutdown()
+
+    async def test_async_password_helpers(self):
+        """Test hashing and verifying through the shared pool."""
+        hashed = await get_password_hash_async("secret123")
+        assert verify_password("secret123", hashed)
+        assert await verify_password_async("secret123", hashed) is True
+        assert await verify_password_async("wrong", hashed) is False
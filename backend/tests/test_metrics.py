@@ -0,0 +1,81 @@
+"""Tests for Prometheus metrics."""
+import json
+import os
+import time
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.metrics import MetricsRegistry, render_families
+from app.models.user import User
+
+
+@pytest.mark.unit
+class TestMetricsRegistry:
+    """Test in-process metrics and their exposition."""
+
+    def test_counter_and_histogram_rendering(self):
+        """Test the Prometheus text format of counters and histograms."""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("route",))
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        requests.inc("/pokemon/")
+        requests.inc("/pokemon/")
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5)
+
+        text = render_families(registry.collect())
+
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{route="/pokemon/"} 2.0' in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1.0"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "latency_seconds_sum 5.55" in text
+        assert "latency_seconds_count 3" in text
+
+    def test_multiprocess_aggregation(self, tmp_path):
+        """Test worker snapshots are summed and stale gauges dropped."""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests")
+        requests.inc(amount=3)
+        registry.write_snapshot(str(tmp_path))
+
+        # Snapshot of a worker that stopped a while ago
+        dead_worker = {
+            "written_at": time.time() - 3600,
+            "families": [
+                {"name": "requests_total", "type": "counter", "help": "Requests",
+                 "labelnames": [], "samples": [[[], 4.0]]},
+                {"name": "queue_depth", "type": "gauge", "help": "Queue",
+                 "labelnames": [], "samples": [[[], 7]]},
+            ],
+        }
+        with open(os.path.join(tmp_path, "metrics-1.json"), "w") as f:
+            json.dump(dead_worker, f)
+
+        families = {f["name"]: f for f in registry.aggregate(str(tmp_path), stale_seconds=60)}
+
+        assert families["requests_total"]["samples"] == [[[], 7.0]]
+        assert "queue_depth" not in families
+
+
+class TestMetricsEndpoint:
+    """Test the /metrics endpoint."""
+
+    async def test_metrics_by_route_template(
+        self, async_client: AsyncClient, test_user: User, user_token: str
+    ):
+        """Test requests are recorded under their route template."""
+        await async_client.get("/auth/me", headers={"Authorization": f"Bearer {user_token}"})
+        response = await async_client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert 'http_requests_total{method="GET",route="/auth/me",status="200"}' in text
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/auth/me",le="+Inf"}' in text
+        assert "db_query_duration_seconds_count" in text
+        assert 'cache_requests_total{cache="principal",result="miss"}' in text
+        assert "password_hash_queue_depth 0" in text
@@ -0,0 +1,111 @@
+"""Tests for the packed Pokedex file."""
+import pytest
+
+from app.core.packed_pokedex import PackedPokedex, write_packed_pokedex
+
+RECORDS = [
+    {
+        "id": 25,
+        "name": "pikachu",
+        "height": 4,
+        "weight": 60,
+        "description": "When several of these Pokémon gather...",
+        "sprite_front_default": "https://example.com/25.png",
+        "sprite_official_artwork": None,
+        "types": ["electric"],
+        "abilities": ["static", "lightning-rod"],
+        "stats": [{"name": "hp", "base_stat": 35}, {"name": "speed", "base_stat": 90}],
+    },
+    {
+        "id": 1,
+        "name": "bulbasaur",
+        "height": 7,
+        "weight": 69,
+        "description": None,
+        "sprite_front_default": None,
+        "sprite_official_artwork": None,
+        "types": ["grass", "poison"],
+        "abilities": [],
+        "stats": [],
+    },
+    {
+        "id": 10001,
+        "name": "deoxys-attack",
+        "height": 17,
+        "weight": 608,
+        "description": None,
+        "sprite_front_default": None,
+        "sprite_official_artwork": None,
+        "types": ["psychic"],
+        "abilities": ["pressure"],
+        "stats": [{"name": "attack", "base_stat": 180}],
+    },
+]
+
+
+@pytest.fixture
+def packed(tmp_path):
+    """A packed file of the sample records, opened."""
+    path = str(tmp_path / "pokedex.bin")
+    assert write_packed_pokedex(path, RECORDS) == len(RECORDS)
+    packed = PackedPokedex(path)
+    yield packed
+    packed.close()
+
+
+@pytest.mark.unit
+class TestPackedPokedex:
+    """Test writing and reading packed Pokedex files."""
+
+    def test_round_trip(self, packed):
+        """Test every field, missing values and empty lists survive packing."""
+        assert len(packed) == 3
+        for record in RECORDS:
+            assert packed.record(packed.find_id(record["id"]))._asdict() == record
+
+    def test_lookups(self, packed):
+        """Test id and name lookups, including misses."""
+        assert packed.record(packed.find_id(25)).name == "pikachu"
+        assert packed.record(packed.find_name("Bulbasaur")).id == 1
+        assert packed.find_id(2) is None
+        assert packed.find_id(99999) is None
+        assert packed.find_name("bulba") is None
+        assert packed.find_name("zubat") is None
+
+    def test_find_mixed_case_names(self, tmp_path):
+        """Test names whose case changes their order are still found."""
+        path = str(tmp_path / "mixed.bin")
+        names = ["Zubat", "abra", "Mew", "eevee", "Bulbasaur"]
+        write_packed_pokedex(
+            path, [{**RECORDS[1], "id": index + 1, "name": name} for index, name in enumerate(names)]
+        )
+        packed = PackedPokedex(path)
+        try:
+            for index, name in enumerate(names):
+                assert packed.find_name(name) == packed.find_id(index + 1)
+        finally:
+            packed.close()
+
+    def test_search(self, packed):
+        """Test substring search, ordering and paging."""
+        def names(result):
+            total, indices = result
+            return total, [packed.record(index).name for index in indices]
+
+        assert names(packed.search(None, 0, 10, "id")) == (
+            3, ["bulbasaur", "pikachu", "deoxys-attack"]
+        )
+        assert names(packed.search(None, 1, 1, "name")) == (3, ["deoxys-attack"])
+        assert names(packed.search("A", 0, 10, "name")) == (
+            3, ["bulbasaur", "deoxys-attack", "pikachu"]
+        )
+        # "s" occurs twice in bulbasaur and deoxys-attack; each counts once
+        assert names(packed.search("s", 0, 10, "id")) == (2, ["bulbasaur", "deoxys-attack"])
+        assert names(packed.search("u\nb", 0, 10, "id")) == (0, [])
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test files that are not packed Pokedexes are refused."""
+        path = tmp_path / "pokedex.bin"
+        path.write_bytes(b"\0" * 128)
+        with pytest.raises(ValueError):
+            PackedPokedex(str(path))
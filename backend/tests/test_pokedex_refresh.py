@@ -0,0 +1,166 @@
+"""Tests for the background Pokedex refresh."""
+import gzip
+import json
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.packed_pokedex import PackedPokedex
+from app.models.pokemon import Pokemon
+from app.services import pokemon_service
+from app.services.pokedex_refresh_service import pokedex_refresher, read_refresh_status
+from app.services.pokemon_service import pokedex
+from app.services.pokedex_seed import snapshot_header, snapshot_line
+
+
+def record(pokemon_id: int, name: str) -> dict:
+    return {
+        "id": pokemon_id,
+        "name": name,
+        "height": pokemon_id,
+        "weight": pokemon_id * 10,
+        "description": None,
+        "sprite_front_default": None,
+        "sprite_official_artwork": None,
+        "types": ["normal"],
+        "abilities": [],
+        "stats": [],
+    }
+
+
+def write_snapshot(path, records) -> None:
+    with gzip.open(path, "wt", encoding="utf-8") as snapshot:
+        snapshot.write(snapshot_header(len(records)))
+        for item in records:
+            snapshot.write(snapshot_line(item))
+
+
+@pytest.fixture
+async def refresh(tmp_path, monkeypatch):
+    """Refresh from a snapshot in a temporary directory, with an old Pokedex loaded."""
+    snapshot = tmp_path / "source.jsonl.gz"
+    write_snapshot(snapshot, [record(1, "bulbasaur"), record(2, "ivysaur")])
+    monkeypatch.setattr(settings, "POKEDEX_REFRESH_SNAPSHOT", str(snapshot))
+    monkeypatch.setattr(
+        settings, "POKEDEX_REFRESH_STATUS_FILE", str(tmp_path / "pokedex-refresh.json")
+    )
+    await Pokemon.create(**record(1, "old-bulbasaur"))
+    await Pokemon.create(**record(99, "removed"))
+    await pokedex_refresher.load()
+    yield snapshot
+    await pokedex_refresher.cancel()
+
+
+@pytest.mark.unit
+class TestPokedexRefresh:
+    """Test staging, swapping and reloading the Pokedex."""
+
+    async def test_refresh_replaces_dataset(self, refresh):
+        assert pokedex_refresher.start()["state"] == "running"
+        await pokedex_refresher.wait()
+
+        status = pokedex_refresher.status()
+        assert status["state"] == "succeeded"
+        assert status["count"] == 2
+        assert status["generation"] == 1
+        assert await Pokemon.all().order_by("id").values_list("name", flat=True) == [
+            "bulbasaur",
+            "ivysaur",
+        ]
+        assert pokedex.details("1").name == "bulbasaur"
+        assert pokedex.details("99") is None
+        assert pokedex.generation == 1
+
+    async def test_reload_reads_the_primary(self, refresh, monkeypatch):
+        """Test the Pokedex is reloaded from the primary, never a lagging replica."""
+
+        def replica():
+            raise AssertionError("Reloaded from a replica")
+
+        monkeypatch.setattr(pokemon_service, "read_connection", replica)
+
+        pokedex_refresher.start()
+        await pokedex_refresher.wait()
+
+        assert pokedex_refresher.status()["state"] == "succeeded"
+        assert pokedex.details("2").name == "ivysaur"
+
+    async def test_refresh_writes_packed_file(self, refresh, tmp_path, monkeypatch):
+        path = str(tmp_path / "pokedex.bin")
+        monkeypatch.setattr(settings, "POKEDEX_FILE", path)
+
+        pokedex_refresher.start()
+        await pokedex_refresher.wait()
+
+        packed = PackedPokedex(path)
+        try:
+            assert packed.record(packed.find_name("ivysaur")).id == 2
+        finally:
+            packed.close()
+        assert pokedex.details("ivysaur").id == 2
+
+    async def test_only_one_refresh_at_a_time(self, refresh):
+        pokedex_refresher.start()
+        with pytest.raises(HTTPException) as exc_info:
+            pokedex_refresher.start()
+        assert exc_info.value.status_code == 409
+        await pokedex_refresher.wait()
+
+    async def test_failed_refresh_keeps_dataset(self, refresh):
+        write_snapshot(refresh, [])
+
+        pokedex_refresher.start()
+        await pokedex_refresher.wait()
+
+        status = pokedex_refresher.status()
+        assert status["state"] == "failed"
+        assert "no Pokemon" in status["error"]
+        assert status["generation"] == 0
+        assert await Pokemon.all().count() == 2
+        assert pokedex.details("99").name == "removed"
+
+    async def test_interrupted_refresh_is_reported(self, refresh):
+        with open(settings.POKEDEX_REFRESH_STATUS_FILE, "w") as status_file:
+            json.dump({"state": "running", "generation": 3}, status_file)
+
+        status = pokedex_refresher.status()
+
+        assert status["state"] == "failed"
+        assert status["error"] == "Refresh was interrupted"
+
+    async def test_sync_reloads_after_refresh_elsewhere(self, refresh):
+        assert not await pokedex_refresher.sync()
+
+        # Another worker swapped the table and bumped the generation
+        await Pokemon.filter(id=99).delete()
+        with open(settings.POKEDEX_REFRESH_STATUS_FILE, "w") as status_file:
+            json.dump({"state": "succeeded", "generation": 1}, status_file)
+
+        assert await pokedex_refresher.sync()
+        assert pokedex.details("99") is None
+        assert pokedex.generation == read_refresh_status()["generation"]
+
+
+@pytest.mark.integration
+class TestPokedexRefreshRoutes:
+    """Test the admin refresh endpoints."""
+
+    async def test_start_and_follow(self, async_client: AsyncClient, admin_token: str, refresh):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        response = await async_client.post("/admin/pokemon/refresh", headers=headers)
+        assert response.status_code == 202
+        assert response.json()["source"] == "snapshot"
+        await pokedex_refresher.wait()
+
+        response = await async_client.get("/admin/pokemon/refresh", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["state"] == "succeeded"
+
+    async def test_requires_admin(self, async_client: AsyncClient, user_token: str):
+        response = await async_client.post(
+            "/admin/pokemon/refresh", headers={"Authorization": f"Bearer {user_token}"}
+        )
+        assert response.status_code == 403
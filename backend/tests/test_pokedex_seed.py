@@ -0,0 +1,209 @@
+"""Tests for the Pokedex seed pipeline: response cache and snapshot format."""
+import gzip
+import json
+
+import httpx
+import pytest
+
+from app.models.pokemon import Pokemon
+from app.services.pokedex_seed import (
+    SNAPSHOT_FIELDS,
+    SNAPSHOT_FORMAT,
+    ResponseCache,
+    dump_snapshot,
+    fetch_json,
+    load_snapshot_records,
+    read_snapshot_async,
+    snapshot_header,
+    snapshot_line,
+)
+
+
+URL = "https://pokeapi.co/api/v2/pokemon/1"
+
+
+class PokeAPI:
+    """Mock PokeAPI answering with the given responses in turn, recording requests."""
+
+    def __init__(self, *responses: httpx.Response):
+        self.responses = list(responses)
+        self.requests: list = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self.responses.pop(0)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+def record(pokemon_id: int, name: str) -> dict:
+    return {
+        "id": pokemon_id,
+        "name": name,
+        "height": pokemon_id,
+        "weight": pokemon_id * 10,
+        "description": f"The {name} Pokemon",
+        "sprite_front_default": None,
+        "sprite_official_artwork": None,
+        "types": ["grass", "poison"],
+        "abilities": [{"name": "overgrow", "is_hidden": False}],
+        "stats": [{"name": "hp", "base_stat": 45}],
+    }
+
+
+async def load(path, replace: bool = False) -> int:
+    return await load_snapshot_records(read_snapshot_async(path, batch_size=2), replace=replace)
+
+
+async def stored_rows() -> list:
+    return await Pokemon.all().order_by("id").values(*SNAPSHOT_FIELDS)
+
+
+@pytest.fixture
+async def pokemon():
+    for pokemon_id, name in ((1, "bulbasaur"), (2, "ivysaur"), (3, "venusaur")):
+        await Pokemon.create(**record(pokemon_id, name))
+    return await stored_rows()
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Test cases for conditional requests through the response cache."""
+
+    async def test_fresh_entry_sends_no_request(self, tmp_path):
+        """Test an entry within its max-age is served without contacting the server."""
+        api = PokeAPI(
+            httpx.Response(
+                200, json={"name": "bulbasaur"}, headers={"Cache-Control": "max-age=600"}
+            )
+        )
+        cache = ResponseCache(str(tmp_path))
+
+        async with api.client() as client:
+            first = await fetch_json(client, URL, cache)
+            second = await fetch_json(client, URL, cache)
+
+        assert first == second == {"name": "bulbasaur"}
+        assert len(api.requests) == 1
+        assert (cache.downloaded, cache.hits) == (1, 1)
+
+    async def test_stale_entry_revalidated(self, tmp_path):
+        """Test a stale entry sends its validators and keeps its body on a 304."""
+        api = PokeAPI(
+            httpx.Response(
+                200,
+                json={"name": "bulbasaur"},
+                headers={
+                    "ETag": '"v1"',
+                    "Last-Modified": "Mon, 19 Oct 2026 08:00:00 GMT",
+                    "Cache-Control": "no-cache",
+                },
+            ),
+            httpx.Response(304, headers={"Cache-Control": "max-age=600"}),
+        )
+        cache = ResponseCache(str(tmp_path))
+
+        async with api.client() as client:
+            await fetch_json(client, URL, cache)
+            body = await fetch_json(client, URL, cache)
+            # Fresh again after the 304
+            await fetch_json(client, URL, cache)
+
+        assert body == {"name": "bulbasaur"}
+        revalidation = api.requests[1]
+        assert revalidation.headers["If-None-Match"] == '"v1"'
+        assert revalidation.headers["If-Modified-Since"] == "Mon, 19 Oct 2026 08:00:00 GMT"
+        assert len(api.requests) == 2
+        assert (cache.downloaded, cache.revalidated, cache.hits) == (1, 1, 1)
+        assert cache.get(URL)["etag"] == '"v1"'
+
+    async def test_changed_resource_replaces_entry(self, tmp_path):
+        """Test a 200 to a conditional request replaces the cached body and validators."""
+        api = PokeAPI(
+            httpx.Response(
+                200,
+                json={"name": "bulbasaur"},
+                headers={"ETag": '"v1"', "Cache-Control": "no-cache"},
+            ),
+            httpx.Response(
+                200,
+                json={"name": "bulbasaur-2"},
+                headers={"ETag": '"v2"', "Cache-Control": "max-age=600"},
+            ),
+        )
+        cache = ResponseCache(str(tmp_path))
+
+        async with api.client() as client:
+            await fetch_json(client, URL, cache)
+            body = await fetch_json(client, URL, cache)
+
+        assert body == {"name": "bulbasaur-2"}
+        assert api.requests[1].headers["If-None-Match"] == '"v1"'
+        entry = ResponseCache(str(tmp_path)).get(URL)
+        assert entry["body"] == {"name": "bulbasaur-2"}
+        assert (entry["etag"], entry["max_age"]) == ('"v2"', 600)
+        assert cache.downloaded == 2
+
+
+class TestSnapshotRoundTrip:
+    """Test cases for exporting a snapshot and loading it back."""
+
+    async def test_export_and_load(self, tmp_path, pokemon):
+        """Test a snapshot restores exactly the exported rows."""
+        path = tmp_path / "pokedex.jsonl.gz"
+
+        assert await dump_snapshot(str(path), batch_size=2) == 3
+        with gzip.open(path, "rt", encoding="utf-8") as snapshot:
+            header = json.loads(snapshot.readline())
+        assert header == {"format": SNAPSHOT_FORMAT, "version": 1, "count": 3}
+
+        await Pokemon.all().delete()
+        assert await load(str(path)) == 3
+        assert await stored_rows() == pokemon
+
+    async def test_header_checked(self, tmp_path, pokemon):
+        """Test files that are not snapshots, or of another version, are refused."""
+        other = tmp_path / "other.jsonl.gz"
+        with gzip.open(other, "wt", encoding="utf-8") as snapshot:
+            snapshot.write(json.dumps({"format": "something-else"}) + "\n")
+            snapshot.write(snapshot_line(record(4, "charmander")))
+        with pytest.raises(ValueError, match="not a Pokedex snapshot"):
+            await load(str(other))
+
+        newer = tmp_path / "newer.jsonl.gz"
+        with gzip.open(newer, "wt", encoding="utf-8") as snapshot:
+            snapshot.write(json.dumps({"format": SNAPSHOT_FORMAT, "version": 2}) + "\n")
+        with pytest.raises(ValueError, match="Unsupported snapshot version 2"):
+            await load(str(newer))
+
+        assert await stored_rows() == pokemon
+
+    async def test_truncated_file_keeps_dataset(self, tmp_path, pokemon):
+        """Test a truncated file is reported and loads nothing, even when replacing."""
+        path = tmp_path / "pokedex.jsonl.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as snapshot:
+            snapshot.write(snapshot_header(None))
+            for pokemon_id in range(100, 400):
+                snapshot.write(snapshot_line(record(pokemon_id, f"pokemon-{pokemon_id}")))
+        data = path.read_bytes()
+        path.write_bytes(data[: len(data) // 2])
+
+        with pytest.raises(ValueError, match="corrupt or truncated"):
+            await load(str(path), replace=True)
+
+        assert await stored_rows() == pokemon
+
+    async def test_corrupt_line_keeps_dataset(self, tmp_path, pokemon):
+        """Test a line that is not JSON fails the load without touching the table."""
+        path = tmp_path / "pokedex.jsonl.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as snapshot:
+            snapshot.write(snapshot_header(3))
+            snapshot.write(snapshot_line(record(10, "caterpie")))
+            snapshot.write(snapshot_line(record(11, "metapod")))
+            snapshot.write('{"id": 12, "name": "butterf\n')
+
+        with pytest.raises(ValueError):
+            await load(str(path), replace=True)
+
+        assert await stored_rows() == pokemon
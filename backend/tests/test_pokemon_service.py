@@ -0,0 +1,128 @@
+"""Tests for the Pokemon service, routes and the in-memory Pokedex."""
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.packed_pokedex import write_packed_pokedex
+from app.models.pokemon import Pokemon
+from app.schemas.pokemon import PokemonDetails, PokemonListResponse
+from app.services.pokemon_service import PokemonService, pokedex
+
+NAMES = ["bulbasaur", "ivysaur", "venusaur", "charmander", "charmeleon", "charizard"]
+
+QUERIES = [
+    {},
+    {"offset": 2, "limit": 2},
+    {"query": "saur"},
+    {"query": "CHAR", "sort_by": "name", "limit": 2},
+    {"query": "4"},
+    {"query": "missingno"},
+]
+
+
+@pytest.fixture
+async def pokemon():
+    """Create a few Pokemon."""
+    await Pokemon.bulk_create(
+        [
+            Pokemon(
+                id=i,
+                name=name,
+                height=i,
+                weight=i * 10,
+                description=f"{name} description",
+                sprite_front_default=f"https://example.com/{i}.png",
+                sprite_official_artwork=f"https://example.com/art/{i}.png" if i % 2 else None,
+                types=["grass"] if i <= 3 else ["fire"],
+                abilities=["overgrow"] if i <= 3 else ["blaze"],
+                stats=[{"name": "hp", "base_stat": 40 + i}],
+            )
+            for i, name in enumerate(NAMES, start=1)
+        ]
+    )
+
+
+@pytest.fixture(params=["table", "packed"])
+async def backend(request, tmp_path, monkeypatch):
+    """Load the Pokedex from the table or from a packed file of it."""
+    if request.param == "packed":
+        path = str(tmp_path / "pokedex.bin")
+        write_packed_pokedex(path, await Pokemon.all().values())
+        monkeypatch.setattr(settings, "POKEDEX_FILE", path)
+    return request.param
+
+
+@pytest.mark.unit
+class TestPokedex:
+    """Test the in-memory Pokedex against the database queries."""
+
+    @pytest.mark.parametrize("params", QUERIES)
+    async def test_search_matches_database(self, pokemon, backend, params):
+        """Test searches answered from memory equal the database results."""
+        from_database = await PokemonService.search_pokemon(**params)
+        assert await pokedex.load() == len(NAMES)
+        from_memory = await PokemonService.search_pokemon(**params)
+
+        assert from_memory == from_database
+
+    async def test_details_match_database(self, pokemon, backend):
+        """Test details answered from memory equal the database results."""
+        from_database = [await PokemonService.get_pokemon_details(key) for key in ("1", "Charizard")]
+        await pokedex.load()
+        from_memory = [await PokemonService.get_pokemon_details(key) for key in ("1", "Charizard")]
+
+        assert from_memory == from_database
+        assert from_memory[1].sprite == "https://example.com/6.png"
+
+    async def test_unknown_pokemon(self, pokemon, backend):
+        """Test unknown Pokemon are 404 from memory too."""
+        await pokedex.load()
+        with pytest.raises(HTTPException) as exc:
+            await PokemonService.get_pokemon_details("missingno")
+        assert exc.value.status_code == 404
+
+    async def test_reads_skip_database_once_loaded(self, pokemon, backend):
+        """Test a loaded Pokedex answers without the table."""
+        await pokedex.load()
+        await Pokemon.all().delete()
+
+        page = await PokemonService.search_pokemon(query="char")
+        assert page.count == 3
+
+    async def test_empty_table_falls_back_to_database(self):
+        """Test an empty Pokedex does not count as loaded."""
+        assert await pokedex.load() == 0
+        assert not pokedex.loaded
+
+
+@pytest.mark.integration
+class TestPokemonRoutes:
+    """Test the Pokemon routes' serialized responses."""
+
+    async def test_details_response(self, async_client: AsyncClient, pokemon):
+        """Test details are serialized once and still match the schema."""
+        response = await async_client.get("/pokemon/charizard")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data == PokemonDetails.model_validate(data).model_dump(mode="json")
+        assert data["sprites"]["other"]["official_artwork"]["front_default"] is None
+        assert data["types"] == [{"type": {"name": "fire"}}]
+        assert data["stats"] == [{"base_stat": 46, "stat": {"name": "hp"}}]
+
+    async def test_list_response(self, async_client: AsyncClient, pokemon):
+        """Test list pages are serialized once and still match the schema."""
+        response = await async_client.get("/pokemon/?query=saur&limit=2")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data == PokemonListResponse.model_validate(data).model_dump(mode="json")
+        assert data["count"] == 3
+        assert data["next"] == "offset=2&limit=2"
+        assert [item["name"] for item in data["results"]] == ["bulbasaur", "ivysaur"]
+
+    async def test_not_found(self, async_client: AsyncClient):
+        """Test unknown Pokemon are 404."""
+        response = await async_client.get("/pokemon/missingno")
+        assert response.status_code == 404
@@ -0,0 +1,99 @@
+"""Tests for per-request SQL accounting."""
+import json
+import logging
+import re
+
+import pytest
+from httpx import AsyncClient
+
+from app.core import profiling
+from app.core.profiling import RequestStats, fingerprint
+from app.models.user import User
+
+
+@pytest.mark.unit
+class TestFingerprint:
+    """Test SQL fingerprints."""
+
+    def test_literals_are_normalized(self):
+        """Test queries differing only in values share a fingerprint."""
+        first = fingerprint("SELECT * FROM \"users\" WHERE \"id\"=1 AND \"name\"='ash'")
+        second = fingerprint("SELECT  * FROM \"users\"\nWHERE \"id\"=42 AND \"name\"='misty'")
+        assert first == second
+
+    def test_placeholder_lists_are_collapsed(self):
+        """Test IN lists of any length share a fingerprint."""
+        assert fingerprint("SELECT 1 WHERE id IN (?,?,?)") == fingerprint(
+            "SELECT 1 WHERE id IN (?, ?)"
+        )
+
+    def test_repeated_queries(self):
+        """Test statements issued repeatedly are reported."""
+        stats = RequestStats()
+        for user_id in range(3):
+            stats.record_query(f"SELECT * FROM users WHERE id={user_id}", 0.001)
+        stats.record_query("SELECT COUNT(*) FROM users", 0.001)
+
+        assert stats.repeated_queries(3) == {"SELECT * FROM users WHERE id=?": 3}
+        assert stats.repeated_queries(0) == {}
+
+
+class TestRequestProfilingMiddleware:
+    """Test the profiling middleware."""
+
+    async def test_server_timing_header(
+        self, async_client: AsyncClient, test_admin: User, admin_token: str
+    ):
+        """Test responses report request, DB and serialization timings."""
+        response = await async_client.get(
+            "/admin/users", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+        assert response.status_code == 200
+        timing = response.headers["Server-Timing"]
+        assert timing.startswith("app;dur=")
+        # Token version lookup, total count and page
+        assert re.search(r'db;dur=[\d.]+;desc="3 queries"', timing)
+        assert "serialize;dur=" in timing
+
+    async def test_request_log_flags_repeated_queries(
+        self, async_client: AsyncClient, test_user: User, user_token: str, caplog, monkeypatch
+    ):
+        """Test the structured log line and the N+1 warning."""
+        monkeypatch.setattr(profiling.settings, "SQL_REPEATED_QUERY_THRESHOLD", 1)
+
+        with caplog.at_level(logging.INFO, logger="app.requests"):
+            await async_client.get("/auth/me", headers={"Authorization": f"Bearer {user_token}"})
+
+        record = caplog.records[-1]
+        entry = json.loads(record.getMessage())
+        assert record.levelno == logging.WARNING
+        assert entry["route"] == "/auth/me"
+        assert entry["status"] == 200
+        assert entry["queries"] >= 1
+        assert entry["repeated_queries"]
+
+    async def test_request_log_skipped_when_disabled(
+        self, async_client: AsyncClient, test_user: User, user_token: str, caplog, monkeypatch
+    ):
+        """Test no line is built for requests below the configured level."""
+        dumps = []
+        monkeypatch.setattr(profiling.json, "dumps", lambda *args, **kwargs: dumps.append(args))
+
+        with caplog.at_level(logging.WARNING, logger="app.requests"):
+            await async_client.get("/auth/me", headers={"Authorization": f"Bearer {user_token}"})
+
+        assert not dumps
+        assert not [record for record in caplog.records if record.name == "app.requests"]
+
+    def test_configure_request_log(self, monkeypatch):
+        """Test the request log gets one stderr handler and the configured level."""
+        monkeypatch.setattr(profiling, "_log_handler", None)
+        monkeypatch.setattr(profiling.logger, "handlers", [])
+        monkeypatch.setattr(profiling.logger, "level", logging.NOTSET)
+
+        profiling.configure_request_log("warning")
+        profiling.configure_request_log("info")
+
+        assert len(profiling.logger.handlers) == 1
+        assert profiling.logger.level == logging.INFO
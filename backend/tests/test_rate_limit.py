@@ -0,0 +1,90 @@
+"""Tests for login rate limiting."""
+import time
+
+import pytest
+
+from app.core.rate_limit import (
+    ConcurrencyLimiter,
+    LoginThrottle,
+    TokenBucketLimiter,
+    retry_after_header,
+)
+
+
+@pytest.mark.unit
+class TestTokenBucketLimiter:
+    """Test token bucket limiter."""
+
+    def test_allows_burst_then_limits(self):
+        """Test a key may burst up to capacity and is then limited."""
+        limiter = TokenBucketLimiter(capacity=3, rate_per_minute=60)
+
+        assert [limiter.acquire("alice") for _ in range(3)] == [0, 0, 0]
+        assert limiter.acquire("alice") > 0
+        assert limiter.acquire("bob") == 0
+
+    def test_refills_over_time(self, monkeypatch):
+        """Test tokens are earned back at the configured rate."""
+        limiter = TokenBucketLimiter(capacity=1, rate_per_minute=60)
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        limiter.acquire("alice")
+
+        retry_after = limiter.acquire("alice")
+        assert retry_after == pytest.approx(1.0)
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 1.0)
+        assert limiter.acquire("alice") == 0
+
+    def test_bounded_number_of_keys(self):
+        """Test the oldest buckets are dropped past max_keys."""
+        limiter = TokenBucketLimiter(capacity=1, rate_per_minute=1, max_keys=2)
+        for key in ("a", "b", "c"):
+            limiter.acquire(key)
+
+        assert len(limiter) == 2
+
+    def test_retry_after_header(self):
+        """Test Retry-After is rounded up to whole seconds."""
+        assert retry_after_header(0.2) == "1"
+        assert retry_after_header(2.1) == "3"
+
+
+@pytest.mark.unit
+class TestLoginThrottle:
+    """Test login admission control."""
+
+    def make_throttle(self, max_concurrent: int = 1) -> LoginThrottle:
+        return LoginThrottle(
+            username_limiter=TokenBucketLimiter(capacity=2, rate_per_minute=1),
+            ip_limiter=TokenBucketLimiter(capacity=3, rate_per_minute=1),
+            verifications=ConcurrencyLimiter(max_concurrent),
+        )
+
+    def test_limits_per_username_case_insensitively(self):
+        """Test username variants share one bucket."""
+        throttle = self.make_throttle()
+
+        assert throttle.check("Alice", "10.0.0.1") == 0
+        assert throttle.check("alice", "10.0.0.2") == 0
+        assert throttle.check("ALICE", "10.0.0.3") > 0
+        assert throttle.stats()["limited_by_username"] == 1
+
+    def test_limits_per_ip(self):
+        """Test one IP cannot spray many usernames."""
+        throttle = self.make_throttle()
+
+        for username in ("a", "b", "c"):
+            assert throttle.check(username, "10.0.0.1") == 0
+        assert throttle.check("d", "10.0.0.1") > 0
+        assert throttle.stats()["limited_by_ip"] == 1
+
+    def test_caps_concurrent_verifications(self):
+        """Test verification slots are limited and released."""
+        throttle = self.make_throttle(max_concurrent=1)
+
+        assert throttle.acquire_verification() is True
+        assert throttle.acquire_verification() is False
+        throttle.release_verification()
+        assert throttle.acquire_verification() is True
+        assert throttle.stats()["limited_by_concurrency"] == 1
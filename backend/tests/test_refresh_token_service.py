@@ -0,0 +1,84 @@
+"""Tests for refresh token rotation."""
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from tortoise import timezone
+
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.schemas.user import UserUpdate
+from app.services.auth_service import AuthService
+from app.services.refresh_token_service import RefreshTokenService, hash_refresh_token
+from app.services.user_service import UserService
+
+
+@pytest.mark.unit
+class TestRefreshTokenService:
+    """Test refresh token service."""
+
+    async def test_login_issues_refresh_token(self, test_user: User):
+        """Test login returns a refresh token stored only as a hash."""
+        token = await AuthService.login("testuser", "testpass123")
+
+        assert token.refresh_token
+        record = await RefreshToken.get(token_hash=hash_refresh_token(token.refresh_token))
+        assert record.user_id == test_user.id
+        assert await RefreshToken.filter(token_hash=token.refresh_token).count() == 0
+
+    async def test_refresh_rotates_token(self, test_user: User):
+        """Test refreshing returns new tokens and consumes the old one."""
+        login = await AuthService.login("testuser", "testpass123")
+
+        refreshed = await AuthService.refresh(login.refresh_token)
+        assert refreshed.refresh_token != login.refresh_token
+
+        user = await AuthService.get_current_user(refreshed.access_token)
+        assert user.username == "testuser"
+
+    async def test_reuse_revokes_family(self, test_user: User):
+        """Test presenting a consumed token revokes the whole session."""
+        login = await AuthService.login("testuser", "testpass123")
+        refreshed = await AuthService.refresh(login.refresh_token)
+
+        with pytest.raises(HTTPException) as exc:
+            await AuthService.refresh(login.refresh_token)
+        assert exc.value.status_code == 401
+
+        # The legitimately rotated token is now revoked too
+        with pytest.raises(HTTPException):
+            await AuthService.refresh(refreshed.refresh_token)
+
+    async def test_refresh_expired_token(self, test_user: User):
+        """Test expired refresh tokens are rejected."""
+        refresh_token = await RefreshTokenService.issue(test_user)
+        await RefreshToken.filter(token_hash=hash_refresh_token(refresh_token)).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        with pytest.raises(HTTPException) as exc:
+            await AuthService.refresh(refresh_token)
+        assert exc.value.status_code == 401
+
+    async def test_password_change_revokes_refresh_tokens(self, test_user: User):
+        """Test a token version bump invalidates refresh tokens."""
+        login = await AuthService.login("testuser", "testpass123")
+        await UserService.update_user(test_user.id, UserUpdate(password="newpass123"))
+
+        with pytest.raises(HTTPException) as exc:
+            await AuthService.refresh(login.refresh_token)
+        assert exc.value.status_code == 401
+
+    async def test_logout_revokes_session(self, test_user: User):
+        """Test logging out revokes the refresh token."""
+        login = await AuthService.login("testuser", "testpass123")
+        await AuthService.logout(login.refresh_token)
+
+        with pytest.raises(HTTPException):
+            await AuthService.refresh(login.refresh_token)
+
+    async def test_refresh_unknown_token(self):
+        """Test an unknown refresh token is rejected."""
+        with pytest.raises(HTTPException) as exc:
+            await AuthService.refresh("not-a-token")
+        assert exc.value.status_code == 401
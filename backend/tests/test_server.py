@@ -0,0 +1,38 @@
+"""Tests for the production server helpers."""
+import os
+
+import pytest
+
+from app.core import server
+from app.core.server import clear_metrics_snapshots, server_config, worker_count
+
+
+@pytest.mark.unit
+class TestServerConfig:
+    """Test the worker settings."""
+
+    def test_worker_count(self, monkeypatch):
+        """Test 0 workers means one per CPU."""
+        monkeypatch.setattr(server.settings, "SERVER_WORKERS", 0)
+        assert worker_count() == (os.cpu_count() or 1)
+        monkeypatch.setattr(server.settings, "SERVER_WORKERS", 3)
+        assert worker_count() == 3
+
+    def test_uvicorn_settings(self, monkeypatch):
+        """Test keep-alive, backlog and graceful shutdown come from settings."""
+        monkeypatch.setattr(server.settings, "SERVER_KEEPALIVE_SECONDS", 75)
+        monkeypatch.setattr(server.settings, "SERVER_BACKLOG", 4096)
+        config = server_config(app=None)
+
+        assert config.timeout_keep_alive == 75
+        assert config.backlog == 4096
+        assert config.timeout_graceful_shutdown == server.settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS
+
+    def test_clear_metrics_snapshots(self, tmp_path):
+        """Test snapshots of a previous run are removed, other files kept."""
+        for name in ("metrics-10.json", "metrics-11.json.tmp", "notes.txt"):
+            (tmp_path / name).write_text("{}")
+
+        clear_metrics_snapshots(str(tmp_path))
+
+        assert os.listdir(tmp_path) == ["notes.txt"]
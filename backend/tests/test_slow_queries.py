@@ -0,0 +1,113 @@
+"""Tests for the slow query log."""
+import json
+import logging
+import os
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.profiling import instrument_db_clients
+from app.core.slow_queries import SlowQueryLog, slow_query_log, worker_log_path
+from app.models.user import User
+from app.schemas.user import UserCreate, UserUpdate
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+def log_every_query(tmp_path, monkeypatch):
+    """Treat every statement as slow and log it to a temporary file."""
+    instrument_db_clients()
+    monkeypatch.setattr(slow_query_log, "threshold_seconds", 0.0)
+    monkeypatch.setattr(slow_query_log, "sample_rate", 1.0)
+    monkeypatch.setattr(slow_query_log, "path", str(tmp_path / "slow.log"))
+    monkeypatch.setattr(slow_query_log, "_handler", None)
+    yield tmp_path / f"slow.{os.getpid()}.log"
+    if slow_query_log._handler is not None:
+        slow_query_log._handler.close()
+        logging.getLogger("app.slow_queries").removeHandler(slow_query_log._handler)
+
+
+class TestSlowQueryLog:
+    """Test cases for the slow query log."""
+
+    async def test_logs_caller_and_plan(self, test_user: User, log_every_query):
+        """Test a slow query is logged with its caller and query plan."""
+        await UserService.get_user_by_username("testuser")
+        await slow_query_log.drain()
+
+        records = [json.loads(line) for line in log_every_query.read_text().splitlines()]
+        record = next(r for r in records if r["caller"] == "UserService.get_user_by_username")
+        assert "FROM \"users\"" in record["sql"]
+        assert "testuser" in record["params"]
+        assert any("users" in step for step in record["plan"])
+
+    async def test_writes_do_not_log_hashes(self, log_every_query):
+        """Test parameters of user inserts and updates, password hashes, stay out of the log."""
+        user = await UserService.create_user(
+            UserCreate(username="newuser", email="new@example.com", password="secret123")
+        )
+        created_hash = user.hashed_password
+        user = await UserService.update_user(user.id, UserUpdate(password="secret456"))
+        await slow_query_log.drain()
+
+        log = log_every_query.read_text()
+        records = [json.loads(line) for line in log.splitlines()]
+        assert any(r["sql"].startswith("INSERT") and r["params"] == "<redacted>" for r in records)
+        assert created_hash not in log
+        assert user.hashed_password not in log
+
+    async def test_sampling_keeps_summary(self, test_user: User, log_every_query, monkeypatch):
+        """Test unsampled slow queries are still counted but not written."""
+        monkeypatch.setattr(slow_query_log, "sample_rate", 0.0)
+        await UserService.get_user_by_username("testuser")
+        await UserService.get_user_by_username("testuser")
+        await slow_query_log.drain()
+
+        assert not log_every_query.exists()
+        top = slow_query_log.top(order_by="count")
+        assert top[0]["count"] == 2
+        assert top[0]["callers"] == {"UserService.get_user_by_username": 2}
+
+    def test_file_per_worker(self, log_every_query, monkeypatch):
+        """Test a handler opened before the fork is replaced by one for this worker's file."""
+        assert worker_log_path("logs/slow_queries.log") == f"logs/slow_queries.{os.getpid()}.log"
+
+        slow_query_log._ensure_handler()
+        inherited = slow_query_log._handler
+        monkeypatch.setattr(slow_query_log, "_handler_pid", -1)
+        slow_query_log._ensure_handler()
+        inherited.close()
+
+        assert slow_query_log._handler is not inherited
+        assert inherited not in logging.getLogger("app.slow_queries").handlers
+        assert slow_query_log._handler.baseFilename == str(log_every_query)
+
+    def test_disabled_threshold(self):
+        """Test a threshold of 0 ms disables the log."""
+        log = SlowQueryLog(threshold_ms=0, sample_rate=1.0, path="", max_bytes=0, backups=0)
+        assert log.threshold_seconds == float("inf")
+
+
+class TestSlowQueriesEndpoint:
+    """Test the admin summary endpoint."""
+
+    async def test_top_offenders(
+        self, async_client: AsyncClient, test_admin: User, admin_token: str, log_every_query
+    ):
+        """Test admins get slow statements grouped by fingerprint."""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        await async_client.get("/admin/users", headers=headers)
+        response = await async_client.get("/admin/slow-queries?order_by=count", headers=headers)
+        await slow_query_log.drain()
+
+        assert response.status_code == 200
+        offenders = response.json()
+        assert offenders
+        assert {"fingerprint", "count", "avg_ms", "max_ms", "callers"} <= set(offenders[0])
+
+    async def test_non_admin_forbidden(self, async_client: AsyncClient, user_token: str):
+        """Test non-admins cannot read the slow query summary."""
+        response = await async_client.get(
+            "/admin/slow-queries", headers={"Authorization": f"Bearer {user_token}"}
+        )
+        assert response.status_code == 403
@@ -0,0 +1,84 @@
+"""Tests for token claims and the token version registry."""
+import pytest
+from fastapi import HTTPException
+
+from app.core.security import create_access_token, decode_access_token
+from app.models.user import User
+from app.schemas.user import UserUpdate
+from app.services.auth_service import AuthService
+from app.services.token_version_service import TokenVersionRegistry, token_versions
+from app.services.user_service import UserService
+
+
+@pytest.mark.unit
+class TestTokenVersions:
+    """Test stateless authorization claims and revocation."""
+
+    async def test_token_carries_claims(self, test_admin: User):
+        """Test access tokens carry user id, role and version."""
+        payload = decode_access_token(AuthService.create_user_token(test_admin))
+
+        assert payload["sub"] == "admin"
+        assert payload["uid"] == test_admin.id
+        assert payload["role"] == "admin"
+        assert payload["ver"] == 0
+
+    async def test_principal_from_claims(self, test_admin: User, admin_token: str):
+        """Test admin authorization is read from the token claims."""
+        principal = await AuthService.get_current_admin_principal(admin_token)
+
+        assert principal.user_id == test_admin.id
+        assert principal.is_admin is True
+
+    async def test_role_change_revokes_tokens(self, test_admin: User, admin_token: str):
+        """Test demoting an admin revokes its outstanding tokens."""
+        await AuthService.get_current_admin_principal(admin_token)
+        await UserService.update_user(test_admin.id, UserUpdate(is_admin=False))
+
+        with pytest.raises(HTTPException) as exc:
+            await AuthService.get_current_admin_principal(admin_token)
+        assert exc.value.status_code == 401
+
+    async def test_unrelated_update_keeps_tokens(self, test_user: User, user_token: str):
+        """Test an email change does not revoke tokens."""
+        await UserService.update_user(test_user.id, UserUpdate(email="new@example.com"))
+
+        user = await AuthService.get_current_user(user_token)
+        assert user.email == "new@example.com"
+
+    async def test_legacy_token_still_accepted(self, test_admin: User):
+        """Test tokens with only a subject fall back to a user lookup."""
+        token = create_access_token(data={"sub": test_admin.username})
+
+        principal = await AuthService.get_current_admin_principal(token)
+        assert principal.username == "admin"
+        assert principal.is_admin is True
+
+    async def test_inactive_user_is_revoked(self, inactive_user: User):
+        """Test inactive users have no valid token version."""
+        assert await token_versions.get(inactive_user.id) == TokenVersionRegistry.REVOKED
+
+    async def test_sync_picks_up_changes_from_other_workers(self, test_user: User):
+        """Test the incremental sync sees version bumps written elsewhere."""
+        registry = TokenVersionRegistry(sync_seconds=60, reset_seconds=3600)
+        assert await registry.get(test_user.id) == 0
+
+        # Simulate another worker revoking the user's tokens
+        test_user.token_version = 1
+        await test_user.save()
+        registry.sync_seconds = 0
+
+        assert await registry.get(test_user.id) == 1
+        assert registry.stats()["syncs"] >= 1
+
+    async def test_sync_picks_up_deletions_from_other_workers(self, test_admin: User):
+        """Test a user deleted by another worker is revoked within one sync."""
+        registry = TokenVersionRegistry(sync_seconds=60, reset_seconds=3600)
+        assert await registry.get(test_admin.id) == 0
+
+        # Deleted through the shared registry, as another worker would
+        await UserService.delete_user(test_admin.id)
+        registry.sync_seconds = 0
+
+        assert await registry.get(test_admin.id) == TokenVersionRegistry.REVOKED
+        assert registry.stats()["point_lookups"] == 1
@@ -2,9 +2,10 @@
 import pytest
 from fastapi import HTTPException
 
+from app.core.profiling import RequestStats, _request_stats, instrument_db_clients
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
-from app.services.user_service import UserService
+from app.schemas.user import BulkUserUpdate, UserCreate, UserFilter, UserUpdate
+from app.services.user_service import UserService, prefix_upper_bound
 
 
 @pytest.mark.unit
@@ -94,6 +95,105 @@ class TestUserService:
         users = await UserService.get_all_users(skip=0, limit=1)
         assert len(users) == 1
 
+    async def test_search_users_filters_and_total(
+        self, test_user: User, test_admin: User, inactive_user: User
+    ):
+        """Test filtering users and counting matches."""
+        page = await UserService.search_users(is_active=True)
+        assert page.total == 2
+        assert [u.username for u in page.users] == ["testuser", "admin"]
+
+        page = await UserService.search_users(search="inactive@")
+        assert [u.username for u in page.users] == ["inactive"]
+        assert page.next_cursor is None
+
+    async def test_search_users_prefix_beyond_bmp(self, test_user: User):
+        """Test the prefix search matches names with characters above U+FFFF."""
+        await User.create(username="te\U0001f600st", email="emoji@example.com", hashed_password="x")
+        await User.create(username="tf", email="tf@example.com", hashed_password="x")
+
+        page = await UserService.search_users(search="te")
+        assert {u.username for u in page.users} == {"te\U0001f600st", "testuser"}
+
+        page = await UserService.search_users(search="te\U0001f600")
+        assert [u.username for u in page.users] == ["te\U0001f600st"]
+
+        assert prefix_upper_bound("a\ud7ff") == "a\ue000"
+        assert prefix_upper_bound("\U0010ffff") is None
+
+    async def test_search_users_cursor(
+        self, test_user: User, test_admin: User, inactive_user: User
+    ):
+        """Test walking every page with cursors."""
+        seen = []
+        cursor = None
+        while True:
+            page = await UserService.search_users(cursor=cursor, limit=2)
+            seen.extend(u.id for u in page.users)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == sorted(seen)
+        assert len(seen) == 3
+
+    async def test_search_users_total_refreshed_after_create(self, test_user: User):
+        """Test the cached total is dropped when users change."""
+        assert (await UserService.search_users()).total == 1
+        await UserService.create_user(
+            UserCreate(username="another", email="another@example.com", password="password123")
+        )
+        assert (await UserService.search_users()).total == 2
+
+    async def test_bulk_update_users_promotes_by_filter(
+        self, test_user: User, test_admin: User, inactive_user: User
+    ):
+        """Test a bulk role change only updates rows that differ."""
+        result = await UserService.bulk_update_users(
+            BulkUserUpdate(filter=UserFilter(is_active=True), is_admin=True)
+        )
+
+        assert (result.matched, result.updated, result.deleted) == (2, 1, 0)
+        await test_user.refresh_from_db()
+        await inactive_user.refresh_from_db()
+        assert test_user.is_admin is True
+        assert test_user.token_version == 1
+        assert inactive_user.is_admin is False
+
+    async def test_bulk_update_users_runs_on_the_filter(
+        self, test_user: User, test_admin: User, inactive_user: User
+    ):
+        """Test a filtered bulk change is one UPDATE on the filter, not on an id list."""
+        instrument_db_clients()
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        try:
+            await UserService.bulk_update_users(
+                BulkUserUpdate(filter=UserFilter(is_active=True), is_admin=True)
+            )
+            await UserService.bulk_update_users(
+                BulkUserUpdate(filter=UserFilter(is_admin=True), delete=True)
+            )
+        finally:
+            _request_stats.reset(token)
+
+        writes = [
+            q for q in stats.fingerprints if q.startswith(('UPDATE "users"', 'DELETE FROM "users"'))
+        ]
+        assert len(writes) == 2
+        assert all("IN (" not in q for q in writes)
+        assert await User.all().values_list("username", flat=True) == ["inactive"]
+
+    async def test_bulk_update_users_excludes_caller(self, test_admin: User):
+        """Test the acting admin is left untouched."""
+        result = await UserService.bulk_update_users(
+            BulkUserUpdate(ids=[test_admin.id], delete=True),
+            exclude_user_id=test_admin.id,
+        )
+
+        assert (result.matched, result.deleted) == (0, 0)
+        assert await User.filter(id=test_admin.id).exists()
+
     async def test_update_user_username(self, test_user: User):
         """Test updating user username."""
         update_data = UserUpdate(username="updateduser")
@@ -163,3 +263,17 @@ class TestUserService:
         with pytest.raises(HTTPException) as exc:
             await UserService.delete_user(9999)
         assert exc.value.status_code == 404
+
+    async def test_bulk_create_users_in_batches(self, test_user: User):
+        """Test bulk creation across several batches."""
+        async def rows():
+            for i in range(5):
+                yield {"username": f"bulk{i}", "email": f"bulk{i}@example.com", "password": "pass1234"}
+            yield {"username": "testuser", "email": "x@example.com", "password": "pass1234"}
+
+        report = await UserService.bulk_create_users(rows(), batch_size=2)
+
+        assert report.total == 6
+        assert report.created == 5
+        assert report.results[5].errors == ["Username already registered"]
+        assert await User.filter(username__startswith="bulk").count() == 5
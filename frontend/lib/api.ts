@@ -25,6 +25,64 @@ class ApiClient {
     return {};
   }
 
+  private storeTokens(tokens: AuthToken) {
+    localStorage.setItem("auth_token", tokens.access_token);
+    if (tokens.refresh_token) {
+      localStorage.setItem("refresh_token", tokens.refresh_token);
+    }
+  }
+
+  // Concurrent 401s share one refresh, since each refresh token is single-use
+  private refreshPromise: Promise<boolean> | null = null;
+
+  private async refreshSession(): Promise<boolean> {
+    const refreshToken = localStorage.getItem("refresh_token");
+    if (!refreshToken) {
+      return false;
+    }
+
+    if (!this.refreshPromise) {
+      this.refreshPromise = fetch(`${this.baseUrl}/auth/refresh`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      })
+        .then(async (response) => {
+          if (!response.ok) {
+            localStorage.removeItem("refresh_token");
+            return false;
+          }
+          this.storeTokens(await response.json());
+          return true;
+        })
+        .catch(() => false)
+        .finally(() => {
+          this.refreshPromise = null;
+        });
+    }
+    return this.refreshPromise;
+  }
+
+  // Authenticated fetch that renews an expired access token once and retries
+  private async fetchWithAuth(url: string, init: RequestInit = {}): Promise<Response> {
+    const send = () =>
+      fetch(url, {
+        ...init,
+        headers: {
+          ...init.headers,
+          ...this.getAuthHeader(),
+        },
+      });
+
+    const response = await send();
+    if (response.status === 401 && (await this.refreshSession())) {
+      return send();
+    }
+    return response;
+  }
+
   private async handleResponse<T>(response: Response): Promise<T> {
     if (!response.ok) {
       const error = await response.json().catch(() => ({
@@ -44,15 +102,28 @@ class ApiClient {
       },
       body: JSON.stringify(credentials),
     });
-    return this.handleResponse<AuthToken>(response);
+    const tokens = await this.handleResponse<AuthToken>(response);
+    this.storeTokens(tokens);
+    return tokens;
+  }
+
+  async logout(): Promise<void> {
+    const refreshToken = localStorage.getItem("refresh_token");
+    localStorage.removeItem("auth_token");
+    localStorage.removeItem("refresh_token");
+    if (refreshToken) {
+      await fetch(`${this.baseUrl}/auth/logout`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      }).catch(() => undefined);
+    }
   }
 
   async getCurrentUser(): Promise<User> {
-    const response = await fetch(`${this.baseUrl}/auth/me`, {
-      headers: {
-        ...this.getAuthHeader(),
-      },
-    });
+    const response = await this.fetchWithAuth(`${this.baseUrl}/auth/me`);
     return this.handleResponse<User>(response);
   }
 
@@ -74,20 +145,12 @@ class ApiClient {
       params.append("sort_by", sortBy);
     }
 
-    const response = await fetch(`${this.baseUrl}/pokemon?${params}`, {
-      headers: {
-        ...this.getAuthHeader(),
-      },
-    });
+    const response = await this.fetchWithAuth(`${this.baseUrl}/pokemon?${params}`);
     return this.handleResponse<PokemonListResponse>(response);
   }
 
   async getPokemonDetails(nameOrId: string): Promise<PokemonDetails> {
-    const response = await fetch(`${this.baseUrl}/pokemon/${nameOrId}`, {
-      headers: {
-        ...this.getAuthHeader(),
-      },
-    });
+    const response = await this.fetchWithAuth(`${this.baseUrl}/pokemon/${nameOrId}`);
     return this.handleResponse<PokemonDetails>(response);
   }
 }
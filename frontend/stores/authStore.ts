@@ -23,13 +23,12 @@ export const useAuthStore = create<AuthState>((set) => ({
   login: async (credentials: LoginCredentials) => {
     set({ isLoading: true, error: null });
     try {
-      const tokenResponse = await apiClient.login(credentials);
-      localStorage.setItem("auth_token", tokenResponse.access_token);
+      await apiClient.login(credentials);
 
       const user = await apiClient.getCurrentUser();
 
       set({
-        token: tokenResponse.access_token,
+        token: localStorage.getItem("auth_token"),
         user,
         isAuthenticated: true,
         isLoading: false,
@@ -45,12 +44,13 @@ export const useAuthStore = create<AuthState>((set) => ({
         token: null,
       });
       localStorage.removeItem("auth_token");
+      localStorage.removeItem("refresh_token");
       throw error;
     }
   },
 
   logout: () => {
-    localStorage.removeItem("auth_token");
+    void apiClient.logout();
     set({
       user: null,
       token: null,
@@ -60,24 +60,25 @@ export const useAuthStore = create<AuthState>((set) => ({
   },
 
   checkAuth: async () => {
-    const token = localStorage.getItem("auth_token");
-    if (!token) {
+    if (!localStorage.getItem("auth_token") && !localStorage.getItem("refresh_token")) {
       set({ isAuthenticated: false, user: null, token: null });
       return;
     }
 
     set({ isLoading: true });
     try {
+      // Renews an expired access token with the refresh token if needed
       const user = await apiClient.getCurrentUser();
       set({
         user,
-        token,
+        token: localStorage.getItem("auth_token"),
         isAuthenticated: true,
         isLoading: false,
         error: null,
       });
     } catch (error) {
       localStorage.removeItem("auth_token");
+      localStorage.removeItem("refresh_token");
       set({
         user: null,
         token: null,
@@ -17,6 +17,7 @@ export interface LoginCredentials {
 export interface AuthToken {
   access_token: string;
   token_type: string;
+  refresh_token?: string | null;
 }
 
 // Pokémon Types